@@ -17,7 +17,7 @@ from lingpy.settings import rc
 # general imports
 from lingpy.basic.wordlist import Wordlist, get_wordlist
 from lingpy.basic.tree import Tree
-from lingpy.basic.ops import iter_rows
+from lingpy.basic.ops import iter_rows, Query
 
 # import converts
 # from .convert import *
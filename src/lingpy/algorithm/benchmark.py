@@ -0,0 +1,418 @@
+"""
+Benchmark the flat cluster methods available in LingPy.
+"""
+import time
+import platform
+import importlib.util
+import tracemalloc
+from collections import defaultdict
+
+import numpy as np
+import networkx as nx
+from clldutils import jsonlib
+
+from lingpy import log, __version__
+from lingpy.compare.lexstat import LexStat
+from lingpy.algorithm import clustering
+from lingpy.algorithm import extra
+from lingpy.evaluate.acd import _get_bcubed_score
+from lingpy.thirdparty import linkcomm as lc
+from lingpy import util
+
+
+def _labels(clusters, size):
+    """
+    Convert the reverted output of a cluster method to a list of labels.
+    """
+    return [clusters.get(i, clusters.get(str(i))) for i in range(size)]
+
+
+def _fuzzy_labels(clusters):
+    """
+    Label each item by the members of all fuzzy clusters it belongs to.
+    """
+    labels = defaultdict(list)
+    for members in clusters.values():
+        for item in members:
+            labels[item].append(tuple(sorted(members)))
+    return {item: tuple(sorted(clrs)) for item, clrs in labels.items()}
+
+
+def _linkage(method):
+    """
+    Flat linkage clustering with SciPy, the reference for the LingPy methods.
+    """
+    def run(threshold, matrix):
+        from scipy.cluster.hierarchy import linkage, fcluster
+        from scipy.spatial.distance import squareform
+        if len(matrix) < 2:
+            return {i: 1 for i in range(len(matrix))}
+        labels = fcluster(
+            linkage(squareform(np.array(matrix), checks=False), method),
+            threshold, criterion='distance')
+        return dict(enumerate(labels.tolist()))
+    return run
+
+
+def _hlc_link_clustering(threshold, matrix):
+    """
+    Non-fuzzy link clustering with the original dictionary-based HLC engine.
+    """
+    taxa = list(range(len(matrix)))
+    edges, adjacency = set(), {t: set() for t in taxa}
+    for i, j in util.combinations2(taxa):
+        if matrix[i][j] < threshold:
+            edges.add((i, j))
+            adjacency[i].add(j)
+            adjacency[j].add(i)
+    if not edges:
+        return {t: t for t in taxa}
+    edge2cid = lc.HLC(adjacency, edges).single_linkage(threshold=False)[0]
+
+    clr2nodes, clr2edges = defaultdict(set), defaultdict(list)
+    for edge, idx in edge2cid.items():
+        clr2edges[idx].append(edge)
+        clr2nodes[idx].update(edge)
+    delis = set()
+    for keyA, keyB in util.product2(sorted(clr2nodes)):
+        if keyA != keyB:
+            if clr2nodes[keyA] == clr2nodes[keyB]:
+                delis.add(keyB)
+            elif clr2nodes[keyA] < clr2nodes[keyB]:
+                delis.add(keyA)
+            elif clr2nodes[keyB] < clr2nodes[keyA]:
+                delis.add(keyB)
+    mapper = {key: i + 1 for i, key in enumerate(
+        key for key in clr2nodes if key not in delis)}
+
+    weights = {t: defaultdict(int) for t in taxa}
+    for key, clr_edges in clr2edges.items():
+        if key in mapper:
+            for nodeA, nodeB in clr_edges:
+                weights[nodeA][mapper[key]] += 1
+                weights[nodeB][mapper[key]] += 1
+    out, idx = {}, len(mapper) + 1
+    for t in taxa:
+        clrs = [mapper[key] for key in clr2nodes
+                if key in mapper and t in clr2nodes[key]]
+        if clrs:
+            out[t] = sorted(clrs, key=lambda x: weights[t][x], reverse=True)[0]
+        else:
+            out[t], idx = idx, idx + 1
+    return out
+
+
+def _linkage_fuzzy(threshold, matrix):
+    """
+    Fuzzy clustering from leave-one-out runs of the SciPy UPGMA clustering.
+    """
+    taxa = list(range(len(matrix)))
+    graph = nx.Graph()
+    graph.add_nodes_from(taxa)
+    matrix = np.array(matrix, dtype=float)
+    upgma = _linkage('average')
+    for idx in taxa:
+        rest = [t for t in taxa if t != idx]
+        clusters = defaultdict(list)
+        for i, label in upgma(threshold, matrix[np.ix_(rest, rest)]).items():
+            clusters[label].append(rest[i])
+        for clr in clusters.values():
+            graph.add_edges_from(util.combinations2(clr))
+    return _fuzzy_labels(dict(enumerate(nx.find_cliques(graph))))
+
+
+METHODS = {
+    'flat_upgma': lambda t, m: clustering.flat_upgma(t, m, revert=True),
+    'single': lambda t, m: clustering.flat_cluster(
+        'single', t, m, revert=True),
+    'complete': lambda t, m: clustering.flat_cluster(
+        'complete', t, m, revert=True),
+    'fuzzy': lambda t, m: _fuzzy_labels(clustering.fuzzy(
+        t, m, list(range(len(m))))),
+    'mcl': lambda t, m: clustering.mcl(
+        t, m, list(range(len(m))), revert=True),
+    'mcl_sparse': lambda t, m: clustering.mcl(
+        t, m, list(range(len(m))), revert=True, sparse_matrix=True),
+    'link_clustering': lambda t, m: clustering.link_clustering(
+        t, m, list(range(len(m))), revert=True, fuzzy=False),
+    'infomap': lambda t, m: extra.infomap_clustering(
+        t, m, list(range(len(m))), revert=True),
+    'dbscan': lambda t, m: extra.dbscan(
+        t, m, list(range(len(m))), revert=True),
+    'affinity_propagation': lambda t, m: extra.affinity_propagation(
+        t, m, list(range(len(m))), revert=True),
+}
+
+# independent implementations against which the methods are checked
+REFERENCES = {
+    'flat_upgma': _linkage('average'),
+    'single': _linkage('single'),
+    'complete': _linkage('complete'),
+    'fuzzy': _linkage_fuzzy,
+    'mcl_sparse': METHODS['mcl'],
+    'link_clustering': _hlc_link_clustering,
+}
+
+# optional packages required by the methods and by their references
+REQUIREMENTS = {
+    'mcl_sparse': ['scipy'],
+    'infomap': ['igraph'],
+    'dbscan': ['sklearn'],
+    'affinity_propagation': ['sklearn'],
+}
+REFERENCE_REQUIREMENTS = {
+    'flat_upgma': ['scipy'],
+    'single': ['scipy'],
+    'complete': ['scipy'],
+    'fuzzy': ['scipy'],
+}
+
+
+def _missing(packages):
+    """
+    Return the optional packages which are not installed.
+    """
+    return [package for package in packages
+            if importlib.util.find_spec(package) is None]
+
+
+def bcubed_fscore(gold, test):
+    """
+    Compute the B-Cubed F-score of two partitions of the same items.
+
+    Parameters
+    ----------
+    gold, test : list
+        The cluster labels of the items in the two partitions.
+
+    Returns
+    -------
+    fscore : float
+        The harmonic mean of B-Cubed precision and B-Cubed recall.
+    """
+    if not gold:
+        return 1.0
+    r = _get_bcubed_score(gold, test)
+    p = _get_bcubed_score(test, gold)
+    return 2 * ((r * p) / (p + r))
+
+
+def synthetic_matrix(
+        size,
+        clusters=None,
+        spread=0.15,
+        separation=0.7,
+        seed=None):
+    """
+    Create a synthetic distance matrix with a known cluster structure.
+
+    Parameters
+    ----------
+    size : int
+        The number of items in the matrix.
+    clusters : int (default=None)
+        The number of clusters, defaults to a fifth of the items.
+    spread : float (default=0.15)
+        The average distance between items of the same cluster.
+    separation : float (default=0.7)
+        The average distance between items of different clusters.
+    seed : int (default=None)
+        The seed for the random number generator.
+
+    Returns
+    -------
+    matrix, labels : tuple
+        The distance matrix as a NumPy array and the list of cluster labels
+        of all items.
+
+    Notes
+    -----
+    Distances are drawn from normal distributions around *spread* and
+    *separation* with a standard deviation of half the spread, and clipped to
+    the interval between 0 and 1.
+    """
+    rng = np.random.RandomState(seed)
+    clusters = clusters or max(1, size // 5)
+    labels = rng.randint(0, clusters, size)
+    same = labels[:, None] == labels[None, :]
+    matrix = np.where(same, spread, separation) + rng.normal(
+        0, spread / 2, (size, size))
+    matrix = np.clip(np.triu(matrix, 1), 0, 1)
+    matrix = matrix + matrix.T
+    return matrix, [int(label) + 1 for label in labels]
+
+
+def wordlist_matrices(wordlist, method='sca', ref='cogid', **keywords):
+    """
+    Retrieve the distance matrices of all concepts in a wordlist.
+
+    Parameters
+    ----------
+    wordlist : {str, ~lingpy.compare.lexstat.LexStat}
+        The wordlist, either as a LexStat object, or as a file name.
+    method : str (default="sca")
+        The method used to compute the distances, passed to
+        :py:meth:`~lingpy.compare.lexstat.LexStat.cluster`.
+    ref : str (default="cogid")
+        The column with the expert cognate judgments, which are returned as
+        labels if they are available.
+
+    Returns
+    -------
+    matrices : list
+        A list of tuples of concept, distance matrix, and cognate labels,
+        which are *None* if the wordlist does not contain the column *ref*.
+    """
+    if not isinstance(wordlist, LexStat):
+        wordlist = LexStat(wordlist)
+    out = []
+    for concept, indices, matrix in wordlist._get_matrices(
+            method=method, **keywords):
+        labels = [wordlist[idx, ref] for idx in indices] \
+            if ref in wordlist.header else None
+        out.append((concept, np.array(matrix), labels))
+    return out
+
+
+def _run(function, threshold, matrices):
+    """
+    Run a cluster method on a list of matrices.
+    """
+    return [_labels(function(threshold, matrix), len(matrix))
+            for matrix in matrices]
+
+
+def _mean_fscore(golds, tests):
+    """
+    Average the B-Cubed F-scores of several partitions, weighted by size.
+    """
+    total = sum(len(gold) for gold in golds)
+    if not total:
+        return 1.0
+    return sum(
+        bcubed_fscore(gold, test) * len(gold)
+        for gold, test in zip(golds, tests)) / total
+
+
+def benchmark(
+        methods=None,
+        sizes=(20, 50, 100),
+        wordlists=None,
+        threshold=0.5,
+        repeats=3,
+        seed=1,
+        filename=None,
+        **keywords):
+    """
+    Measure time, memory, and agreement of flat cluster methods.
+
+    Parameters
+    ----------
+    methods : list (default=None)
+        The names of the methods in *METHODS* which will be compared, defaults
+        to all methods.
+    sizes : list (default=(20, 50, 100))
+        The sizes of the synthetic matrices.
+    wordlists : list (default=None)
+        Wordlists, passed as LexStat objects or as file names, from which the
+        distance matrices of all concepts are added as another dataset.
+    threshold : float (default=0.5)
+        The threshold passed to all cluster methods.
+    repeats : int (default=3)
+        The number of times each method is timed on each dataset.
+    seed : int (default=1)
+        The seed for the generation of the synthetic matrices.
+    filename : str (default=None)
+        If given, the report is written to this file in JSON format.
+
+    Returns
+    -------
+    report : dict
+        A dictionary with information on the environment and a list of
+        results, one per dataset and method, with the minimal and the mean
+        time in seconds, the peak of memory allocated in bytes, the number of
+        clusters, the B-Cubed F-score in comparison with the reference
+        implementation of the method, and the B-Cubed F-score in comparison
+        with the true labels.
+
+    Notes
+    -----
+    Each method for which *REFERENCES* lists an independent implementation
+    is checked against it: the linkage methods against SciPy, the sparse
+    mode of MCL against the dense mode, link clustering against the original
+    HLC engine, and fuzzy clustering against leave-one-out runs of the SciPy
+    UPGMA clustering. An agreement
+    below 1.0 therefore points to a regression. Fuzzy clusters are compared
+    by labelling each item with the members of all clusters it belongs to.
+
+    Methods which require a package which is not installed are reported with
+    an error message, and the agreement is left out if the reference requires
+    such a package. The peak memory is measured with :py:mod:`tracemalloc` in
+    a separate run, so that the timings are not affected.
+    """
+    methods = methods or list(METHODS)
+
+    datasets = []
+    for size in sizes:
+        matrix, labels = synthetic_matrix(size, seed=seed, **keywords)
+        datasets.append(
+            ('synthetic-{0}'.format(size), [matrix.tolist()], [labels]))
+    for wordlist in wordlists or []:
+        matrices = wordlist_matrices(wordlist)
+        name = wordlist if isinstance(wordlist, str) else wordlist.filename
+        datasets.append((
+            str(name),
+            [matrix.tolist() for _, matrix, _ in matrices],
+            [labels for _, _, labels in matrices]))
+
+    results = []
+    for name, matrices, golds in datasets:
+        log.info("Benchmarking cluster methods on {0}.".format(name))
+        for method in methods:
+            result = dict(
+                dataset=name,
+                method=method,
+                items=sum(len(matrix) for matrix in matrices),
+                matrices=len(matrices))
+            missing = _missing(REQUIREMENTS.get(method, []))
+            if missing:
+                result['error'] = 'The package {0} is not installed.'.format(
+                    ', '.join(missing))
+                results.append(result)
+                continue
+
+            timings = []
+            for i in range(repeats):
+                start = time.perf_counter()
+                clusters = _run(METHODS[method], threshold, matrices)
+                timings.append(time.perf_counter() - start)
+            tracemalloc.start()
+            try:
+                _run(METHODS[method], threshold, matrices)
+                result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            result['seconds'] = min(timings)
+            result['mean_seconds'] = sum(timings) / len(timings)
+            result['clusters'] = sum(len(set(labels)) for labels in clusters)
+            if method in REFERENCES and not _missing(
+                    REFERENCE_REQUIREMENTS.get(method, [])):
+                result['agreement'] = _mean_fscore(
+                    _run(REFERENCES[method], threshold, matrices), clusters)
+            if all(gold is not None for gold in golds):
+                result['accuracy'] = _mean_fscore(golds, clusters)
+            results.append(result)
+
+    report = dict(
+        lingpy=__version__,
+        python=platform.python_version(),
+        numpy=np.__version__,
+        date=time.strftime('%Y-%m-%dT%H:%M:%S'),
+        threshold=threshold,
+        repeats=repeats,
+        results=results)
+    if filename:
+        jsonlib.dump(report, filename, indent=2)
+    return report
+
@@ -6,7 +6,11 @@ from collections import defaultdict
 import numpy as np
 import networkx as nx
 
-from .cython import _misc as misc
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = False
+
 from .cython import _cluster as cluster
 
 from lingpy.thirdparty import linkcomm as lc
@@ -266,7 +270,57 @@ def neighbor(matrix, taxa, distances=True):
     return cluster.neighbor(matrix, taxa, distances)
 
 
-def fuzzy(threshold, matrix, taxa, method='upgma', revert=False):
+def _flat_linkage(method, threshold, matrix):
+    """
+    Carry out a flat linkage clustering on a NumPy array.
+
+    Notes
+    -----
+    The distances between clusters are updated with the Lance-Williams
+    formula instead of being recomputed from all members, and clusters are
+    merged in the same order as in :py:func:`flat_cluster`.
+    """
+    dists = np.array(matrix, dtype=float)
+    size = len(dists)
+    clusters = {i: [i] for i in range(size)}
+    if method not in ['upgma', 'single', 'complete']:
+        return clusters
+    sizes = np.ones(size)
+    np.fill_diagonal(dists, np.inf)
+
+    while len(clusters) > 1:
+        i, j = divmod(int(np.argmin(dists)), size)
+        if not dists[i, j] <= threshold:
+            break
+        if method == 'upgma':
+            total = sizes[i] + sizes[j]
+            row = (sizes[i] * dists[i] + sizes[j] * dists[j]) / total
+            col = (sizes[i] * dists[:, i] + sizes[j] * dists[:, j]) / total
+        elif method == 'single':
+            row = np.minimum(dists[i], dists[j])
+            col = np.minimum(dists[:, i], dists[:, j])
+        else:
+            row = np.maximum(dists[i], dists[j])
+            col = np.maximum(dists[:, i], dists[:, j])
+        dists[i], dists[:, i] = row, col
+        dists[i, i] = dists[j] = dists[:, j] = np.inf
+        sizes[i] += sizes[j]
+        clusters[i] += clusters.pop(j)
+
+    return clusters
+
+
+def _leave_one_out(idx, matrix, method, threshold):
+    """
+    Flat-cluster the matrix without the taxon with the given index.
+    """
+    mask = np.arange(len(matrix)) != idx
+    indices = np.arange(len(matrix))[mask].tolist()
+    clusters = _flat_linkage(method, threshold, matrix[np.ix_(mask, mask)])
+    return [[indices[i] for i in clr] for clr in clusters.values()]
+
+
+def fuzzy(threshold, matrix, taxa, method='upgma', revert=False, processes=1):
     """
     Create fuzzy cluster of a given distance matrix.
 
@@ -291,6 +345,10 @@ def fuzzy(threshold, matrix, taxa, method='upgma', revert=False):
     revert : bool (default=False)
         Specify whether a reverted dictionary should be returned.
 
+    processes : int (default=1)
+        The number of processes among which the flat cluster analyses of the
+        reduced matrices are distributed.
+
     Returns
     -------
     cluster : dict
@@ -341,19 +399,17 @@ def fuzzy(threshold, matrix, taxa, method='upgma', revert=False):
     for taxon in taxa:
         g.add_node(taxon)
 
-    for idx, taxon in enumerate(taxa):
-        new_matrix = []
-        for i, line in enumerate(matrix):
-            for j, cell in enumerate(line):
-                if i < j and i != idx and j != idx:
-                    new_matrix += [cell]
-        new_matrix = misc.squareform(new_matrix)
+    # the upper triangle of the matrix is used, as in flat_cluster
+    matrix = np.triu(np.array(matrix, dtype=float), 1)
+    matrix = matrix + matrix.T
 
-        clusters = cluster.flat_cluster(
-            method, threshold, new_matrix, [t for t in taxa if t != taxon])
+    runs = util.parallel_map(
+        _leave_one_out, range(len(taxa)), processes,
+        (matrix, method, threshold))
 
+    for clusters in runs:
         for clr in clusters:
-            for tA, tB in util.combinations2(clusters[clr]):
+            for tA, tB in util.combinations2([taxa[i] for i in clr]):
                 if not g.has_edge(tA, tB):
                     g.add_edge(tA, tB, weight=1)
                 else:
@@ -456,63 +512,81 @@ def matrix2groups(threshold, matrix, taxa, cluster_method="upgma"):
     return out
 
 
-def _get_wad(matrix, threshold, use_log=False):
+def _stack_matrices(matrices):
     """
-    Get weighted average degree.
-    """
-    def log_f(x):
-        return -np.log(1 - x) if use_log else x
-
-    degreeDict = defaultdict(list)
-
-    for i, j in util.combinations2(range(len(matrix))):
-        score = matrix[i][j]
-        if score < threshold:
-            deg = log_f(score)
-            degreeDict[i].append(deg)
-            degreeDict[j].append(deg)
-
-    deg_sum = 0
-    for weights in degreeDict.values():
-        deg = sum(weights)
-        deg_sum += deg
+    Stack distance matrices of different size into one array.
 
-    if degreeDict:
-        return deg_sum / len(degreeDict)
-
-
-def find_threshold(matrix, thresholds=[i * 0.05 for i in range(1, 19)][::-1], logs=True):
+    The upper triangle of each matrix is mirrored, and cells outside of the
+    matrices or on the diagonal are set to infinity.
     """
-    Use a variant of the method by :evobib:`Apeltsin2011` in order to find an optimal
-    threshold.
-
-    Parameters
-    ----------
-    matrix : list
-        The distance matrix for which the threshold shall be determined.
-    thresholds : list (default=[i*0.05 for i in range(1,19)[::-1])
-        The range of thresholds that shall be tested.
-    logs : {bool,builtins.function} (default=True)
-        If set to **True**, the logarithm of the score beyond the threshold will
-        be assigned as weight to the graph. If set to c{False} all weights will
-        be set to 1. Use a custom function to define individual ways to
-        calculate the weights.
+    size = max([len(matrix) for matrix in matrices] or [0])
+    stack = np.full((len(matrices), size, size), np.inf)
+    for i, matrix in enumerate(matrices):
+        if not len(matrix):
+            continue
+        matrix = np.array(matrix, dtype=float)
+        rows, cols = np.triu_indices(len(matrix), 1)
+        stack[i, rows, cols] = stack[i, cols, rows] = matrix[rows, cols]
+    return stack
+
+
+def _get_wads(stack, thresholds, use_log=False):
+    """
+    Get weighted average degrees for stacked matrices and all thresholds.
 
     Returns
     -------
-    threshold : {float,None}
-        If a float is returned, this is the threshold identified by the method.
-        If **None** is returned, no threshold could be identified.
+    wads : numpy.ndarray
+        An array with one row per matrix and one column per threshold, with
+        NaN for thresholds under which no links remain.
 
     Notes
     -----
-    This is a very simple method that may not work well depending on the
-    dataset. So we recommend to use it with great care.
+    The degrees of the nodes are summed up in the order in which the nodes
+    occur in the links of the matrix, using cumulative sums, in order to
+    yield exactly the same values as a computation with nested loops.
     """
+    size = stack.shape[1]
+    if not size:
+        return np.full((len(stack), len(thresholds)), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weights = -np.log(1 - stack) if use_log else stack
+
+    # links have shape (matrices, thresholds, nodes, nodes)
+    links = stack[:, None] < np.asarray(
+        thresholds, dtype=float)[None, :, None, None]
+    degrees = np.cumsum(
+        np.where(links, weights[:, None], 0.0), axis=3)[..., -1]
+
+    # order the nodes by their first link
+    nodes = np.arange(size)
+    partners = np.argmax(links, axis=3)
+    linked = links.any(axis=3)
+    keys = np.where(
+        linked,
+        np.minimum(nodes, partners) * size + np.maximum(nodes, partners),
+        size * size)
+    order = np.argsort(keys, axis=2, kind='stable')
+    degrees = np.take_along_axis(degrees, order, axis=2)
+    counts = linked.sum(axis=2)
+    sums = np.cumsum(degrees, axis=2)[..., -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
 
-    # get the old degree of the matrix
-    odeg = _get_wad(matrix, 1)
 
+def _get_wad(matrix, threshold, use_log=False):
+    """
+    Get weighted average degree.
+    """
+    wad = _get_wads(_stack_matrices([matrix]), [threshold], use_log)[0, 0]
+    if not np.isnan(wad):
+        return float(wad)
+
+
+def _find_plateau(odeg, thresholds, ndegs):
+    """
+    Find the plateau of maximal length in a series of degrees.
+    """
     # store the plateaus (where nothing changes in the network)
     plato = {0: [1.0]}
 
@@ -522,10 +596,7 @@ def find_threshold(matrix, thresholds=[i * 0.05 for i in range(1, 19)][::-1], lo
     alls = []
 
     # start iterating and calculating
-    for i, t in enumerate(thresholds[1:], 1):
-        # get the new degree of the matrix under threshold t
-        ndeg = _get_wad(matrix, t, logs)
-
+    for i, (t, ndeg) in enumerate(zip(thresholds[1:], ndegs), 1):
         # if there is a new degree
         if ndeg:
             # get the change in comparison with the old degree
@@ -559,6 +630,93 @@ def find_threshold(matrix, thresholds=[i * 0.05 for i in range(1, 19)][::-1], lo
         return
 
 
+def find_threshold(matrix, thresholds=[i * 0.05 for i in range(1, 19)][::-1], logs=True):
+    """
+    Use a variant of the method by :evobib:`Apeltsin2011` in order to find an optimal
+    threshold.
+
+    Parameters
+    ----------
+    matrix : list
+        The distance matrix for which the threshold shall be determined.
+    thresholds : list (default=[i*0.05 for i in range(1,19)[::-1])
+        The range of thresholds that shall be tested.
+    logs : {bool,builtins.function} (default=True)
+        If set to **True**, the logarithm of the score beyond the threshold will
+        be assigned as weight to the graph. If set to c{False} all weights will
+        be set to 1. Use a custom function to define individual ways to
+        calculate the weights.
+
+    Returns
+    -------
+    threshold : {float,None}
+        If a float is returned, this is the threshold identified by the method.
+        If **None** is returned, no threshold could be identified.
+
+    Notes
+    -----
+    This is a very simple method that may not work well depending on the
+    dataset. So we recommend to use it with great care.
+
+    See also
+    --------
+    find_thresholds
+    """
+    return find_thresholds([matrix], thresholds=thresholds, logs=logs)[0]
+
+
+def find_thresholds(
+        matrices,
+        thresholds=[i * 0.05 for i in range(1, 19)][::-1],
+        logs=True,
+        chunksize=10000000):
+    """
+    Find optimal thresholds for a list of distance matrices at once.
+
+    Parameters
+    ----------
+    matrices : list
+        The distance matrices, for example of all concepts in a wordlist.
+    thresholds : list (default=[i*0.05 for i in range(1,19)[::-1])
+        The range of thresholds that shall be tested.
+    logs : bool (default=True)
+        If set to **True**, the logarithm of the score beyond the threshold will
+        be assigned as weight to the graph.
+    chunksize : int (default=10000000)
+        The maximal number of cells in the array of links which is computed
+        for a chunk of matrices, with matrices of similar size being
+        processed together.
+
+    Returns
+    -------
+    thresholds : list
+        The threshold identified for each of the matrices, or **None** if no
+        threshold could be identified, as in
+        :py:func:`~lingpy.algorithm.clustering.find_threshold`.
+
+    Notes
+    -----
+    The weighted average degrees of the networks under all thresholds are
+    computed for stacked matrices in one vectorized operation.
+    """
+    out = [None for matrix in matrices]
+    order = sorted(range(len(matrices)), key=lambda i: len(matrices[i]))
+    steps = max(1, len(thresholds))
+    while order:
+        size = max(1, len(matrices[order[-1]]))
+        chunk = order[-max(1, chunksize // (steps * size * size)):]
+        order = order[:-len(chunk)]
+        stack = _stack_matrices([matrices[i] for i in chunk])
+        odegs = _get_wads(stack, [1])[:, 0]
+        ndegs = _get_wads(stack, thresholds[1:], logs)
+        for i, odeg, ndeg in zip(chunk, odegs, ndegs):
+            out[i] = _find_plateau(
+                None if np.isnan(odeg) else float(odeg),
+                thresholds,
+                [None if np.isnan(x) else float(x) for x in ndeg])
+    return out
+
+
 def link_clustering(
         threshold,
         matrix,
@@ -643,30 +801,24 @@ def link_clustering(
     else:
         raise ValueError(matrix_type)
 
-    # get the edges and the adjacency from the thresholds
-    edges = set()
-    adjacency = dict([(t, set()) for t in taxa])
-    weights = {}
+    # get the edges from the thresholds, edges are identified by their
+    # position in the arrays of their end points
+    rows, cols, weights = [], [], []
 
     for i, j in util.combinations2(range(len(taxa))):
-        taxA, taxB = taxa[i], taxa[j]
         if evaluate(matrix[i][j]):
-            edges.add((taxA, taxB))
-            adjacency[taxA].add(taxB)
-            adjacency[taxB].add(taxA)
+            rows.append(i)
+            cols.append(j)
         elif matrix_type == 'weights':
             if matrix[i][j] < threshold:
-                edges.add((taxA, taxB))
-                adjacency[taxA].add(taxB)
-                adjacency[taxB].add(taxA)
-                edges.add((taxB, taxA))
-                weights[taxA, taxB] = -np.log2((1 - matrix[i][j]) ** 2)
-                weights[taxB, taxA] = -np.log2((1 - matrix[i][j]) ** 2)
+                rows.append(i)
+                cols.append(j)
+                weights.append(-np.log2((1 - matrix[i][j]) ** 2))
     weights = weights or None
 
-    if edges:
+    if rows:
         # initialize the HLC object
-        hlc = lc.HLC(adjacency, edges)
+        hlc = lc.ArrayHLC(len(taxa), rows, cols, weights)
     else:
         # check for null edges: if they occur, return the clusters directly
         if revert:
@@ -681,7 +833,7 @@ def link_clustering(
                 return {a: b for a, b in zip(range(len(taxa)), taxa)}
 
     # carry out the analyses using defaults for the clustering
-    edge2cid = hlc.single_linkage(threshold=link_threshold, w=weights)[0]
+    edge2cid = hlc.single_linkage(threshold=link_threshold)[0]
 
     # retrieve all clusterings for the nodes
     # retrieve the data
@@ -689,28 +841,33 @@ def link_clustering(
     clr2edges = defaultdict(list)
 
     # count the links of
-    for edge, idx in edge2cid.items():
-        nodeA, nodeB = edge[0], edge[1]
-        clr2edges[idx].append(edge)
+    for i, idx in enumerate(edge2cid.tolist()):
+        nodeA, nodeB = taxa[rows[i]], taxa[cols[i]]
+        clr2edges[idx].append((nodeA, nodeB))
         clr2nodes[idx].extend([nodeA, nodeB])
 
     for idx in clr2nodes:
         clr2nodes[idx] = sorted(set(clr2nodes[idx]))
 
-    # delete all clusters that appear as subsets of larger clusters
+    # delete all clusters that appear as subsets of larger clusters, as well
+    # as all clusters sharing the same nodes, using an index of the clusters
+    # in which each node occurs
+    sets = defaultdict(list)
+    for key, nodes in clr2nodes.items():
+        sets[frozenset(nodes)].append(key)
+    node2sets = defaultdict(set)
+    for nodes in sets:
+        for node in nodes:
+            node2sets[node].add(nodes)
     delis = set()
-    for keyA, keyB in util.product2(sorted(clr2nodes)):
-        if keyA != keyB:
-            valsA = set(clr2nodes[keyA])
-            valsB = set(clr2nodes[keyB])
-
-            if valsA != valsB:
-                if valsA.issubset(valsB):
-                    delis.add(keyA)
-                elif valsB.issubset(valsA):
-                    delis.add(keyB)
-            elif valsA == valsB:
-                delis.add(keyB)
+    for nodes, keys in sets.items():
+        if len(keys) > 1:
+            delis.update(keys)
+        else:
+            candidates = sorted(
+                (node2sets[node] for node in nodes), key=len)
+            if len(set.intersection(*candidates)) > 1:
+                delis.update(keys)
     for k in delis:
         del clr2nodes[k]
 
@@ -718,10 +875,10 @@ def link_clustering(
     mapper = dict(zip(clr2nodes.keys(), range(1, len(clr2nodes) + 1)))
 
     out = {}
-    found = []
+    found = set()
     for idx in clr2nodes:
         out[mapper[idx]] = clr2nodes[idx]
-        found += clr2nodes[idx]
+        found.update(clr2nodes[idx])
     missing = [f for f in taxa if f not in found]
     idx = max(out.keys()) + 1
     for m in missing:
@@ -819,6 +976,254 @@ def _interprete_matrix(matrix):
     return out
 
 
+def _mcl_weights(scores, threshold, logs, matrix_type):
+    """
+    Select the links beyond the threshold and weight them in one pass.
+    """
+    scores = np.asarray(scores, dtype=float)
+    if matrix_type == 'distances':
+        keep = scores < threshold
+        if logs == True:
+            logs = lambda x: -np.log2((1 - x) ** 2)
+        elif logs == False:
+            logs = lambda x: x
+        else:
+            logs = np.vectorize(logs, otypes=[float])
+    elif matrix_type == 'similarities':
+        keep = scores > threshold
+        if logs == True:
+            logs = lambda x: -np.log(x ** 2)
+        else:
+            logs = lambda x: x
+    else:
+        raise ValueError(matrix_type)
+
+    weights = np.zeros(scores.shape)
+    weights[keep] = logs(scores[keep])
+    return weights
+
+
+def _prune_columns(matrix, pruning=1e-4, select=None, recover=0):
+    """
+    Prune a column-stochastic sparse matrix in the style of the MCL program.
+
+    Entries below the *pruning* threshold are removed, at most *select*
+    entries are kept per column, and columns which lost more than ten
+    percent of their mass get their *recover* largest entries back.
+    """
+    matrix = matrix.tocoo()
+    if not matrix.nnz:
+        return matrix.tocsr()
+    cols, data = matrix.col, matrix.data
+
+    # rank the entries inside their columns, starting from the largest
+    order = np.lexsort((-data, cols))
+    starts = np.searchsorted(cols[order], np.arange(matrix.shape[1]))
+    rank = np.empty(len(data), dtype=int)
+    rank[order] = np.arange(len(data)) - starts[cols[order]]
+
+    keep = data >= pruning
+    if select:
+        keep &= rank < select
+    if recover:
+        mass = np.bincount(cols, weights=data, minlength=matrix.shape[1])
+        kept = np.bincount(
+            cols[keep], weights=data[keep], minlength=matrix.shape[1])
+        lost = kept < 0.9 * mass
+        keep |= lost[cols] & (rank < recover)
+
+    return sparse.csr_matrix(
+        (data[keep], (matrix.row[keep], cols[keep])), shape=matrix.shape)
+
+
+def _normalize_sparse(matrix):
+    """
+    Normalize the columns of a sparse matrix.
+    """
+    matrix = matrix.tocsc()
+    sums = np.asarray(matrix.sum(axis=0)).ravel()
+    sums[sums == 0] = 1
+    matrix.data /= np.repeat(sums, np.diff(matrix.indptr))
+    return matrix.tocsr()
+
+
+def _mcl_sparse(
+        matrix,
+        max_steps=1000,
+        inflation=2,
+        expansion=2,
+        pruning=1e-4,
+        select=None,
+        recover=0,
+        tolerance=1e-6):
+    """
+    Iterate the MCL process on a sparse matrix until the columns converge.
+    """
+    matrix = _prune_columns(
+        _normalize_sparse(matrix), pruning=pruning, select=select,
+        recover=recover)
+    matrix = _normalize_sparse(matrix)
+
+    steps = 0
+    while True:
+        previous = matrix
+
+        # expansion
+        for i in range(expansion - 1):
+            matrix = matrix @ previous
+
+        # inflation
+        matrix = matrix.power(inflation)
+
+        # pruning and normalization
+        matrix = _normalize_sparse(_prune_columns(
+            _normalize_sparse(matrix), pruning=pruning, select=select,
+            recover=recover))
+
+        steps += 1
+
+        # check for the maximal change in the columns
+        change = abs(matrix - previous)
+        if steps >= max_steps or not change.nnz or change.max() < tolerance:
+            log.debug("Number of steps {0}.".format(steps))
+            break
+
+    # look for attracting nodes, taking the rows in their order
+    clusters = [0 for i in range(matrix.shape[0])]
+    flags = np.zeros(matrix.shape[0], dtype=bool)
+    idx = 0
+    for i in range(matrix.shape[0]):
+        row = matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]]
+        row = row[~flags[row]]
+        if len(row):
+            idx += 1
+            flags[row] = True
+            for j in row:
+                clusters[j] = idx
+
+    if sum(clusters) == 0:
+        return list(range(len(clusters)))
+    return clusters
+
+
+def _dense_mcl_clusters(
+        threshold,
+        matrix,
+        max_steps=1000,
+        inflation=2,
+        expansion=2,
+        add_self_loops=True,
+        logs=True,
+        matrix_type="distances"):
+    """
+    Carry out the MCL process on a dense matrix.
+    """
+    imatrix = np.array(matrix, dtype=float)
+
+    # check for threshold, the upper triangle is mirrored
+    weights = _mcl_weights(imatrix, threshold, logs, matrix_type)
+    if threshold:
+        weights = np.triu(weights, 1)
+        imatrix = weights + weights.T + np.diag(np.diag(imatrix))
+
+    # check for self_loops
+    if add_self_loops == True:
+        np.fill_diagonal(imatrix, 1)
+    elif add_self_loops == False:
+        pass
+    else:
+        for i in range(len(imatrix)):
+            imatrix[i][i] = add_self_loops(imatrix[:, i])
+
+    # normalize the matrix
+    imatrix = _normalize_matrix(imatrix)
+
+    # start looping and the like
+    steps = 0
+    while True:
+        # expansion
+        imatrix = np.linalg.matrix_power(imatrix, expansion)
+
+        # inflation
+        imatrix = imatrix ** inflation
+
+        # normalization
+        imatrix = _normalize_matrix(imatrix)
+
+        # increase steps
+        steps += 1
+
+        # check for matrix convergence
+        if steps >= max_steps or _is_idempotent(imatrix):
+            log.debug("Number of steps {0}.".format(steps))
+            break
+
+    # retrieve the clusters
+    return _interprete_matrix(imatrix)
+
+
+def _sparse_mcl_clusters(
+        threshold,
+        matrix,
+        max_steps=1000,
+        inflation=2,
+        expansion=2,
+        add_self_loops=True,
+        logs=True,
+        matrix_type="distances",
+        pruning=1e-4,
+        select=None,
+        recover=0,
+        tolerance=1e-6):
+    """
+    Carry out the MCL process on a sparse matrix.
+    """
+    if not sparse:
+        raise ValueError("The package scipy is needed to run this analysis.")
+
+    # only the upper triangle is used and mirrored, as in the dense case
+    if sparse.issparse(matrix):
+        imatrix = sparse.coo_matrix(matrix, dtype=float)
+        diagonal = imatrix.diagonal()
+        upper = sparse.triu(imatrix, 1).tocoo()
+        rows, cols, scores = upper.row, upper.col, upper.data
+    else:
+        imatrix = np.asarray(matrix, dtype=float)
+        diagonal = np.diag(imatrix).copy()
+        rows, cols = np.triu_indices(len(imatrix), 1)
+        scores = imatrix[rows, cols]
+        nonzero = scores != 0
+        rows, cols, scores = rows[nonzero], cols[nonzero], scores[nonzero]
+
+    weights = _mcl_weights(scores, threshold, logs, matrix_type) \
+        if threshold else scores
+    nonzero = weights != 0
+    rows, cols, weights = rows[nonzero], cols[nonzero], weights[nonzero]
+    size = len(diagonal)
+    imatrix = sparse.csr_matrix(
+        (np.concatenate([weights, weights]),
+            (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(size, size))
+
+    # check for self_loops
+    if add_self_loops == True:
+        diagonal = np.ones(size)
+    elif add_self_loops != False:
+        imatrix = imatrix.tocsc()
+        diagonal = np.array([
+            add_self_loops(np.asarray(
+                imatrix[:, i].todense()).ravel() + (np.arange(size) == i) *
+                diagonal[i])
+            for i in range(size)], dtype=float)
+    imatrix = (imatrix + sparse.diags(diagonal)).tocsr()
+    imatrix.eliminate_zeros()
+
+    return _mcl_sparse(
+        imatrix, max_steps=max_steps, inflation=inflation,
+        expansion=expansion, pruning=pruning, select=select,
+        recover=recover, tolerance=tolerance)
+
+
 def mcl(
         threshold,
         matrix,
@@ -829,7 +1234,12 @@ def mcl(
         add_self_loops=True,
         revert=False,
         logs=True,
-        matrix_type="distances"):
+        matrix_type="distances",
+        sparse_matrix=False,
+        pruning=1e-4,
+        select=None,
+        recover=0,
+        tolerance=1e-6):
     """
     Carry out a clustering using the MCL algorithm (:evobib:`Dongen2000`).
 
@@ -841,7 +1251,9 @@ def mcl(
         will be used directly.
 
     matrix : list
-        A two-dimensional list containing the distances.
+        A two-dimensional list containing the distances. If *sparse_matrix* is
+        set to c{True}, a matrix from scipy.sparse can be passed as well, with
+        missing cells being treated as unlinked.
 
     taxa : list
         An list containing the names of all taxa corresponding to the distances
@@ -873,6 +1285,29 @@ def mcl(
         it will be adapted to similarity data. If it contains "similarities",
         no adaptation is needed.
 
+    sparse_matrix : bool (default=False)
+        If set to c{True}, the matrix is handled as a sparse matrix in
+        compressed sparse row format, and the expansion steps are pruned in
+        the style of the original MCL program. This mode requires the scipy
+        package and is intended for large graphs, such as similarity graphs
+        spanning all words in a dataset.
+
+    pruning : float (default=1e-4)
+        In sparse mode, entries of the column-normalized matrix which are
+        below this value are removed after each expansion step.
+
+    select : int (default=None)
+        In sparse mode, the maximal number of entries kept per column after
+        pruning.
+
+    recover : int (default=0)
+        In sparse mode, the number of largest entries which are recovered for
+        a column if pruning removed more than ten percent of its mass.
+
+    tolerance : float (default=1e-6)
+        In sparse mode, the iteration stops when no cell of the matrix changes
+        by more than this value in one step.
+
     Examples
     --------
 
@@ -901,81 +1336,151 @@ def mcl(
     {1: ['German', 'English', 'Dutch'], 2: ['Swedish', 'Icelandic']}
 
     """
-    # check for type of matrix
-    if type(matrix) != np.ndarray:
-        imatrix = np.array(matrix)
+    if sparse_matrix:
+        clusters = _sparse_mcl_clusters(
+            threshold, matrix, max_steps=max_steps, inflation=inflation,
+            expansion=expansion, add_self_loops=add_self_loops, logs=logs,
+            matrix_type=matrix_type, pruning=pruning, select=select,
+            recover=recover, tolerance=tolerance)
     else:
-        imatrix = matrix.copy()
+        clusters = _dense_mcl_clusters(
+            threshold, matrix, max_steps=max_steps, inflation=inflation,
+            expansion=expansion, add_self_loops=add_self_loops, logs=logs,
+            matrix_type=matrix_type)
 
-    # check for matrix type and decide how to handle logs
-    if matrix_type == 'distances':
-        evaluate = lambda x: True if x < threshold else False
-        if logs == True:
-            logs = lambda x: -np.log2((1 - x) ** 2)
-        elif logs == False:
-            logs = lambda x: x
-    elif matrix_type == 'similarities':
-        evaluate = lambda x: True if x > threshold else False
-        if logs == True:
-            logs = lambda x: -np.log(x ** 2)
-        else:
-            logs = lambda x: x
-    else:
-        raise ValueError(matrix_type)
+    # modify clusters
+    if revert:
+        return dict(zip(range(len(taxa)), clusters))
 
-    # check for threshold
-    if threshold:
-        for i, j in util.combinations2(range(len(imatrix))):
-            score = imatrix[i][j]
-            evaluation = logs(score) if evaluate(score) else 0
-            imatrix[i][j] = evaluation
-            imatrix[j][i] = evaluation
+    clr = defaultdict(list)
+    for i, t in enumerate(taxa):
+        clr[clusters[i]].append(t)
 
-    # check for self_loops
-    if add_self_loops == True:
-        for i in range(len(imatrix)):
-            imatrix[i][i] = 1
-    elif add_self_loops == False:
-        pass
-    else:
-        for i in range(len(imatrix)):
-            imatrix[i][i] = add_self_loops(imatrix[:, i])
+    return clr
 
-    # normalize the matrix
-    imatrix = _normalize_matrix(imatrix)
 
-    # start looping and the like
-    steps = 0
-    while True:
-        # expansion
-        imatrix = np.linalg.matrix_power(imatrix, expansion)
+def _find_root(parents, node):
+    """
+    Find the root of a node in a union-find structure, compressing the path.
+    """
+    root = node
+    while parents[root] != root:
+        root = parents[root]
+    while parents[node] != root:
+        parents[node], node = root, parents[node]
+    return root
 
-        # inflation
-        imatrix = imatrix ** inflation
 
-        # normalization
-        imatrix = _normalize_matrix(imatrix)
+def connected_components(size, rows, cols):
+    """
+    Compute the connected components of a sparse graph with union-find.
 
-        # increase steps
-        steps += 1
+    Parameters
+    ----------
+    size : int
+        The number of nodes in the graph, nodes are given as integers from 0
+        to size - 1.
+    rows, cols : list
+        The end points of the links in the graph.
 
-        # check for matrix convergence
-        if steps >= max_steps or _is_idempotent(imatrix):
-            log.debug("Number of steps {0}.".format(steps))
-            break
+    Returns
+    -------
+    clusters : list
+        A list of cluster identifiers for all nodes, starting from 1 and
+        numbered in the order of the first node of each component.
+    """
+    parents = list(range(size))
+    for i, j in zip(rows, cols):
+        i, j = _find_root(parents, int(i)), _find_root(parents, int(j))
+        if i != j:
+            parents[max(i, j)] = min(i, j)
+
+    clusters, roots = [], {}
+    for i in range(size):
+        root = _find_root(parents, i)
+        if root not in roots:
+            roots[root] = len(roots) + 1
+        clusters.append(roots[root])
+    return clusters
+
+
+def partition_densities(matrix, thresholds):
+    """
+    Calculate partition densities for a range of thresholds in one pass.
 
-    # retrieve the clusters
-    clusters = _interprete_matrix(imatrix)
+    Parameters
+    ----------
+    matrix : list
+        The two-dimensional distance matrix.
+    thresholds : list
+        The thresholds for which partition densities will be computed.
 
-    # modify clusters
-    if revert:
-        return dict(zip(range(len(taxa)), clusters))
+    Returns
+    -------
+    densities : list
+        A list of tuples of partition density and number of connected
+        components, in the order of the thresholds.
 
-    clr = defaultdict(list)
-    for i, t in enumerate(taxa):
-        clr[clusters[i]].append(t)
+    Notes
+    -----
+    The links of the matrix are sorted once by their distance and the
+    connected components are then updated incrementally with a union-find
+    structure while sweeping through the thresholds, keeping track of the
+    number of nodes and links in each component. See :evobib:`Ahn2012` for
+    details on the calculation of partition density in a given network.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    size = len(matrix)
+    rows, cols = np.triu_indices(size, 1)
+    scores = matrix[rows, cols]
+    order = np.argsort(scores, kind='stable')
+    rows, cols, scores = rows[order].tolist(), cols[order].tolist(), \
+        scores[order].tolist()
+
+    parents = list(range(size))
+    nodes = [1 for i in range(size)]
+    links = [0 for i in range(size)]
+    # the smallest node of a component determines its position in the sum
+    firsts = list(range(size))
+    clusters = set()
+    components = size
+    T = 0
+    pos = 0
+
+    densities = [None for t in thresholds]
+    for idx in sorted(range(len(thresholds)), key=lambda x: thresholds[x]):
+        t = thresholds[idx]
+        while pos < len(scores) and scores[pos] < t:
+            i = _find_root(parents, rows[pos])
+            j = _find_root(parents, cols[pos])
+            if i != j:
+                if nodes[i] < nodes[j]:
+                    i, j = j, i
+                parents[j] = i
+                nodes[i] += nodes[j]
+                links[i] += links[j]
+                firsts[i] = min(firsts[i], firsts[j])
+                clusters.discard(j)
+                clusters.add(i)
+                components -= 1
+            links[i] += 1
+            T += 1
+            pos += 1
+
+        # return zero, if all components are different
+        if components == size:
+            densities[idx] = (0.0, components)
+            continue
+
+        # count density
+        D = 0
+        x = 1
+        for root in sorted(clusters, key=lambda r: firsts[r]):
+            N, M = nodes[root], links[root]
+            D += M * (M - (N - x)) / ((N - 1 + x) * (N - x))
+        densities[idx] = (2 / T * D, components)
 
-    return clr
+    return densities
 
 
 def partition_density(matrix, t):
@@ -987,88 +1492,7 @@ def partition_density(matrix, t):
     See :evobib:`Ahn2012` for details on the calculation of partition density
     in a given network.
     """
-
-    # compute cutoff for matrix at t
-    m = np.zeros((len(matrix), len(matrix)))
-
-    for i, j in util.combinations2(range(len(matrix))):
-        if matrix[i][j] < t:
-            m[j][i] = m[i][j] = 1
-
-    # get the total number of links
-    T = sum(m.flatten()) / 2
-
-    # get connected components
-    nodes = list(range(len(m)))
-    idx = 1
-    parts = [0 for i in range(len(m))]
-
-    for i, j in util.combinations2(range(len(m))):
-        if m[i][j] == 1:
-            if parts[i] == parts[j] and parts[i] != 0:
-                pass
-            else:
-                # most complicated, update all the stuff
-                if parts[i] > 0 and parts[j] > 0:
-
-                    # determine best idx
-                    if parts[i] > parts[j]:
-                        this = parts[j]
-                        other = parts[i]
-                    else:
-                        this = parts[i]
-                        other = parts[j]
-
-                    # find all neighbors of the
-                    idxs = [n for n in nodes if parts[n] == other]
-                    for n in idxs:
-                        parts[n] = this
-                elif parts[i] == 0 and parts[j] == 0:
-                    parts[i] = idx
-                    parts[j] = idx
-                    idx += 1
-                elif parts[i] > 0:
-                    parts[j] = parts[i]
-                elif parts[j] > 0:
-                    parts[i] = parts[j]
-
-    # finish unconnected components
-    for i, p in enumerate(parts):
-        if p == 0:
-            parts[i] = max(parts) + 1
-
-    # convert to dictionary
-    components = sorted(set(parts))
-
-    # return zero, if all components are different
-    if len(components) == len(m):
-        return 0.0, len(components)
-
-    # count density
-    D = 0
-
-    for part in components:
-        # get nodes
-        nodes = [n for n in range(len(parts)) if parts[n] == part]
-
-        # get edges
-        edges = 0
-        for i, j in util.combinations2(range(len(nodes))):
-            if m[nodes[i]][nodes[j]] == 1:
-                edges += 1
-
-        N = len(nodes)
-        M = edges
-
-        # calculate sum formula
-        x = 1
-        try:
-            t = M * (M - (N - x)) / ((N - 1 + x) * (N - x))
-            D += t
-        except ZeroDivisionError:
-            pass
-
-    return 2 / T * D, len(components)
+    return partition_densities(matrix, [t])[0]
 
 
 def best_threshold(matrix, trange=(0.3, 0.7, 0.05)):
@@ -1084,10 +1508,9 @@ def best_threshold(matrix, trange=(0.3, 0.7, 0.05)):
     """
     best_score = 0
     best_t = False
-    pds = []
-    for t in np.arange(*trange):
-        p = partition_density(matrix, t)
-        pds += [(p[0], p[1], t)]
+    thresholds = np.arange(*trange)
+    pds = [(p[0], p[1], t) for p, t in zip(
+        partition_densities(matrix, thresholds), thresholds)]
 
     # strip off the hightes values from the end
     delis = []
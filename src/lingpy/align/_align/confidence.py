@@ -3,12 +3,100 @@ Calculate confidence scores for the scoring functions in alignment plots.
 """
 import html as cgi
 
+import numpy as np
+
 from lingpy.sequence.sound_classes import class2tokens, token2class
 from lingpy.settings import rcParams
-from lingpy.util import charstring, dotjoin
+from lingpy.util import charstring, dotjoin, parallel_map
+
+
+def _score_matrix(scorer, symbols):
+    """
+    Return a symmetric score matrix and the row of each symbol in it.
+
+    The cell for two symbols holds the maximum of both lookup directions,
+    unknown symbols score like in
+    :py:class:`~lingpy.algorithm._misc.ScoreDict`.
+    """
+    if hasattr(scorer, 'chars2int'):
+        size = len(scorer.matrix)
+        scores = np.full((size + 1, size + 1), -22.5)
+        if size:
+            scores[:size, :size] = np.array(scorer.matrix, dtype=float)
+        codes = [scorer.chars2int.get(symbol, size) for symbol in symbols]
+    else:
+        scores = np.array(
+            [[scorer[a, b] for b in symbols] for a in symbols], dtype=float)
+        codes = list(range(len(symbols)))
+    return np.maximum(scores, scores.T), np.array(codes, dtype=int)
+
+
+def _confidence_matrix(task, scores, gap_weight):
+    """
+    Compute the confidence of all cells of one encoded alignment.
+
+    Parameters
+    ----------
+    task : tuple
+        The tuple *codes*, *gaps_a*, *gaps_b*, in which *codes* is the integer
+        matrix of the alignment with rows of the score matrix for segments and
+        -1 for gaps, and *gaps_a* and *gaps_b* are the rows of the gap symbols
+        of each sequence, used when the sequence itself is gapped (*gaps_a*)
+        or when it is compared against a non-gapped cell (*gaps_b*).
+    """
+    codes, gaps_a, gaps_b = task
+    height = codes.shape[0]
+    gaps = codes < 0
+    left = np.where(gaps, gaps_a[:, None], codes)[:, None, :]
+    right = np.where(gaps, gaps_b[:, None], codes)[None, :, :]
+    weights = np.where(
+        gaps[:, None, :] | gaps[None, :, :], gap_weight, 1.0)
+    weights[gaps[:, None, :] & gaps[None, :, :]] = 0.0
+    weights[np.arange(height), np.arange(height), :] = 0.0
+
+    total = (scores[left, right] * weights).sum(axis=1)
+    count = weights.sum(axis=1)
+    score = np.where(count != 0, total / np.where(count != 0, count, 1), -25)
+    return np.trunc(score + 0.5).astype(int).tolist()
+
+
+def _alignment_matrix(alms, msa, numbers=True):
+    """
+    Return the alignment of an MSA with segments replaced by their numbers.
+    """
+    if numbers:
+        return [class2tokens(alms[idx, 'numbers'], alm)
+                for idx, alm in zip(msa['ID'], msa['alignment'])]
+    return msa['alignment']
 
 
-def get_confidence(alms, scorer, ref='lexstatid', gap_weight=1):
+def _count_correspondences(msa, alignment, concept, corrs, occs):
+    """
+    Compute the character matrix of an MSA and count its correspondences.
+    """
+    taxa = msa['taxa']
+    character_matrix = [
+        [dotjoin(taxa[i], msa['alignment'][i][j], num.split('.')[2])
+         if num != '-' else '-' for j, num in enumerate(nums)]
+        for i, nums in enumerate(alignment)]
+    columns = [
+        [i for i, line in enumerate(character_matrix) if line[j] != '-']
+        for j in range(len(character_matrix[0]) if character_matrix else 0)]
+
+    for i, chars in enumerate(character_matrix):
+        for j, charA in enumerate(chars):
+            if charA == '-':
+                continue
+            occs.setdefault(charA, []).append(concept)
+            for k in columns[j]:
+                if k != i:
+                    counts = corrs.setdefault(charA, {})
+                    charB = character_matrix[k][j]
+                    counts[charB] = counts.get(charB, 0) + 1
+    return character_matrix
+
+
+def get_confidence(alms, scorer, ref='lexstatid', gap_weight=1, processes=1):
     """
     Function creates confidence scores for a given set of alignments.
 
@@ -22,9 +110,21 @@ def get_confidence(alms, scorer, ref='lexstatid', gap_weight=1):
     ref : str (default="lexstatid")
         The reference entry-type, referring to the cognate-set to be used for
         the analysis.
+    gap_weight : float (default=1)
+        The weight assigned to matches containing gaps.
+    processes : int (default=1)
+        The number of worker processes among which the cognate sets are
+        distributed when computing the confidence scores.
+
+    Notes
+    -----
+    All alignments are encoded as integer matrices pointing into one score
+    matrix, so that the confidence of each cognate set is computed with
+    vectorised lookups instead of per-cell dictionary access.
     """
-    # store all values for average scores
-    values = []
+    # pre-index the taxa and the symbols
+    taxon_index = {taxon: i for i, taxon in enumerate(alms.taxa)}
+    symbols = {}
 
     # store all correspondences
     corrs = {}
@@ -32,109 +132,45 @@ def get_confidence(alms, scorer, ref='lexstatid', gap_weight=1):
     # store occurrences
     occs = {}
 
+    keys, tasks = [], []
     for key, msa in alms.msa[ref].items():
         # get basic stuff
-        idxs = msa['ID']
         taxa = msa['taxa']
-        concept = cgi.escape(alms[idxs[0], 'concept'], True)
+        concept = cgi.escape(alms[msa['ID'][0], 'concept'], True)
 
         # get numerical representation of alignments
-        if scorer:
-            alignment = [class2tokens(
-                alms[idxs[i], 'numbers'],
-                msa['alignment'][i]) for i in range(len(idxs))]
-        else:
-            alignment = msa['alignment']
-
-        # create new array for confidence
-        confidence_matrix = []
-        character_matrix = []
-
-        # iterate over each taxon
-        for i, taxon in enumerate(taxa):
-            idx = alms.taxa.index(taxon) + 1
-
-            # get the numerical sequence
-            nums = alignment[i]
-
-            # store confidences per line
-            confidences = []
-
-            # store chars per line
-            chars = []
-
-            # iterate over the sequence
-            for j, num in enumerate(nums):
-                col = [alm[j] for alm in alignment]
-                score = 0
-                count = 0
-
-                # get the char
-                if num != '-':
-                    charA = dotjoin(taxa[i], msa['alignment'][i][j], num.split('.')[2])
-                    chars += [charA]
-                    try:
-                        occs[charA] += [concept]
-                    except:
-                        occs[charA] = [concept]
-                else:
-                    chars += ['-']
-
-                for k, numB in enumerate(col):
-                    if k != i:
-                        if num == '-' and numB == '-':
-                            pass
-                        else:
-                            if numB != '-' and num != '-':
-                                # get the second char
-                                charB = dotjoin(
-                                    taxa[k], msa['alignment'][k][j], numB.split('.')[2])
-                                try:
-                                    corrs[charA][charB] += 1
-                                except:
-                                    try:
-                                        corrs[charA][charB] = 1
-                                    except:
-                                        corrs[charA] = {charB: 1}
-
-                            gaps = False
-                            if num == '-' and numB != '-':
-                                numA = charstring(idx)
-                                gaps = True
-                            elif numB == '-' and num != '-':
-                                numB = charstring(alms.taxa.index(taxa[k]))
-                                numA = num
-                                gaps = True
-                            else:
-                                numA = num
-
-                            scoreA = scorer[numA, numB]
-                            scoreB = scorer[numB, numA]
-                            this_score = max(scoreA, scoreB)
-
-                            if not gaps:
-                                score += this_score
-                                count += 1
-                            else:
-                                score += this_score * gap_weight
-                                count += gap_weight
-
-                if count:
-                    score = score / count
-                else:
-                    score = -25
-
-                confidences += [int(score + 0.5)]
-                values += [int(score + 0.5)]
-            confidence_matrix += [confidences]
-            character_matrix += [chars]
-
-        # append confidence matrix to alignments
+        alignment = _alignment_matrix(alms, msa, numbers=bool(scorer))
+        msa['_charmat'] = _count_correspondences(
+            msa, alignment, concept, corrs, occs)
+
+        codes = np.array(
+            [[-1 if num == '-' else symbols.setdefault(num, len(symbols))
+              for num in nums] for nums in alignment], dtype=int)
+        gaps_a = np.array([
+            symbols.setdefault(charstring(taxon_index[taxon] + 1), len(symbols))
+            for taxon in taxa], dtype=int)
+        gaps_b = np.array([
+            symbols.setdefault(charstring(taxon_index[taxon]), len(symbols))
+            for taxon in taxa], dtype=int)
+        keys.append(key)
+        tasks.append((codes, gaps_a, gaps_b))
+
+    scores, rows = _score_matrix(scorer, list(symbols))
+    tasks = [(np.where(codes < 0, -1, rows[codes]), rows[gaps_a], rows[gaps_b])
+             for codes, gaps_a, gaps_b in tasks]
+
+    matrices = list(parallel_map(
+        _confidence_matrix, tasks, processes, (scores, gap_weight)))
+
+    # store all values for average scores
+    values = set()
+    for key, confidence_matrix in zip(keys, matrices):
         alms.msa[ref][key]['confidence'] = confidence_matrix
-        alms.msa[ref][key]['_charmat'] = character_matrix
+        for line in confidence_matrix:
+            values.update(line)
 
     # sort the values
-    values = sorted(set(values + [1]))
+    values = sorted(values | {1})
 
     # make conversion to scale of 100 values
     converter = {}
@@ -246,68 +282,11 @@ def get_correspondences(alms, ref='lexstatid'):
     # store occurrences
     occs = {}
 
+    numbers = 'numbers' in alms.header
     for key, msa in alms.msa[ref].items():
-        # get basic stuff
-        idxs = msa['ID']
-        taxa = msa['taxa']
-        concept = cgi.escape(alms[idxs[0], 'concept'], True)
-
-        # get numerical representation of alignments
-        if 'numbers' in alms.header:
-            alignment = [class2tokens(
-                alms[idxs[i], 'numbers'],
-                msa['alignment'][i]) for i in range(len(idxs))]
-        else:
-            alignment = msa['alignment']
-
-        # create new array for confidence
-        character_matrix = []
-
-        # iterate over each taxon
-        for i, taxon in enumerate(taxa):
-            # get the numerical sequence
-            nums = alignment[i]
-
-            # store chars per line
-            chars = []
-
-            # iterate over the sequence
-            for j, num in enumerate(nums):
-                col = [alm[j] for alm in alignment]
-
-                # get the char
-                if num != '-':
-                    charA = dotjoin(taxa[i], msa['alignment'][i][j], num.split('.')[2])
-                    chars += [charA]
-                    try:
-                        occs[charA] += [concept]
-                    except:
-                        occs[charA] = [concept]
-                else:
-                    chars += ['-']
-
-                for k, numB in enumerate(col):
-                    if k != i:
-                        if num == '-' and numB == '-':
-                            pass
-                        else:
-                            if numB != '-' and num != '-':
-                                # get the second char
-                                charB = dotjoin(
-                                    taxa[k],
-                                    msa['alignment'][k][j],
-                                    numB.split('.')[2])
-                                try:
-                                    corrs[charA][charB] += 1
-                                except:
-                                    try:
-                                        corrs[charA][charB] = 1
-                                    except:
-                                        corrs[charA] = {charB: 1}
-
-            character_matrix += [chars]
-
-        # append confidence matrix to alignments
-        alms.msa[ref][key]['_charmat'] = character_matrix
+        concept = cgi.escape(alms[msa['ID'][0], 'concept'], True)
+        alignment = _alignment_matrix(alms, msa, numbers=numbers)
+        alms.msa[ref][key]['_charmat'] = _count_correspondences(
+            msa, alignment, concept, corrs, occs)
 
     return corrs, occs
@@ -1,10 +1,15 @@
 """
 Module provides classes and functions for multiple alignment analyses.
 """
+import heapq
 import logging
+import time
 from itertools import combinations, combinations_with_replacement, product
 from collections import defaultdict
 from functools import partial
+from bisect import bisect_left
+
+import numpy as np
 
 from lingpy.algorithm import calign
 from lingpy.algorithm import talign
@@ -20,6 +25,73 @@ from lingpy import log
 from lingpy.util import setdefaults, identity, dotjoin, as_string
 
 
+class _SparseLibrary:
+    """
+    Library of position-pair scores in compressed sparse row format.
+
+    Parameters
+    ----------
+    residues : list
+        The internal numbers of all residues, in the order of the rows.
+    sequences : list
+        The index of the sequence of each residue.
+    base : callable
+        A function which returns the initial score for two rows.
+
+    Notes
+    -----
+    The extended scores are stored for unordered pairs of rows, with the
+    smaller row as the row and the larger row as the column of the matrix.
+    Looking up a pair of residues returns the sum of the initial and the
+    extended score, which is what the dense library of
+    :py:meth:`Multiple._create_library` stores.
+    """
+
+    def __init__(self, residues, sequences, base):
+        self.residues = residues
+        self.sequences = sequences
+        self.rows = {residue: i for i, residue in enumerate(residues)}
+        self.base = base
+        self.indptr = [0 for _ in range(len(residues) + 1)]
+        self.indices = []
+        self.data = []
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, pair):
+        i, j = self.rows[pair[0]], self.rows[pair[1]]
+        if i > j:
+            i, j = j, i
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        pos = bisect_left(self.indices, j, start, stop)
+        if pos < stop and self.indices[pos] == j:
+            return self.base(i, j) + self.data[pos]
+        return self.base(i, j)
+
+    def extend(self, rowsA, rowsB, weights):
+        """
+        Add weights to the given pairs of rows.
+        """
+        size = len(self.residues)
+        rows = np.repeat(np.arange(size), np.diff(self.indptr))
+        rowsA = np.concatenate([rows, np.asarray(rowsA, dtype=np.int64)])
+        rowsB = np.concatenate([
+            np.array(self.indices, dtype=np.int64), np.asarray(rowsB, dtype=np.int64)])
+        weights = np.concatenate([
+            np.array(self.data, dtype=float), np.asarray(weights, dtype=float)])
+
+        keys, inverse = np.unique(
+            np.minimum(rowsA, rowsB) * size + np.maximum(rowsA, rowsB),
+            return_inverse=True)
+        data = np.bincount(inverse.ravel(), weights=weights, minlength=len(keys))
+        rows, self.indices = np.divmod(keys, size)
+        self.indptr = np.concatenate([[0], np.cumsum(
+            np.bincount(rows, minlength=size))]).tolist()
+        self.indices = self.indices.tolist()
+        self.data = data.tolist()
+
+
 class Multiple:
     """
     Basic class for multiple sequence alignment analyses.
@@ -428,6 +500,89 @@ class Multiple:
                 except:
                     pass
 
+    def _create_sparse_library(self):
+        """
+        Method creates an empty sparse library for alignments using the
+        Tcoffee approach.
+        """
+        residues, sequences = [], []
+        for i, numbers in enumerate(self._numbers):
+            residues += numbers
+            sequences += [i for _ in numbers]
+
+        sonars = [son for line in self._sonars for son in line] if self._sonars else []
+
+        # the initial scores follow the dense library, which keeps the
+        # original penalties for c-v matches if sonority profiles are used
+        def base(i, j):
+            if not sonars or sequences[i] == sequences[j]:
+                return 0.0
+            a, b = sonars[i], sonars[j]
+            if a >= 7 or b >= 7 and a + b < 14:
+                return self.scoredict[residues[i], residues[j]]
+            return 0.0
+
+        self.library = _SparseLibrary(residues, sequences, base)
+
+    def _extend_sparse_library(self, partners=0):
+        """
+        Extend the sparse library by new alignments.
+
+        Notes
+        -----
+        In contrast to :py:meth:`Multiple._extend_library`, the extension via
+        a third sequence only considers the *partners* closest sequences of
+        the third sequence, if *partners* is not 0.
+        """
+        rows = self.library.rows
+        rowsA, rowsB, weights = [], [], []
+
+        def add(pairs, sim):
+            rowsA.extend(rows[m] for m, n in pairs)
+            rowsB.extend(rows[n] for m, n in pairs)
+            weights.extend((sim + self.scorer[m, n]) / 2.0 for m, n in pairs)
+
+        # add the residue-pairs of all aligned sequences first
+        for i in range(self.height):
+            for j in range(i, self.height):
+                almA, almB, sim = self._alignments[i][j]
+                pairs = [(m, n) for m, n in zip(almA, almB) if m != '-' and n != '-']
+                if pairs:
+                    add(pairs, sim / float(len(almA)))
+
+        # map the residues of each sequence to the residues of the sequences
+        # with smaller index to which they are aligned
+        via = [{} for _ in range(self.height)]
+        for i in range(self.height):
+            for k in range(i + 1, self.height):
+                almI, almK, sim = self._alignments[i][k]
+                mapping = {}
+                for m, n in zip(almI, almK):
+                    if n != '-' and n not in mapping:
+                        mapping[n] = m
+                via[k][i] = (
+                    [mapping.get(char, '-') for char in self._numbers[k]],
+                    sim, len(almK))
+
+        # add the residue-pairs resulting from an alignment via a third sequence
+        for k in range(self.height):
+            candidates = sorted(via[k])
+            if partners:
+                closest = sorted(
+                    [i for i in range(self.height) if i != k],
+                    key=lambda i: self.matrix[k][i])[:partners]
+                candidates = [i for i in candidates if i in closest]
+            for a, i in enumerate(candidates):
+                valsI, simIK, lenIK = via[k][i]
+                for j in candidates[a:]:
+                    valsJ, simJK, lenJK = via[k][j]
+                    pairs = [(m, n) for m, n in zip(valsI, valsJ)
+                             if m != '-' and n != '-']
+                    if pairs:
+                        add(pairs, min(simIK, simJK) / ((lenIK + lenJK) / 2.0))
+
+        self.library.extend(rowsA, rowsB, weights)
+
     def _make_guide_tree(self, tree_calc='upgma'):
         """
         Create the guide tree using either the UPGMA or the Neighbor-Joining
@@ -894,9 +1049,21 @@ class Multiple:
             since this is the character that represents tones in the prosodic
             strings of sequences.
 
+        sparse : bool (default=False)
+            Store the library in a sparse matrix which only holds the scores
+            of residue pairs that were aligned in the pairwise analyses,
+            instead of a dictionary holding scores for all residue pairs.
+
+        partners : int (default=0)
+            If the library is sparse, only extend it via a third sequence for
+            the given number of sequences closest to the third sequence. Set
+            to 0 in order to consider all sequences.
+
         """
         # set up the defaults parameters stored in the kw dictionary
         kw = dict(
+            sparse=False,
+            partners=0,
             model=rcParams['model'],
             mode=rcParams['align_mode'],
             modes=rcParams['align_modes'],
@@ -947,11 +1114,17 @@ class Multiple:
         # profile-alignments. they eventually disturb pairwise alignments,
         # which is why it is important to keep their influence low when
         # creating the library from pairwise alignments
-        self._create_library()
+        if kw['sparse']:
+            self._create_sparse_library()
+        else:
+            self._create_library()
         for run in kw['modes']:
             self._get_pairwise_alignments(
                 run[0], run[1], run[2], kw['factor'], kw['restricted_chars'])
-            self._extend_library()
+            if kw['sparse']:
+                self._extend_sparse_library(kw['partners'])
+            else:
+                self._extend_library()
 
         self._set_scorer('library')
         self._get_pairwise_alignments(
@@ -1463,6 +1636,190 @@ class Multiple:
             gap_weight=gap_weight,
             restricted_chars=restricted_chars)
 
+    def _cached_sum_of_pairs(self, alm_matrix, cache, gap_weight=1.0, gop=-1):
+        """
+        Compute the sum-of-pairs score, re-using the scores of columns which
+        have been scored before.
+        """
+        args, kw = [], {}
+        if self._sonars:
+            algorithm = calign
+            kw = dict(gap_weight=gap_weight)
+        else:
+            algorithm = talign
+            args = [gop, gap_weight]
+
+        score = 0.0
+        for col in zip(*alm_matrix):
+            if col not in cache:
+                cache[col] = algorithm.score_profile(
+                    list(col), list(col), self.scorer, *args, **kw)
+            score += cache[col]
+        return score / len(alm_matrix[0])
+
+    def _refinement_candidates(self, threshold=0.5):
+        """
+        Collect the splits proposed by the iterative heuristics and rank them
+        by the average distance between the split and the rest of the MSA.
+        """
+        splits = [[i] for i in range(self.height)]
+        self._similar_gap_sites()
+        splits += list(self.gap_dict.values())
+        if self.height > 2:
+            clusters = {i: [i] for i in range(self.height)}
+            cluster._flat_upgma(clusters, self.matrix, threshold)
+            splits += list(clusters.values())
+
+        seen, candidates = set(), []
+        for idx in splits:
+            idxA = frozenset(idx)
+            idxB = frozenset(range(self.height)) - idxA
+            if not idxA or not idxB or idxA in seen or idxB in seen:
+                continue
+            seen.add(idxA)
+            gain = sum(self.matrix[i][j] for i in idxA for j in idxB) / (
+                len(idxA) * len(idxB))
+            candidates.append((-gain, sorted(idxA)))
+        heapq.heapify(candidates)
+        return candidates
+
+    def iterate_budget(
+        self,
+        time_budget=None,
+        max_evaluations=None,
+        patience=5,
+        tolerance=1e-6,
+        threshold=0.5,
+        mode='global',
+        gop=-3,
+        scale=0.5,
+        factor=0,
+        gap_weight=1.0,
+        restricted_chars='T_'):
+        """
+        Iterative refinement bounded by a time or an evaluation budget.
+
+        Parameters
+        ----------
+
+        time_budget : { None, float } (default=None)
+            The maximal wall-clock time in seconds which the refinement may
+            take. The budget is checked before each realignment, so a single
+            realignment may exceed it.
+
+        max_evaluations : { None, int } (default=None)
+            The maximal number of realignments which will be carried out.
+
+        patience : int (default=5)
+            The number of consecutive realignments without improvement of the
+            sum-of-pairs score after which the refinement stops.
+
+        tolerance : float (default=1e-6)
+            The minimal increase of the sum-of-pairs score which counts as an
+            improvement.
+
+        threshold : float (default=0.5)
+            The threshold for the flat cluster analysis which proposes splits
+            (see :py:meth:`Multiple.iterate_clusters`).
+
+        mode : { "global", "overlap", "dialign" } (default="global")
+            A string indicating which kind of alignment analysis should be
+            carried out when realigning the profiles.
+
+        gop : int (default=-3)
+            The gap opening penalty (GOP) used in the analysis.
+
+        scale : float (default=0.5)
+            The factor by which the penalty for the extension of gaps (gap
+            extension penalty, GEP) shall be decreased.
+
+        factor : float (default=0)
+            The factor by which the initial and the descending position shall
+            be modified.
+
+        gap_weight : float (default=1.0)
+            The factor by which gaps in aligned columns contribute to the
+            calculation of the column score.
+
+        Returns
+        -------
+
+        trajectory : list
+            A list of tuples of the number of realignments, the elapsed time
+            in seconds, and the sum-of-pairs score of the MSA at that point,
+            starting with the score of the initial alignment.
+
+        Notes
+        -----
+        The splits proposed by :py:meth:`Multiple.iterate_orphans`,
+        :py:meth:`Multiple.iterate_clusters`,
+        :py:meth:`Multiple.iterate_similar_gap_sites`, and
+        :py:meth:`Multiple.iterate_all_sequences` are pooled and tried in
+        order of decreasing average distance between the split and the rest
+        of the MSA. A realignment is kept only if it increases the
+        sum-of-pairs score. Whenever an improvement occurs, the splits are
+        recomputed for the new MSA. Column scores are cached, so that only
+        columns which changed have to be scored anew. Without a budget, the
+        refinement stops when the sum-of-pairs score stalls.
+
+        See also
+        --------
+        Multiple.iterate_orphans
+        Multiple.iterate_clusters
+        Multiple.iterate_similar_gap_sites
+        Multiple.iterate_all_sequences
+
+        """
+        start = time.perf_counter()
+        cache = {}
+        sop = self._cached_sum_of_pairs(self._alm_matrix, cache, gap_weight=gap_weight)
+        trajectory = [(0, 0.0, sop)]
+        if self.height < 2:
+            return trajectory
+
+        if self._sonars:
+            algorithm = self._align_profile
+            kw = dict(factor=factor, restricted_chars=restricted_chars)
+        else:
+            algorithm = self._talign_profile
+            kw = {}
+
+        evaluations, stalled = 0, 0
+        candidates = self._refinement_candidates(threshold)
+        while candidates and stalled < patience:
+            if max_evaluations is not None and evaluations >= max_evaluations:
+                break
+            if time_budget is not None and time.perf_counter() - start >= time_budget:
+                break
+
+            _, idx = heapq.heappop(candidates)
+            almA, almB, idxA, idxB = self._split(idx)
+            almA, almB = algorithm(
+                almA,
+                almB,
+                mode=mode,
+                gop=gop,
+                scale=scale,
+                gap_weight=gap_weight,
+                iterate=True,
+                **kw)
+            new_alm = self._join(almA, almB, idxA, idxB)
+            new_sop = self._cached_sum_of_pairs(new_alm, cache, gap_weight=gap_weight)
+            evaluations += 1
+
+            if new_sop > sop + tolerance:
+                self._alm_matrix = new_alm
+                sop, stalled = new_sop, 0
+                candidates = self._refinement_candidates(threshold)
+            else:
+                stalled += 1
+            trajectory.append((evaluations, time.perf_counter() - start, sop))
+            self.log.debug("Refinement {0}: sum-of-pairs {1:.4f}.".format(
+                evaluations, sop))
+
+        self._update_alignments()
+        return trajectory
+
     def get_peaks(self, gap_weight=0):
         """
         Calculate the profile score for each column of the alignment.
@@ -1,7 +1,8 @@
 """
 Module provides classes and functions for pairwise alignment analyses.
 """
-from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product, islice
 
 from lingpy.util import setdefaults, multicombinations2, as_string
 from lingpy.settings import rcParams
@@ -147,22 +148,23 @@ class Pairwise(object):
         else:
             self.model = keywords['model']
 
-        self.classes = []
-        for clA, clB in map(
-            lambda x: (
-                tokens2class(x[0], self.model, stress=keywords['stress']),
-                tokens2class(x[1], self.model, stress=keywords['stress'])),
-            self.tokens
-        ):
-            self.classes += [(clA, clB)]
-
-        self.weights = []
-        for prA, prB in self.prostrings:
-            self.weights += [(
-                prosodic_weights(prA, _transform=keywords['transform']),
-                prosodic_weights(prB, _transform=keywords['transform'])
-            )]
+        # sound classes and weights are computed once per distinct sequence
+        classes, weights = {}, {}
 
+        def get_classes(tokens):
+            key = tuple(tokens)
+            if key not in classes:
+                classes[key] = tokens2class(tokens, self.model, stress=keywords['stress'])
+            return classes[key]
+
+        def get_weights(prostring):
+            if prostring not in weights:
+                weights[prostring] = prosodic_weights(
+                    prostring, _transform=keywords['transform'])
+            return weights[prostring]
+
+        self.classes = [(get_classes(tkA), get_classes(tkB)) for tkA, tkB in self.tokens]
+        self.weights = [(get_weights(prA), get_weights(prB)) for prA, prB in self.prostrings]
         self.scoredict = self.model.scorer
 
     def align(self, **keywords):
@@ -195,6 +197,9 @@ class Pairwise(object):
             will be used.
         pprint : bool (default=False)
             If set to *True*, the alignments are printed to the screen.
+        processes : int (default=1)
+            The number of worker processes among which the sequence pairs are
+            distributed. Identical sequence pairs are aligned only once.
 
         """
         setdefaults(
@@ -207,6 +212,7 @@ class Pairwise(object):
             distance=False,
             model=rcParams['sca'],
             pprint=False,
+            processes=1,
             transform=rcParams['align_transform'])
 
         if hasattr(self, 'model'):
@@ -216,17 +222,11 @@ class Pairwise(object):
             self._set_model(**keywords)
 
         # create the alignments array
-        self._alignments = calign.align_pairs(
-            self.classes,
-            self.weights,
-            self.prostrings,
-            keywords['gop'],
-            keywords['scale'],
-            keywords['factor'],
-            self.scoredict,
-            keywords['mode'],
-            keywords['restricted_chars'],
-            distance=1 if keywords['distance'] else 0)
+        self._alignments = _align_unique(
+            self.classes, self.weights, self.prostrings, self.scoredict,
+            **{k: keywords[k] for k in [
+                'gop', 'scale', 'mode', 'factor', 'restricted_chars', 'distance',
+                'processes']})
 
         # switch back to alignments
         self.alignments = []
@@ -240,6 +240,148 @@ class Pairwise(object):
         as_string(self, pprint=keywords['pprint'])
 
 
+def _align_chunk(args):
+    pairs, scorer, kw = args
+    classes, weights, prostrings = zip(*pairs) if pairs else ([], [], [])
+    return calign.align_pairs(
+        list(classes),
+        list(weights),
+        list(prostrings),
+        kw['gop'],
+        kw['scale'],
+        kw['factor'],
+        scorer,
+        kw['mode'],
+        kw['restricted_chars'],
+        distance=1 if kw['distance'] else 0)
+
+
+def _align_unique(classes, weights, prostrings, scorer, executor=None, **keywords):
+    """
+    Align sound-class sequence pairs, aligning identical pairs only once.
+    """
+    index, pairs, order = {}, [], []
+    for clsAB, wghAB, proAB in zip(classes, weights, prostrings):
+        key = (tuple(clsAB[0]), tuple(clsAB[1]), proAB[0], proAB[1])
+        if key not in index:
+            index[key] = len(pairs)
+            pairs.append((clsAB, wghAB, proAB))
+        order.append(index[key])
+
+    processes = keywords.get('processes', 1)
+    if processes > 1 and len(pairs) > 1:
+        size = len(pairs) // processes + 1
+        chunks = [(pairs[i:i + size], scorer, keywords)
+                  for i in range(0, len(pairs), size)]
+        if executor:
+            results = executor.map(_align_chunk, chunks)
+        else:
+            with ProcessPoolExecutor(processes) as pool:
+                results = list(pool.map(_align_chunk, chunks))
+        alignments = [alm for chunk in results for alm in chunk]
+    else:
+        alignments = _align_chunk((pairs, scorer, keywords))
+
+    return [alignments[i] for i in order]
+
+
+def batch_align(pairs, processes=1, chunksize=10000, **keywords):
+    """
+    Align a large number of sequence pairs with sound-class based methods.
+
+    Parameters
+    ----------
+    pairs : iterable
+        An iterable of sequence pairs, with sequences given as strings or as
+        lists of tokens. The iterable is consumed lazily.
+    processes : int (default=1)
+        The number of worker processes among which the alignments are
+        distributed.
+    chunksize : int (default=10000)
+        The number of sequence pairs which are read and aligned at once.
+
+    Returns
+    -------
+    alignments : iterator
+        An iterator over tuples of the two aligned sequences and their score,
+        in the order of the input pairs.
+
+    Notes
+    -----
+    The keywords are the ones of :py:meth:`Pairwise.align` and of the
+    tokenization in :py:class:`Pairwise`. In contrast to
+    :py:class:`Pairwise`, tokens, prosodic strings, sound classes, and weights
+    are only computed once per distinct sequence, identical pairs within a
+    chunk are aligned only once, and only one chunk of the alignments is
+    kept in memory.
+    """
+    setdefaults(
+        keywords,
+        gop=-1,
+        scale=0.5,
+        mode='global',
+        factor=0.3,
+        restricted_chars='T_',
+        distance=False,
+        model=rcParams['sca'],
+        transform=rcParams['align_transform'],
+        diacritics=rcParams['diacritics'],
+        vowels=rcParams['vowels'],
+        tones=rcParams['tones'],
+        combiners=rcParams['combiners'],
+        breaks=rcParams['breaks'],
+        stress=rcParams['stress'],
+        merge_vowels=rcParams['merge_vowels'])
+    model = rcParams[keywords['model']] if isinstance(
+        keywords['model'], str) else keywords['model']
+    kw = {k: keywords[k] for k in [
+        'gop', 'scale', 'mode', 'factor', 'restricted_chars', 'distance']}
+    kw['processes'] = processes
+    tokenize_kw = {k: v for k, v in keywords.items() if k not in kw and k not in [
+        'model', 'transform']}
+
+    sequences = {}
+
+    def prepare(seq):
+        key = seq if isinstance(seq, str) else tuple(seq)
+        if key not in sequences:
+            if isinstance(seq, str):
+                tokens = ipa2tokens(seq, **tokenize_kw) if " " not in seq else seq.split()
+            else:
+                tokens = [s for s in seq]
+            prostring = prosodic_string(tokens, **tokenize_kw)
+            sequences[key] = (
+                tokens,
+                tokens2class(tokens, model, stress=keywords['stress']),
+                prostring,
+                prosodic_weights(prostring, _transform=keywords['transform']))
+        return sequences[key]
+
+    pairs = iter(pairs)
+    executor = ProcessPoolExecutor(processes) if processes > 1 else None
+    try:
+        while True:
+            chunk = [(prepare(seqA), prepare(seqB))
+                     for seqA, seqB in islice(pairs, chunksize)]
+            if not chunk:
+                break
+            alignments = _align_unique(
+                [(a[1], b[1]) for a, b in chunk],
+                [(a[3], b[3]) for a, b in chunk],
+                [(a[2], b[2]) for a, b in chunk],
+                model.scorer,
+                executor=executor,
+                **kw)
+            for (a, b), (almA, almB, sim) in zip(chunk, alignments):
+                yield (
+                    class2tokens(a[0], almA, local=kw['mode'] == "local"),
+                    class2tokens(b[0], almB, local=kw['mode'] == "local"),
+                    sim)
+    finally:
+        if executor:
+            executor.shutdown()
+
+
 def _get_scorer(seqA, seqB):
     return {(a, b): 1.0 if a == b else -1.0 for a, b in product(seqA, seqB)}
 
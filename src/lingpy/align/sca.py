@@ -8,7 +8,9 @@ perspective deals with aligned sequences.
 
 """
 import os
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
+
+import numpy as np
 
 from lingpy import __version__
 from lingpy import basictypes as bt
@@ -21,7 +23,7 @@ from lingpy.sequence.sound_classes import (
     ipa2tokens, token2class, tokens2class, class2tokens, prosodic_string,
     prosodic_weights, tokens2morphemes)
 from lingpy.align.multiple import Multiple
-from lingpy.align.pairwise import Pairwise
+from lingpy.align.pairwise import Pairwise, batch_align
 from lingpy.algorithm import misc
 from lingpy.align._align import confidence
 from lingpy import util
@@ -410,26 +412,18 @@ class PSA(Pairwise):
         """
         Load a ``psa``-file.
         """
-
-        almA = data[i + 1].split('\t')
-        almB = data[i + 2].split('\t')
-        taxonA = almA.pop(0)
-        taxonB = almB.pop(0)
-
-        kw = dict(condition=lambda k: k != '-')
-        self.taxa.append((taxonA, taxonB))
-        self.pairs.append((util.dotjoin(*almA, **kw), util.dotjoin(*almB, **kw)))
-        self.alignments.append(
-            ([str(a) for a in almA], [str(b) for b in almB], 0))
+        taxa, pair, alignment = _parse_psa_pair(data[i + 1], data[i + 2])
+        self.taxa.append(taxa)
+        self.pairs.append(pair)
+        self.alignments.append(alignment)
 
     def _handle_seq_data(self, data, i):
         """
         Load a ``psq``-file.
         """
-        taxonA, seqA = data[i + 1].split('\t')
-        taxonB, seqB = data[i + 2].split('\t')
-        self.taxa.append((taxonA.strip('.'), taxonB.strip('.')))
-        self.pairs.append((seqA, seqB))
+        taxa, pair = _parse_psq_pair(data[i + 1], data[i + 2])
+        self.taxa.append(taxa)
+        self.pairs.append(pair)
 
     def output(self, fileformat='psa', filename=None, **keywords):
         """
@@ -511,6 +505,146 @@ class PSA(Pairwise):
                     out.write('{0} {1:.2f}'.format(self.comment, c) + '\n\n')
 
 
+def _parse_psa_pair(lineA, lineB):
+    almA = lineA.split('\t')
+    almB = lineB.split('\t')
+    taxonA = almA.pop(0)
+    taxonB = almB.pop(0)
+
+    kw = dict(condition=lambda k: k != '-')
+    return (
+        (taxonA, taxonB),
+        (util.dotjoin(*almA, **kw), util.dotjoin(*almB, **kw)),
+        ([str(a) for a in almA], [str(b) for b in almB], 0))
+
+
+def _parse_psq_pair(lineA, lineB):
+    taxonA, seqA = lineA.split('\t')
+    taxonB, seqB = lineB.split('\t')
+    return (taxonA.strip('.'), taxonB.strip('.')), (seqA, seqB)
+
+
+def iter_psq(infile, comment=rcParams['comment']):
+    """
+    Iterate over the sequence pairs of a ``psq``- or ``psa``-file.
+
+    Parameters
+    ----------
+    infile : str
+        A file in ``psq``-format or ``psa``-format.
+    comment : char (default='#')
+        The comment character which, inserted in the beginning of a line,
+        prevents that line from being read.
+
+    Returns
+    -------
+    dataset, pairs : tuple
+        The name of the dataset and an iterator over tuples of the sequence
+        identifier, the taxa, and the sequences of each pair.
+
+    Notes
+    -----
+    In contrast to :py:class:`PSA`, the file is read line by line while the
+    iterator is consumed.
+    """
+    if not os.path.splitext(infile)[1] and os.path.exists(infile + '.psq'):
+        infile = infile + '.psq'
+    parse = _parse_psq_pair
+    if infile.endswith('.psa'):
+        parse = lambda a, b: _parse_psa_pair(a, b)[:2]
+
+    def lines():
+        with open(infile, encoding='utf-8-sig') as handle:
+            for line in handle:
+                line = line.strip('\r\n')
+                if not line.startswith(comment):
+                    yield line
+
+    def pairs(data):
+        buffer, lineno, exhausted = [], 0, False
+        while True:
+            while not exhausted and len(buffer) < 4:
+                line = next(data, None)
+                if line is None:
+                    exhausted = True
+                else:
+                    buffer.append(line)
+            if len(buffer) < 3:
+                return
+            try:
+                taxa, pair = parse(buffer[1], buffer[2])
+            except (ValueError, IndexError):
+                log.warning("Line {0} of the data is probably miscoded.".format(
+                    lineno + 1))
+                del buffer[0]
+                lineno += 1
+                continue
+            yield buffer[0], taxa, pair
+            del buffer[:4]
+            lineno += 4
+
+    data = lines()
+    dataset = next(data, '')
+    return dataset, pairs(data)
+
+
+def align_psq(infile, filename=None, processes=1, chunksize=10000, **keywords):
+    """
+    Align all sequence pairs of a ``psq``-file and stream them to a ``psa``-file.
+
+    Parameters
+    ----------
+    infile : str
+        A file in ``psq``-format or ``psa``-format.
+    filename : str
+        The name of the output file, without extension. Defaults to the name
+        of the input file.
+    processes : int (default=1)
+        The number of worker processes among which the alignments are
+        distributed.
+    chunksize : int (default=10000)
+        The number of sequence pairs which are read and aligned at once.
+
+    Returns
+    -------
+    outfile : str
+        The name of the file to which the alignments were written.
+
+    Notes
+    -----
+    The keywords are passed to :py:func:`~lingpy.align.pairwise.batch_align`.
+    The output is identical with aligning the file with :py:class:`PSA` and
+    writing it with :py:meth:`PSA.output`, but only a chunk of the sequence
+    pairs is held in memory.
+    """
+    comment = keywords.pop('comment', rcParams['comment'])
+    dataset, records = iter_psq(infile, comment=comment)
+    filename = filename or os.path.splitext(os.path.basename(infile))[0]
+    outfile = filename + '.psa'
+    if os.path.isfile(outfile):
+        outfile = filename + '_out.psa'
+
+    # keep the records of the current chunk for writing the alignments
+    chunk = deque()
+
+    def pairs():
+        for record in records:
+            chunk.append(record)
+            yield record[2]
+
+    with util.TextFile(outfile) as out:
+        out.write(dataset + '\n')
+        for almA, almB, sim in batch_align(
+                pairs(), processes=processes, chunksize=chunksize, **keywords):
+            seq_id, taxa, _ = chunk.popleft()
+            txf = '{0:.<' + str(max([len(t) for t in taxa])) + '}'
+            out.write(seq_id + '\n')
+            out.write(txf.format(taxa[0]) + '\t' + '\t'.join(almA) + '\n')
+            out.write(txf.format(taxa[1]) + '\t' + '\t'.join(almB) + '\n')
+            out.write('{0} {1:.2f}'.format(comment, sim) + '\n\n')
+    return outfile
+
+
 class Alignments(Wordlist):
     """
     Class handles Wordlists for the purpose of alignment analyses.
@@ -812,6 +946,16 @@ class Alignments(Wordlist):
             Select the method to use for the analysis.
         iteration : bool (default=False)
             Set to c{True} in order to use iterative refinement methods.
+        iteration_time : { None, float } (default=None)
+            If set, iterative refinement is carried out with
+            :py:meth:`~lingpy.align.multiple.Multiple.iterate_budget`, limited
+            to the given number of seconds per cognate set, regardless of
+            *iteration*. A budget of 0 carries out no refinement.
+        iteration_evaluations : { None, int } (default=None)
+            If set, iterative refinement is carried out with
+            :py:meth:`~lingpy.align.multiple.Multiple.iterate_budget`, limited
+            to the given number of realignments per cognate set, regardless
+            of *iteration*. A budget of 0 carries out no refinement.
         swap_check : bool (default=False)
             Set to c{True} in order to carry out a swap-check.
         model : { 'dolgo', 'sca', 'asjp' }
@@ -875,6 +1019,14 @@ class Alignments(Wordlist):
             should therefore be aligned specifically. This defaults to "T",
             since this is the character that represents tones in the prosodic
             strings of sequences.
+
+        sparse : bool (default=False)
+            If the "library" method is chosen, store the library in a sparse
+            matrix (see :py:meth:`~lingpy.align.multiple.Multiple.lib_align`).
+
+        partners : int (default=0)
+            If the library is sparse, restrict its extension via a third
+            sequence to the given number of closest sequences.
         """
         kw = dict(
             alignment=False,
@@ -885,11 +1037,14 @@ class Alignments(Wordlist):
             gap_weight=rcParams['gap_weight'],
             gop=rcParams['align_gop'],
             iteration=False,
+            iteration_evaluations=None,
+            iteration_time=None,
             method='progressive',
             mode=rcParams['align_mode'],
             model=rcParams['sca'],
             modes=rcParams['align_modes'],
             output=False,
+            partners=0,
             plots=False,
             ref=False,
             restricted_chars=rcParams['restricted_chars'],
@@ -897,6 +1052,7 @@ class Alignments(Wordlist):
             scoredict=rcParams['scorer'],
             show=False,
             sonar=rcParams['sonar'],
+            sparse=False,
             style='plain',
             swap_check=False,
             tree_calc=rcParams['align_tree_calc'],
@@ -971,7 +1127,12 @@ class Alignments(Wordlist):
                 elif kw['method'] == 'library':
                     m.lib_align(**kw)
 
-                if kw['iteration']:
+                if kw['iteration_time'] is not None or \
+                        kw['iteration_evaluations'] is not None:
+                    m.iterate_budget(
+                        time_budget=kw['iteration_time'],
+                        max_evaluations=kw['iteration_evaluations'])
+                elif kw['iteration']:
                     m.iterate_similar_gap_sites()
                     m.iterate_clusters(0.5)
                     m.iterate_orphans()
@@ -1000,7 +1161,7 @@ class Alignments(Wordlist):
 
         self._msa2col(ref=kw['ref'], alignment=kw['alignment'])
 
-    def get_confidence(self, scorer, ref="lexstatid", gap_weight=0.25):
+    def get_confidence(self, scorer, ref="lexstatid", gap_weight=0.25, processes=1):
         """
         Function creates confidence scores for a given set of alignments.
 
@@ -1014,9 +1175,13 @@ class Alignments(Wordlist):
             the analysis.
         gap_weight : {loat} (default=1.0)
             Determine the weight assigned to matches containing gaps.
+        processes : int (default=1)
+            The number of worker processes among which the cognate sets are
+            distributed.
 
         """
-        corrs = confidence.get_confidence(self, scorer, ref, gap_weight)
+        corrs = confidence.get_confidence(
+            self, scorer, ref, gap_weight, processes=processes)
         log.info("Successfully calculated confidence values for alignments.")
         return corrs
 
@@ -1097,11 +1262,23 @@ class Alignments(Wordlist):
 
         # go on with the analysis
         cons_dict = {}
+
+        # majority-rule consensus strings are computed for all MSAs in one batch
+        batch = {}
+        if not classes and not keywords.get('local'):
+            cogs = [cog for cog in self.etd[ref] if cog in self.msa[ref]]
+            batch = dict(zip(cogs, get_consensus_batch(
+                [self.msa[ref][cog]['alignment'] for cog in cogs],
+                gaps=gaps, gap_scale=keywords['gap_scale'])))
+
         with util.pb(desc='CONSENSUS', total=len(self.etd[ref])) as progress:
             for cog in self.etd[ref]:
                 progress.update(1)
 
-                if cog in self.msa[ref]:
+                if cog in batch:
+                    cons = batch[cog]
+                    self.msa[ref][cog]["consensus"] = cons
+                elif cog in self.msa[ref]:
                     log.debug("Analyzing cognate set number '{0}'...".format(cog))
 
                     # temporary solution for sound-class integration
@@ -1523,3 +1700,69 @@ def get_consensus(msa, gaps=False, taxa=False, classes=False, **keywords):
             cons.append(cchar)
 
     return cons if gaps else [c for c in cons if c != rcParams['gap_symbol']]
+
+
+def get_consensus_batch(msas, gaps=False, gap_scale=1.0):
+    """
+    Calculate majority-rule consensus strings for many MSAs at once.
+
+    Parameters
+    ----------
+    msas : list
+        A list of MSA matrices (lists of aligned token lists).
+    gaps : c{bool} (default=False)
+        If set to c{True}, return the gap positions in the consensus.
+    gap_scale : float (default=1.0)
+        The factor by which gap counts are multiplied.
+
+    Returns
+    -------
+    consensus : list
+        A list of consensus strings in the order of the input MSAs.
+
+    Notes
+    -----
+    The result is identical to calling :py:func:`get_consensus` without
+    classes and local pre-processing for each MSA. All MSAs are encoded once
+    as token-id matrices, and the column frequencies of all MSAs are counted
+    in one pass, ties being resolved in favor of the token which occurs
+    first in a column.
+    """
+    vocabulary, columns, codes, lengths = {}, [], [], []
+    offset = 0
+    for msa in msas:
+        matrix = getattr(msa, 'alm_matrix', msa)
+        width = len(matrix[0])
+        lengths.append(width)
+        for j in range(width):
+            for line in matrix:
+                codes.append(vocabulary.setdefault(line[j], len(vocabulary)))
+                columns.append(offset + j)
+        offset += width
+
+    if not offset:
+        return [[] for _ in msas]
+    tokens = list(vocabulary)
+    codes = np.array(codes, dtype=np.int64)
+    columns = np.array(columns, dtype=np.int64)
+
+    # count each token per column and remember where it occurs first
+    cells, first, counts = np.unique(
+        columns * len(tokens) + codes, return_index=True, return_counts=True)
+    cell_columns, cell_codes = np.divmod(cells, len(tokens))
+    weights = counts.astype(float)
+    gap = vocabulary.get(rcParams['gap_symbol'])
+    if gap is not None:
+        weights[cell_codes == gap] *= gap_scale
+
+    # pick the heaviest token per column, preferring earlier occurrences
+    order = np.lexsort((first, -weights, cell_columns))
+    winners = order[np.r_[True, cell_columns[order][1:] != cell_columns[order][:-1]]]
+    best = [tokens[code] for code in cell_codes[winners]]
+
+    out, start = [], 0
+    for width in lengths:
+        cons = best[start:start + width]
+        start += width
+        out.append(cons if gaps else [c for c in cons if c != rcParams['gap_symbol']])
+    return out
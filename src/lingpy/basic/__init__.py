@@ -8,3 +8,4 @@ linguistic datatypes (spreadsheets, wordlists) in a consistent way.
 # flake8: noqa
 from lingpy.basic.wordlist import Wordlist, get_wordlist
 from lingpy.basic.tree import Tree
+from lingpy.basic.ops import Query
@@ -1,11 +1,17 @@
 """
 Module provides basic operations on Wordlist-Objects.
 """
+import re
+import ast
 import json
+import operator
+import unicodedata
 from string import ascii_letters, digits
 from collections import defaultdict
 from itertools import product
 
+import numpy as np
+
 from lingpy.settings import rcParams
 from lingpy.convert.strings import matrix2dst, scorer2str, msa2str
 from lingpy.algorithm import clustering, misc
@@ -47,6 +53,90 @@ def get_score(
         return 1.0
 
 
+def _state_counts(wl, ref, taxa, concepts=None):
+    """
+    Count how often each value of a reference column occurs in each taxon.
+
+    Notes
+    -----
+    Values are compared as a whole, so fuzzy cognate ids are treated as one
+    state. If concepts are passed, the states are the pairs of concept and
+    value, restricted to the given concepts.
+    """
+    positions = {taxon: i for i, taxon in enumerate(taxa)}
+    concepts = set(concepts) if concepts is not None else None
+    idx = wl._header[ref]
+
+    states, coords = {}, []
+    for key in wl:
+        line = wl[key]
+        if line[wl._colIdx] not in positions:
+            continue
+        value = line[idx]
+        if isinstance(value, list):
+            value = tuple(value)
+        if concepts is not None:
+            if line[wl._rowIdx] not in concepts:
+                continue
+            value = (line[wl._rowIdx], value)
+        coords.append(
+            (states.setdefault(value, len(states)),
+             positions[line[wl._colIdx]]))
+
+    counts = np.zeros((len(states), len(taxa)), dtype=int)
+    if coords:
+        np.add.at(counts, tuple(np.array(coords).T), 1)
+    return list(states), counts
+
+
+def _get_scores(wl, ref, mode, taxa, concepts, ignore_missing=False):
+    """
+    Compute the scores of :py:func:`get_score` for all pairs of taxa.
+    """
+    if mode in ['shared', 'jaccard']:
+        states, counts = _state_counts(wl, ref, taxa)
+        zeros = [i for i, state in enumerate(states) if state == 0]
+
+        # the lists of the taxa contain a zero if the taxon lacks a concept
+        # or if the reference itself is zero
+        gaps = np.array([
+            (wl._array[:, wl.cols.index(taxon)] == 0).any() for taxon in
+            taxa], dtype=bool) | (counts[zeros].sum(0) > 0)
+        counts = np.delete(counts, zeros, axis=0)
+        presence = (counts > 0).astype(int)
+
+        if mode == 'shared':
+            return counts.T @ presence
+        shared = presence.T @ presence
+        sizes = presence.sum(0)
+        return 1 - shared / (
+            sizes[:, None] + sizes[None, :] - shared +
+            (gaps[:, None] | gaps[None, :]))
+
+    assert mode == 'swadesh'
+    states, counts = _state_counts(wl, ref, taxa, concepts=concepts)
+    presence = (counts > 0).astype(int)
+    rows = {concept: i for i, concept in enumerate(concepts)}
+    groups = np.array([rows[concept] for concept, _ in states], dtype=int)
+
+    # a concept is shared if one of its states is found in both taxa
+    shared = np.zeros((len(taxa), len(taxa)), dtype=int)
+    coverage = np.zeros((len(concepts), len(taxa)), dtype=int)
+    if len(states):
+        np.maximum.at(coverage, groups, presence)
+        order = np.argsort(groups, kind='stable')
+        for block in np.split(
+                presence[order], np.nonzero(np.diff(groups[order]))[0] + 1):
+            shared += (block.T @ block) > 0
+
+    if ignore_missing:
+        missing = 0
+    else:
+        missing = len(concepts) - coverage.T @ coverage
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 1 - shared / (wl.height - missing)
+
+
 def wl2dst(
         wl,  # wordlist object
         taxa="taxa",
@@ -62,25 +152,35 @@ def wl2dst(
     # check for attributes
     assert hasattr(wl, taxa) and hasattr(wl, concepts)
 
+    taxa, concepts = getattr(wl, taxa), getattr(wl, concepts)
+    scores = _get_scores(
+        wl, ref, mode, taxa, concepts, ignore_missing=ignore_missing).tolist()
+    if refB:
+        scoresB = _get_scores(
+            wl, refB, mode, taxa, concepts,
+            ignore_missing=ignore_missing).tolist()
+
+    def score(matrix, i, j):
+        if not np.isfinite(matrix[i][j]):
+            log.warning(
+                "Zero-division error encountered in '{0}' and '{1}'.".format(
+                    taxa[i], taxa[j]))
+            return 1.0
+        return matrix[i][j]
+
     distances = [[0 for i in range(wl.width)] for j in range(wl.width)]
 
-    for (i, taxA), (j, taxB) in product(
-            enumerate(getattr(wl, taxa)), repeat=2):
+    for i, j in product(range(len(taxa)), repeat=2):
         if i < j:
-            score = get_score(
-                    wl, ref, mode, taxA, taxB, concepts_attr=concepts,
-                    ignore_missing=ignore_missing)
-            distances[i][j] = score
+            distances[i][j] = score(scores, i, j)
             if not refB:
-                distances[j][i] = score
+                distances[j][i] = distances[i][j]
         elif i == j:
             if mode == 'shared':
                 distances[i][j] = len(
-                        wl.get_list(col=taxA, flat=True))
+                        wl.get_list(col=taxa[i], flat=True))
         elif i > j and refB:
-            distances[i][j] = get_score(
-                wl, refB, mode, taxA, taxB, concepts_attr=concepts,
-                ignore_missing=ignore_missing)
+            distances[i][j] = score(scoresB, i, j)
 
     return distances
 
@@ -119,6 +219,168 @@ def iter_rows(wordlist, *values):
         yield [k] + [wordlist[k][wordlist.header[v]] for v in values]
 
 
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda x, y: x in y,
+    'not in': lambda x, y: x not in y,
+    'contains': operator.contains,
+    'startswith': lambda x, y: str(x).startswith(y),
+    'endswith': lambda x, y: str(x).endswith(y),
+}
+
+_STATEMENT = re.compile(r'^\s*(not\s+in|in|==|!=|<=|>=|<|>)\s*(.*?)\s*$', re.S)
+
+
+class _Members(object):
+    """
+    A collection with fast membership tests for hashable values.
+    """
+    def __init__(self, values):
+        self.values = values
+        self.hashable = set()
+        for value in values:
+            try:
+                self.hashable.add(value)
+            except TypeError:
+                pass
+
+    def __contains__(self, value):
+        try:
+            return value in self.hashable
+        except TypeError:
+            return value in self.values
+
+
+class Query(object):
+    """
+    A filter on the rows of a wordlist.
+
+    Parameters
+    ----------
+    column : str
+        The column whose values are compared, use "ID" to compare the keys of
+        the rows.
+    op : str (default="==")
+        The name of the operator, one of "==", "!=", "<", "<=", ">", ">=",
+        "in", "not in", "contains", "startswith", and "endswith".
+    value : object (default=None)
+        The value to which the cells are compared.
+
+    Notes
+    -----
+    Queries can be combined with the operators ``&`` (and), ``|`` (or), and
+    ``~`` (not). They are compiled once into a function which is then called
+    for each row, without evaluating any strings.
+
+    Examples
+    --------
+    Select the words for "hand" in all languages but German::
+
+        >>> from lingpy.basic.ops import Query
+        >>> query = Query('concept', '==', 'hand') & ~Query(
+        ...     'doculect', 'in', ['German'])
+        >>> sub = wl.filter(query)
+    """
+    def __init__(self, column=None, op='==', value=None, queries=None):
+        if queries is None and op not in OPERATORS and op != 'expression':
+            raise ValueError("Unknown operator {0}.".format(op))
+        self.column = column
+        self.op = op
+        self.value = value
+        self.queries = queries
+
+    def __and__(self, other):
+        return Query(op='and', queries=[self, other])
+
+    def __or__(self, other):
+        return Query(op='or', queries=[self, other])
+
+    def __invert__(self):
+        return Query(op='not', queries=[self])
+
+    def __repr__(self):
+        if self.queries is None:
+            return '<Query {0} {1} {2!r}>'.format(
+                self.column, self.op, self.value)
+        return '<Query {0} {1}>'.format(self.op, self.queries)
+
+    @classmethod
+    def from_statement(cls, column, statement):
+        """
+        Create a query from a column and a statement, such as "== 'hand'".
+
+        Notes
+        -----
+        This serves the backwards-compatible handling of the *rows* argument
+        of :py:meth:`~lingpy.basic.wordlist.Wordlist.output`. Statements which
+        consist of a comparison with a literal are converted directly. Any
+        other statement is compiled once as a Python expression.
+        """
+        match = _STATEMENT.match(statement)
+        if match:
+            try:
+                return cls(
+                    column, ' '.join(match.group(1).split()),
+                    ast.literal_eval(match.group(2)))
+            except (ValueError, SyntaxError):
+                pass
+        return cls(
+            column, 'expression', compile('x ' + statement, '<query>', 'eval'))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Combine a dictionary of columns and statements into one query.
+        """
+        query = None
+        for column, statement in rows.items():
+            new = statement if isinstance(statement, Query) else \
+                cls.from_statement(column, statement)
+            query = new if query is None else query & new
+        return query
+
+    def compile(self, wordlist):
+        """
+        Compile the query into a function which is called with the key and
+        the cells of a row.
+        """
+        if self.op in ('and', 'or'):
+            functions = [q.compile(wordlist) for q in self.queries]
+            combine = all if self.op == 'and' else any
+            return lambda key, line: combine(f(key, line) for f in functions)
+        if self.op == 'not':
+            function = self.queries[0].compile(wordlist)
+            return lambda key, line: not function(key, line)
+
+        if self.column == 'ID':
+            get = lambda key, line: key
+        else:
+            idx = wordlist._header[wordlist._alias.get(
+                self.column, self.column)]
+            get = lambda key, line: line[idx]
+        if self.op == 'expression':
+            code = self.value
+            return lambda key, line: eval(
+                code, {}, {'x': get(key, line), 'key': key, 'line': line})
+        function, value = OPERATORS[self.op], self.value
+        if self.op in ('in', 'not in') and isinstance(value, (list, tuple)):
+            value = _Members(value)
+        return lambda key, line: function(get(key, line), value)
+
+    def __call__(self, wordlist):
+        """
+        Return the keys of all rows of a wordlist matching the query.
+        """
+        function = self.compile(wordlist)
+        return [key for key, line in wordlist._data.items()
+                if function(key, line)]
+
+
 def wl2dict(
         wordlist,
         sections,
@@ -131,7 +393,7 @@ def wl2dict(
 
     # define output dictionary
     out = {}
-    exclude = exclude or []
+    exclude = set(exclude or [])
 
     # determine the last section
     sorted_sections = sorted(sections)
@@ -306,19 +568,57 @@ def wl2qlc(
         **keywords):
     """
     Write the basic data of a wordlist to file.
+
+    Parameters
+    ----------
+    header : list
+        The names of the columns which are written to file.
+    data : dict
+        The rows of the wordlist, with the IDs as keys.
+    filename : str (default='')
+        The name of the output file, without the file extension.
+    formatter : str (default='concept')
+        The column (or two comma-separated columns) by which the rows are
+        sorted and grouped.
+    columns : list (default=None)
+        The indices of the values in the rows of *data* which are written to
+        file, defaults to all values.
+    compressed : bool (default=False)
+        If set to c{True}, the file is compressed with gzip, and the suffix
+        ".gz" is added to the file name.
+
+    Notes
+    -----
+    The file is written in chunks of lines, so that the output is never
+    assembled as a whole in memory.
     """
     util.setdefaults(
         keywords,
         ignore=['taxa', 'doculects', 'msa'],
         fileformat='qlc',
-        prettify=True)
+        prettify=True,
+        columns=None,
+        compressed=False)
     if keywords['ignore'] == 'all':
         keywords['ignore'] = [
             'taxa', 'scorer', 'meta', 'distances', 'doculects', 'msa', 'json']
 
-    formatter = formatter.upper()
     if not filename:
         filename = rcParams['filename']
+    filename = str(filename) + '.' + keywords['fileformat']
+    if keywords['compressed']:
+        filename += '.gz'
+
+    with util.TextFile(filename, compressed=keywords['compressed']) as f:
+        for chunk in _qlc_chunks(header, data, formatter, **keywords):
+            f.write(unicodedata.normalize("NFC", chunk))
+
+
+def _qlc_chunks(header, data, formatter, **keywords):
+    """
+    Yield the text of a qlc-file in chunks which end on line breaks.
+    """
+    formatter = formatter.upper()
 
     # create output string
     out = '# Wordlist\n' if keywords['prettify'] else ''
@@ -374,20 +674,22 @@ def wl2qlc(
         out += '\n# TAXA\n<taxa>\n' + taxa + '\n</taxa>\n'
     if jsonpairs and 'json' not in keywords['ignore']:
         out += "@json: " + json.dumps(jsonpairs) + '\n'
+    yield out
+
     if msapairs and 'msa' not in keywords['ignore']:
         for ref in msapairs:
-            out += "\n# MSA reference: {0}\n".format(ref)
+            yield "\n# MSA reference: {0}\n".format(ref)
             for k, v in msapairs[ref].items():
                 if 'consensus' in v:
-                    out += '#\n<msa '
+                    out = '#\n<msa '
                     out += 'id="{0}" ref="{1}" consensus="{2}">\n'.format(
                         k, ref, ' '.join(v['consensus']))
                 else:
-                    out += '#\n<msa id="{0}" ref="{1}">\n'.format(k, ref)
-                outs = msa2str(v, wordlist=True)
-                out += outs
-                out += "</msa>\n"
+                    out = '#\n<msa id="{0}" ref="{1}">\n'.format(k, ref)
+                out += msa2str(v, wordlist=True)
+                yield out + "</msa>\n"
 
+    out = ''
     if distances and 'distances' not in keywords['ignore']:
         out += '\n# DISTANCES\n<dst>\n'
         out += distances + '</dst>\n'
@@ -399,13 +701,20 @@ def wl2qlc(
         out += '\n# SCORER\n' + scorer
 
     out += '\n# DATA\n' if keywords['prettify'] else ''
-    out += 'ID\t' + '\t'.join(header) + '\n'
+    yield out + 'ID\t' + '\t'.join(header) + '\n'
+
+    # select the values of the rows only once they are written
+    columns = keywords['columns']
+    if columns is None:
+        get_line = data.__getitem__
+    else:
+        get_line = lambda x: [data[x][i] for i in columns]
 
     # check for gloss in header to create nice output format
     if formatter in header:
         idx = header.index(formatter)
         formatter = None
-        sorted_data = sorted(data.keys(), key=lambda x: data[x][idx])
+        sorted_data = sorted(data.keys(), key=lambda x: get_line(x)[idx])
     elif len(formatter.split(',')) == 2:
         idxA, idxB = formatter.split(',')
         idxA = header.index(idxA)
@@ -413,7 +722,7 @@ def wl2qlc(
         idx = idxA
         formatter = None
         sorted_data = sorted(data.keys(), key=lambda x: (
-            data[x][idxA], data[x][idxB]))
+            get_line(x)[idxA], get_line(x)[idxB]))
     else:
         idx = False
         formatter = ''
@@ -421,7 +730,8 @@ def wl2qlc(
 
     for key in sorted_data:
         # get the line
-        line = data[key]
+        line = get_line(key)
+        out = ''
 
         # check for formatter
         if idx in range(len(line)):
@@ -447,13 +757,9 @@ def wl2qlc(
                 out += '\t'
             else:
                 out += '\t{:}'.format(value)
-        out += '\n'
+        yield out + '\n'
 
-    util.write_text_file(
-        str(filename) + '.' + keywords['fileformat'],
-        out + keywords.get('stamp', ''),
-        normalize="NFC")
-    return
+    yield keywords.get('stamp', '')
 
 
 def tsv2triple(wordlist, outfile=None):
@@ -521,8 +827,8 @@ def coverage(wordlist):
     """
     Determine the average coverage of a wordlist.
     """
-    return {taxon: len(
-        wordlist.get_dict(col=taxon)) for taxon in wordlist.taxa}
+    cov = wordlist.get_coverage_matrix().sum(0).tolist()
+    return {taxon: cov[wordlist.cols.index(taxon)] for taxon in wordlist.taxa}
 
 
 def wl2multistate(wordlist, ref, missing):
@@ -530,42 +836,33 @@ def wl2multistate(wordlist, ref, missing):
     Function converts a wordlist to multistate format (compatible with PAUP).
     """
 
-    # convert the data to a multistate matrix
-    # get etymological dictionary
-    wordlist.get_etymdict(ref=ref)
+    states, counts = _state_counts(
+        wordlist, ref, wordlist.taxa, concepts=wordlist.concepts)
+    blocks = defaultdict(list)
+    for i, (concept, state) in enumerate(states):
+        blocks[concept].append((state, i))
 
     # define chars, we only have a limited set, unfortunately
     chars = ascii_letters + digits
 
-    # iterate over all cognate sets and assign the chars
+    # iterate over all concepts and assign the chars to the sorted states
     matrix = []
     for c in wordlist.concepts:
-        taxon_to_cognate_set = wordlist.get_dict(concept=c, entry=ref)
-
-        distinct_states = set()
-        for taxon in wordlist.taxa:
-            distinct_states.update(taxon_to_cognate_set.get(taxon, [0]))
-
-        # make converter
-        if len(distinct_states) > len(chars):  # pragma: no cover
-            # FIXME: This shouldn't just be a warning, because we
-            # will get a KeyError
-            # down below, since zip just returns a list of length len(chars)!
+        block = sorted(blocks[c])
+        if len(block) > len(chars):  # pragma: no cover
             log.warning('more distinct states than available characters!')
-        char_map = dict(zip(sorted(distinct_states), chars))
-        char_map['-'] = '-'
+        presence = counts[[i for _, i in block]].reshape(
+            len(block), len(wordlist.taxa)) > 0
 
         line = []
-        for taxon in wordlist.taxa:
-            states = set(taxon_to_cognate_set.get(taxon, ['-']))
-            # exclude the case len(taxon_to_cognate_set[taxon]) == 0
-            if len(states) == 1:
-                line.append(char_map[states.pop()])
-            elif not states:
+        for column in presence.T:
+            idxs = np.nonzero(column)[0]
+            if len(idxs) == 1:
+                line.append(chars[idxs[0]])
+            elif not len(idxs):
                 line.append(missing)
             else:
-                line.append('({0})'.format(
-                    "".join([char_map[x] for x in sorted(states)])))
+                line.append('({0})'.format(''.join(chars[i] for i in idxs)))
 
         matrix.append(line)
 
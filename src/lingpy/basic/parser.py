@@ -45,6 +45,9 @@ class QLCParser(object):
     Basic class for the handling of text files in QLC format.
 
     """
+    # keys of rows which are shared with another wordlist and need to be
+    # copied before they are modified, see Wordlist.view
+    _shared = frozenset()
 
     def __init__(self, filename, conf=''):
         """
@@ -127,7 +130,8 @@ class QLCParser(object):
         # str.numeric-function that returns numeric values only if it is an
         # integer
         self._data = {
-            int(k): v for k, v in input_data.items() if k != 0 and str(k).isnumeric()}
+            int(k): v for k, v in input_data.items()
+            if (k > 0 if isinstance(k, int) else k != 0 and str(k).isnumeric())}
         # check for same length of all columns
         check_errors = ''
         for k, v in self._data.items():
@@ -178,6 +182,9 @@ class QLCParser(object):
         for key in [k for k in input_data if type(k) != int]:
             self._meta[key] = input_data[key]
 
+        # secondary indexes which are built on demand
+        self._cache = {}
+
     def __getitem__(self, idx):
         """
         Method allows quick access to the data by passing the integer key.
@@ -250,8 +257,9 @@ class QLCParser(object):
         Modify a specific cell in a specific column of a wordlist.
         """
         if isinstance(idx, tuple) and len(idx) == 2:
+            self._clear_cache()
             try:
-                self._data[idx[0]][self.header[self._alias[idx[1]]]] = item
+                self._own_row(idx[0])[self.header[self._alias[idx[1]]]] = item
             except KeyError:
                 raise KeyError("No line with ID {0} specified could be found.".format(
                     idx[0]))
@@ -271,6 +279,23 @@ class QLCParser(object):
 
         return iter([key for key in self._data.keys()])
 
+    def _clear_cache(self):
+        """
+        Discard the secondary indexes after the data has been modified.
+        """
+        self._cache = {}
+
+    def _own_row(self, key, extend=()):
+        """
+        Return a row which can be modified, copying it if it is shared.
+        """
+        if key in self._shared:
+            self._shared.discard(key)
+            self._data[key] = self._data[key] + list(extend)
+        elif extend:
+            self._data[key].extend(extend)
+        return self._data[key]
+
     def add_entries(
             self,
             entry,
@@ -322,6 +347,7 @@ class QLCParser(object):
             raise ValueError('Entry was not properly specified.')
 
         lentry = entry.lower()
+        self._clear_cache()
 
         def _apply(key, s, *args, **kwargs):
             try:
@@ -329,9 +355,9 @@ class QLCParser(object):
             except:
                 raise ValueError('Could not convert item ID: {0}.'.format(key))
             if override:
-                self._data[key][self._header[lentry]] = res
+                self._own_row(key)[self._header[lentry]] = res
             else:
-                self._data[key].append(res)
+                self._own_row(key, [res])
 
         # check for override stuff, this causes otherwise an error message
         if entry not in self.header and override:
@@ -403,15 +429,16 @@ class QLCParserWithRowsAndCols(QLCParser):
         except KeyError:
             raise ValueError("Could not find row or col in configuration or input file!")
 
-        def unique_sorted(idx, key):
-            return sorted(
-                set([self._data[k][idx] or '' for k in self._data
-                     if k != 0 and isinstance(k, int)]),
-                key=key)
+        # collect rows and cols in one pass over the data
+        rows, cols = set(), set()
+        for k, v in self._data.items():
+            if k != 0 and isinstance(k, int):
+                rows.add(v[rowIdx] or '')
+                cols.add(v[colIdx] or '')
 
         # define rows and cols as attributes of the word list
-        self.rows = unique_sorted(rowIdx, lambda x: ('%s' % x).lower())
-        self.cols = unique_sorted(colIdx, lambda x: x.lower())
+        self.rows = sorted(rows, key=lambda x: ('%s' % x).lower())
+        self.cols = sorted(cols, key=lambda x: x.lower())
 
         # define height and width of the word list
         self.height = len(self.rows)
@@ -422,12 +449,22 @@ class QLCParserWithRowsAndCols(QLCParser):
         self._rowIdx = rowIdx
         self._colIdx = colIdx
 
+        self._make_index()
+
+    def _make_index(self):
+        """
+        Create the index of the entries by row and column.
+        """
+        rowIdx, colIdx = self._rowIdx, self._colIdx
+        self._clear_cache()
+
         # create a basic array which assigns ids for the entries in a starling manner.
         # first, find out, how many items (== synonyms) are there maximally for each row
         self._dict = defaultdict(lambda: defaultdict(list))
-        for key, value in [(k, v) for k, v in self._data.items()
-                           if k != 0 and str(k).isnumeric()]:
-            self._dict[value[rowIdx]][value[colIdx]].append(key)
+        for key, value in self._data.items():
+            if (key > 0 if isinstance(key, int) else
+                    key != 0 and str(key).isnumeric()):
+                self._dict[value[rowIdx]][value[colIdx]].append(key)
 
         # We must cast to a regular dict to make the attribute picklable.
         self._dict = dict(self._dict)
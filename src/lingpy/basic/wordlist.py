@@ -1,23 +1,26 @@
 """
 This module provides a basic class for the handling of word lists.
 """
+import io
 import os
+import csv
+import itertools
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, Counter
 from pathlib import Path
 
-from csvw import dsv
 from csvw.metadata import TableGroup
 from unicodedata import normalize
 
 import pycldf
 
 from lingpy.convert.strings import matrix2dst, pap2nex, pap2csv, multistate2nex
+from lingpy.convert.snapshot import to_snapshot, from_snapshot
 from lingpy.settings import rcParams
 from lingpy.basic.parser import QLCParserWithRowsAndCols, read_conf
 from lingpy.basic.ops import (
     wl2dst, wl2dict, renumber, calculate_data, wl2qlc, tsv2triple,
-    wl2multistate, coverage, iter_rows
+    wl2multistate, coverage, iter_rows, Query
 )
 from lingpy.algorithm import clustering as cluster
 from lingpy import util
@@ -35,6 +38,10 @@ class BounceAsID (object):
     >>> b["long_id"]
     {"ID": "long_id"}
 
+    .. deprecated:: 2.6.14
+       The class is no longer used by
+       :py:meth:`~lingpy.basic.wordlist.Wordlist.from_cldf` and will be
+       removed in a future version.
     """
     def __getitem__(self, key):
         return {"ID": key}
@@ -145,6 +152,68 @@ class Wordlist(QLCParserWithRowsAndCols):
         self._add_entries(entry, source, function, override, **keywords)
 
 
+    def _get_col_positions(self):
+        """
+        Return a dictionary from column names to their position in the array.
+        """
+        if 'col_positions' not in self._cache:
+            self._cache['col_positions'] = {
+                col: i for i, col in enumerate(self.cols)}
+        return self._cache['col_positions']
+
+    def _get_col_index(self):
+        """
+        Return a dictionary from column names to the row-wise entry ids.
+        """
+        if 'col_index' not in self._cache:
+            index = {col: {} for col in self.cols}
+            for row, cols in self._dict.items():
+                for col, keys in cols.items():
+                    if keys and col in index:
+                        index[col][row] = keys
+            self._cache['col_index'] = index
+        return self._cache['col_index']
+
+    def _get_ref_index(self, ref, modify_ref=False):
+        """
+        Return a dictionary from cognate ids to the column-wise entry ids.
+
+        Notes
+        -----
+        Only the index for the last function passed as *modify_ref* is kept
+        for each reference column, since new functions, such as lambdas, are
+        passed with every call.
+        """
+        cached = self._cache.get(('ref_index', ref))
+        if cached and cached[0] is modify_ref:
+            return cached[1]
+
+        f = modify_ref or util.identity
+        positions = self._get_col_positions()
+        cogIdx = self._header[ref]
+
+        index = {}
+        for key in self:
+            cogids = self[key][cogIdx]
+            colIdx = positions[self[key][self._colIdx]]
+            # check if data is not a list or tuple, if this is the case,
+            # make it a fake-list, so we can treat it just as all the other
+            # instances of fuzzy cognates (output is the same, though)
+            if isinstance(cogids, (str, int, float)):
+                cogids = [cogids]
+            for cog in cogids:
+                cogid = f(cog)
+                # we initialize with zero here, since this corresponds to a
+                # missing entry in our data
+                if cogid not in index:
+                    index[cogid] = [0 for i in range(self.width)]
+                if index[cogid][colIdx]:
+                    index[cogid][colIdx].append(key)
+                else:
+                    index[cogid][colIdx] = [key]
+        self._cache['ref_index', ref] = (modify_ref, index)
+        return index
+
     def get_dict(
             self,
             col='',
@@ -240,11 +309,9 @@ class Wordlist(QLCParserWithRowsAndCols):
             return entries
 
         if col:
-            data = defaultdict(list)
-            for i, j in [(self[i][self._rowIdx], i)
-                         for i in self._array[:, self.cols.index(col)] if i != 0]:
-                data[i].append(j)
-            entries = data
+            entries = defaultdict(list)
+            for key, value in self._get_col_index()[col].items():
+                entries[key] = list(value)
             if entry:
                 entries = {key: [self[i][self._header[entry]] for i in value]
                            for key, value in entries.items()}
@@ -379,7 +446,7 @@ class Wordlist(QLCParserWithRowsAndCols):
                 raise ValueError(
                     "The column {0} you selected is not available!".format(col))
             else:
-                data = self._array[:, self.cols.index(col)]
+                data = self._array[:, self._get_col_positions()[col]]
 
                 if not entry:
                     if flat:
@@ -453,33 +520,10 @@ class Wordlist(QLCParserWithRowsAndCols):
         cognate set for each of the IDs.
 
         """
-        ref = self._alias[ref] 
-        f = modify_ref or util.identity
-        
-        # create an etymdict object
-        etym_dict = {}
-
-        # get the index for the cognate id
-        cogIdx = self._header[ref]
-
-        # iterate over all data
-        for key in self:
-            cogids = self[key][cogIdx]
-            colIdx = self.cols.index(self[key][self._colIdx])
-            # check if data is not a list or tuple, if this is the case,
-            # make it a fake-list, so we can treat it just as all the other
-            # instances of fuzzy cognates (output is the same, though)
-            if isinstance(cogids, (str, int, float)):
-                cogids = [cogids]
-            for cog in cogids:
-                cogid = f(cog)
-                # we initialize with zero here, since this corresponds to a
-                # missing entry in our data
-                if cogid not in etym_dict:
-                    etym_dict[cogid] = [0 for i in range(self.width)]
-                # assign new values for the current session
-                new_value = etym_dict[cogid][colIdx] or []
-                etym_dict[cogid][colIdx] = new_value + [key]
+        etym_dict = {
+            key: [list(value) if value else 0 for value in values]
+            for key, values in self._get_ref_index(
+                self._alias[ref], modify_ref).items()}
         if entry:
             # create the output
             _etym_dict = {}
@@ -515,45 +559,100 @@ class Wordlist(QLCParserWithRowsAndCols):
         missing : string,int (default = 0)
             The marker for missing items.
         """
-        etym_dict = self.get_etymdict(ref=ref, entry=entry,
-                modify_ref=modify_ref)
-        paps, missed = {}, {}
-
-        # retrieve the values
-        for key, values in etym_dict.items():
-            paps[key] = []
-
-            # check for missing data
-            meanings = set()
-            for value in values:
-                if value:
-                    for v in value:
-                        meanings.add(v)
-            if len(meanings) == 1:
-                meaning = meanings.pop()
-
-                if meaning not in missed:
-                    # get the sum of the list in the wordlist of self
-                    tmp = sum(np.array(self.get_list(row=meaning)))
-
-                    # append all languages which are zero to missing
-                    missed[meaning] = [i for i in range(self.width) if not tmp[i]]
-            else:
-                meaning = False
+        ref = self._alias[ref]
+        cogids, presence = self.get_presence_matrix(
+            ref=ref, modify_ref=modify_ref)
+        coverage = self.get_coverage_matrix()
+        rows = {row: i for i, row in enumerate(self.rows)}
+
+        # find the meaning of each cognate set, cognate sets with more than
+        # one meaning are not checked for missing data
+        idx = self._header[entry]
+        meanings = np.zeros(len(cogids), dtype=int) - 1
+        for i, values in enumerate(
+                self._get_ref_index(ref, modify_ref).values()):
+            tmp = set(self[k][idx] for value in values if value for k in value)
+            if len(tmp) == 1:
+                meaning = tmp.pop()
+                if meaning not in rows:
+                    raise ValueError(
+                        "The row {0} you selected is not available.".format(
+                            meaning))
+                meanings[i] = rows[meaning]
+
+        # absent cognate sets are marked as missing (-1) if the language
+        # lacks the meaning, and as present if there is no single meaning
+        paps = np.ones(presence.shape, dtype='int8')
+        single = meanings != -1
+        paps[single] = np.where(
+            presence[single], 1, coverage[meanings[single]] - 1)
+        out = paps.tolist()
+        for i in np.nonzero((paps == -1).any(1))[0]:
+            out[i] = [missing if v == -1 else v for v in out[i]]
+
+        return dict(zip(cogids, out))
+
+    def get_presence_matrix(self, ref='cogid', modify_ref=False):
+        """
+        Return the presence of all cognate sets in all languages as a matrix.
 
-            for i, value in enumerate(values):
-                if value:
-                    paps[key].append(1)
-                else:
-                    if meaning:
-                        if i in missed[meaning]:
-                            paps[key].append(missing)
-                        else:
-                            paps[key].append(0)
-                    else:
-                        paps[key].append(1)
+        Parameters
+        ----------
+        ref : string (default = "cogid")
+            The reference entry which is used to store the cognate ids.
+
+        modify_ref : function (default=False)
+            Use a function to modify the reference, as in
+            :py:meth:`~lingpy.basic.wordlist.Wordlist.get_etymdict`.
+
+        Returns
+        -------
+        cogids, matrix : tuple
+            The cognate ids in the order of the etymological dictionary and
+            a NumPy array of type int8 with one row per cognate set and one
+            column per language, in which 1 indicates that the language has
+            a reflex of the cognate set.
+
+        Notes
+        -----
+        The matrix is cached along with the word list until the data is
+        modified, it is therefore returned as a read-only array. Only the
+        matrix for the last function passed as *modify_ref* is kept for each
+        reference column.
+        """
+        ref = self._alias[ref]
+        cached = self._cache.get(('presence', ref))
+        if not cached or cached[0] is not modify_ref:
+            index = self._get_ref_index(ref, modify_ref)
+            matrix = np.array(
+                [[1 if value else 0 for value in values]
+                 for values in index.values()],
+                dtype='int8').reshape(len(index), self.width)
+            matrix.flags.writeable = False
+            cached = self._cache['presence', ref] = (
+                modify_ref, (list(index), matrix))
+        return cached[1]
+
+    def get_coverage_matrix(self):
+        """
+        Return the coverage of all concepts in all languages as a matrix.
 
-        return paps
+        Returns
+        -------
+        matrix : numpy.ndarray
+            A read-only array of type int8 with one row per concept, in the
+            order of the rows of the word list, and one column per language,
+            in which 1 indicates that the language has at least one word for
+            the concept.
+        """
+        if 'coverage' not in self._cache:
+            matrix = np.zeros((self.height, self.width), dtype='int8')
+            for i, row in enumerate(self.rows):
+                if row in self._idx:
+                    matrix[i] = (self._array[self._idx[row]] != 0).any(0)
+            matrix.flags.writeable = False
+            self._cache['coverage'] = matrix
+        return self._cache['coverage']
 
     def iter_cognates(self, ref, *entries):
         """Iterate over cognate sets in a wordlist."""
@@ -735,8 +834,9 @@ class Wordlist(QLCParserWithRowsAndCols):
 
             if not isinstance(cols, (list, tuple, bool)):
                 raise ValueError("[i] Argument 'cols' should be list or tuple.")
-            if not isinstance(rows, (dict, bool)):
-                raise ValueError("[i] Argument 'rows' should be a dictionary.")
+            if not isinstance(rows, (dict, bool, Query)):
+                raise ValueError(
+                    "[i] Argument 'rows' should be a dictionary or a query.")
 
             # check for chosen header
             if cols:
@@ -746,30 +846,22 @@ class Wordlist(QLCParserWithRowsAndCols):
             else:
                 indices = [r for r in range(len(self.header))]
 
+            # compile the filter only once
             if rows:
-                stmts = []
-                for key, value in rows.items():
-                    if key == 'ID':
-                        stmts += ["key " + value]
-                    else:
-                        idx = self._header[key]
-                        stmts += ["line[{0}] ".format(idx) + value]
+                if not isinstance(rows, Query):
+                    rows = Query.from_rows(rows)
+                rows = rows.compile(self)
 
             log.debug("calculated what should be excluded")
 
-            # get the data
+            # get the data, the values are selected while writing
             out = {}
             for key, line in self._data.items():
-                log.debug(key)
-
-                if rows:
-                    if eval(" and ".join(stmts)):
-                        out[key] = [line[i] for i in indices]
-                else:
-                    out[key] = [line[i] for i in indices]
+                if not rows or rows(key, line):
+                    out[key] = line
 
             log.debug("passing data to wl2qlc")
-            return wl2qlc(header, out, **keywords)
+            return wl2qlc(header, out, columns=indices, **keywords)
 
         # output dst-format (phylip)
         if fileformat == 'dst':
@@ -877,13 +969,14 @@ class Wordlist(QLCParserWithRowsAndCols):
         cols : list
             If *subset* is set to c{True}, specify the columns that shall be
             written to the csv-file.
-        rows : dict
+        rows : {dict, ~lingpy.basic.ops.Query}
             If *subset* is set to c{True}, use a dictionary consisting of keys
             that specify a column and values that give a Python-statement in
             raw text, such as, e.g., "== 'hand'". The content of the specified
             column will then be checked against statement passed in the
             dictionary, and if it is evaluated to c{True}, the respective row
-            will be written to file.
+            will be written to file. Alternatively, pass a
+            :py:class:`~lingpy.basic.ops.Query`.
         ref : str
             Name of the column that contains the cognate IDs if 'starling' is
             chosen as an output format.
@@ -911,6 +1004,9 @@ class Wordlist(QLCParserWithRowsAndCols):
             output format, which makes it easier to see blocks of words
             denoting the same concept. Switching this off will output the file
             in plain "tsv". 
+        compressed : bool (default=False)
+            Compresses the "tsv" file output with gzip and adds the suffix
+            ".gz" to the file name.
         
         See also
         --------
@@ -959,6 +1055,15 @@ class Wordlist(QLCParserWithRowsAndCols):
 
         util.setdefaults(keywords, filename=rcParams['filename'])
 
+        # exclude the rows which do not match the filter
+        if keywords.get('rows'):
+            rows = keywords['rows']
+            keep = set(
+                (rows if isinstance(rows, Query) else Query.from_rows(rows))(
+                    self))
+            exclude = list(exclude or []) + [
+                key for key in self if key not in keep]
+
         # get the temporary dictionary
         out = wl2dict(self, sections, entries, exclude)
 
@@ -1020,6 +1125,10 @@ class Wordlist(QLCParserWithRowsAndCols):
 
         Notes
         -----
+        Pass a :py:class:`~lingpy.basic.ops.Query` or a dictionary of
+        statements as for :py:meth:`~lingpy.basic.wordlist.Wordlist.output`
+        with the keyword *rows* in order to export only a part of the data.
+
         The difference between export and output is that the latter mostly
         serves for internal purposes and formats, while the former serves for
         publication of data, using specific, nested statements to create, for
@@ -1035,6 +1144,116 @@ class Wordlist(QLCParserWithRowsAndCols):
             template,
             **keywords)
 
+    def filter(self, query):
+        """
+        Select the rows of the wordlist which match a query.
+
+        Parameters
+        ----------
+        query : {~lingpy.basic.ops.Query, dict}
+            The query, or a dictionary of columns and statements as accepted
+            by the keyword *rows* of
+            :py:meth:`~lingpy.basic.wordlist.Wordlist.output`.
+
+        Returns
+        -------
+        wordlist : ~lingpy.basic.wordlist.Wordlist
+            A wordlist with the matching rows.
+
+        Notes
+        -----
+        The result is a view on the wordlist, see
+        :py:meth:`~lingpy.basic.wordlist.Wordlist.view`.
+
+        Examples
+        --------
+        Select all words for "hand" and "foot"::
+
+            >>> from lingpy.basic.ops import Query
+            >>> sub = wl.filter(Query('concept', 'in', ['hand', 'foot']))
+        """
+        if not isinstance(query, Query):
+            query = Query.from_rows(query)
+        return self.view(ids=query(self))
+
+    def view(self, rows=None, cols=None, ids=None, cls=None, **keywords):
+        """
+        Create a view on a subset of the wordlist without copying the data.
+
+        Parameters
+        ----------
+        rows : list (default=None)
+            The rows (usually concepts) which are selected, defaults to all
+            rows.
+        cols : list (default=None)
+            The columns (usually doculects) which are selected, defaults to
+            all columns.
+        ids : list (default=None)
+            The IDs of the entries which are selected, defaults to all
+            entries.
+        cls : type (default=None)
+            The class of the view, defaults to
+            :py:class:`~lingpy.basic.wordlist.Wordlist`. Pass
+            :py:class:`~lingpy.compare.lexstat.LexStat` to promote the view
+            to a LexStat object.
+
+        Returns
+        -------
+        wordlist : ~lingpy.basic.wordlist.Wordlist
+            An object of class *cls* with the entries matching all criteria.
+
+        Notes
+        -----
+        The rows of the data are shared with the original wordlist, only the
+        indexes of the view are created anew. A shared row is copied when it
+        is modified in either of the two wordlists, by setting a cell or by
+        adding a new column, which happens, for example, when a view is
+        promoted to a LexStat object and the original wordlist lacks some of
+        its columns. Modifications are therefore never visible in the other
+        wordlist. The metadata of the original wordlist, such as distances or trees, are
+        not passed on to the view. To turn the view into an independent
+        wordlist, pass it to the class, as in `Wordlist(view)`.
+
+        Examples
+        --------
+        Run a cognate detection analysis without one of the languages::
+
+            >>> from lingpy.compare.lexstat import LexStat
+            >>> lex = LexStat(test_data('KSL.qlc'))
+            >>> sub = lex.view(
+            ...     cols=[c for c in lex.cols if c != 'German'], cls=LexStat)
+            >>> sub.get_scorer()
+        """
+        if rows is None and cols is None:
+            keys = self._data if ids is None else [
+                key for key in ids if key in self._data]
+        else:
+            cols = None if cols is None else set(cols)
+            selected = set()
+            for row in self.rows if rows is None else rows:
+                for col, indices in self._dict.get(row, {}).items():
+                    if cols is None or col in cols:
+                        selected.update(indices)
+            keys = [key for key in (self._data if ids is None else ids)
+                    if key in selected]
+
+        data = {0: sorted(self.header, key=lambda x: self.header[x])}
+        for key in keys:
+            data[key] = self._data[key]
+
+        # the rows are copied on modification in both wordlists
+        if not isinstance(self._shared, set):
+            self._shared = set()
+        self._shared.update(keys)
+
+        kw = dict(row=self._row_name, col=self._col_name)
+        kw.update(keywords)
+        cls = cls or Wordlist
+        wordlist = cls.__new__(cls)
+        wordlist._shared = set(data) - {0}
+        wordlist.__init__(data, **kw)
+        return wordlist
+
     def coverage(self, stats='absolute'):
         """
         Function determines the coverage of a wordlist.
@@ -1048,6 +1267,65 @@ class Wordlist(QLCParserWithRowsAndCols):
         if stats == 'mean':
             return sum([a / self.height for a in cov.values()]) / self.width
 
+    def save_snapshot(self, filename, compressed=False):
+        """
+        Write the word list to a binary snapshot file.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file, to which the extension ".npz" is added if
+            it is missing.
+        compressed : bool (default=False)
+            Compress the arrays in the file, which makes loading slower.
+
+        Notes
+        -----
+        In contrast to the output in text formats, a snapshot stores the
+        complete state of the object, including all attributes, such as the
+        scorers of a :py:class:`~lingpy.compare.lexstat.LexStat` object,
+        which can be restored with
+        :py:meth:`~lingpy.basic.wordlist.Wordlist.load_snapshot`.
+
+        See also
+        --------
+        Wordlist.load_snapshot
+        """
+        to_snapshot(self, filename, compressed=compressed)
+
+    @classmethod
+    def load_snapshot(cls, path):
+        """
+        Load a word list or one of its daughter classes from a snapshot file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the file written by
+            :py:meth:`~lingpy.basic.wordlist.Wordlist.save_snapshot`.
+
+        Returns
+        -------
+        wordlist : ~lingpy.basic.wordlist.Wordlist
+            The restored object, which is an instance of the class from which
+            the snapshot was written, if this is *cls* or one of its daughter
+            classes.
+
+        Examples
+        --------
+        Store a LexStat object after computing the scorer and load it again::
+
+            >>> lex = LexStat(test_data('KSL.qlc'))
+            >>> lex.get_scorer()
+            >>> lex.save_snapshot('ksl.npz')
+            >>> lex = Wordlist.load_snapshot('ksl.npz')
+
+        See also
+        --------
+        Wordlist.save_snapshot
+        """
+        return from_snapshot(path, cls)
+
     @classmethod
     def from_cldf(
             cls, 
@@ -1078,6 +1356,9 @@ class Wordlist(QLCParserWithRowsAndCols):
                ('cogid_cognateset_id', 'cogid')
                ),
             filter=lambda row: row["form"],
+            languages=None,
+            concepts=None,
+            snapshot=None,
             **kwargs):
         """Load a CLDF dataset.
 
@@ -1107,6 +1388,17 @@ class Wordlist(QLCParserWithRowsAndCols):
         filter: function: rowdict → bool
           A condition function for importing only some rows. (default: lambda row: row["form"])
 
+        languages: list or set
+          The IDs of the languages which are imported. (default: all languages)
+
+        concepts: list or set
+          The IDs of the concepts (parameters) which are imported. (default:
+          all concepts)
+
+        snapshot: str
+          If given, the wordlist is also stored as a binary snapshot under
+          this file name, see :py:meth:`Wordlist.save_snapshot`.
+
         All other parameters are passed on to the `cls`
 
         Returns
@@ -1137,12 +1429,38 @@ class Wordlist(QLCParserWithRowsAndCols):
             dataset = pycldf.dataset.Dataset.from_data(fname)
 
         if dataset.module == "Wordlist":
-            # First, make a list of cognate codes if they are in a separate table.
-            cognateset_assignments = {}
+            # Make lookup dictionaries for the metadata of languages and
+            # concepts, with prefixed column names, so that the forms can be
+            # joined with them while they are read.
+            def lookup(table, prefix):
+                try:
+                    idx = dataset[table, "id"].name
+                except KeyError:
+                    return None
+                return {
+                    row[idx]: {
+                        "{0}_{1}".format(prefix, key).lower(): value
+                        for key, value in row.items()}
+                    for row in dataset[table].iterdicts()}
+
+            language_lookup = lookup("LanguageTable", "language")
+            concept_lookup = lookup("ParameterTable", "concept")
+            if languages is not None:
+                languages = set(languages)
+            if concepts is not None:
+                concepts = set(concepts)
+
+            # Cognate codes in a separate table are stored as plain tuples,
+            # since the table is as large as the form table.
+            cognate_names, cognateset_assignments = [], {}
             try:
                 form_reference = dataset["CognateTable", "formReference"].name
                 for row in dataset["CognateTable"].iterdicts():
-                    cognateset_assignments[row[form_reference]] = row
+                    if not cognate_names:
+                        cognate_names = [
+                            "cogid_{:}".format(key).lower() for key in row]
+                    cognateset_assignments[row[form_reference]] = tuple(
+                        row.values())
             except KeyError:
                 # Either there are no cognate codes, or they are in the form
                 # table. Both options are fine.
@@ -1154,36 +1472,25 @@ class Wordlist(QLCParserWithRowsAndCols):
             language_column = dataset["FormTable", "languageReference"].name
             parameter_column = dataset["FormTable", "parameterReference"].name
 
-            try:
-                l_id = dataset["LanguageTable", "id"].name
-                languages = {l[l_id]: l
-                            for l in dataset["LanguageTable"].iterdicts()}
-            except KeyError:
-                l_id = "ID"
-                languages = bounce_as_id
-
-            try:
-                c_id = dataset["ParameterTable", "id"].name
-                concepts = {c[c_id]: c
-                            for c in dataset["ParameterTable"].iterdicts()}
-            except KeyError:
-                c_id = "ID"
-                concepts = bounce_as_id
-
-
             # create dictionary
             D = {0: columns} # Reserve the header
+            converters = None
             for row in dataset["FormTable"].iterdicts():
+                language, concept = row[language_column], row[parameter_column]
+                if languages is not None and language not in languages:
+                    continue
+                if concepts is not None and concept not in concepts:
+                    continue
+
                 # TODO: Improve prefixing behaviour
-                s = {"cogid_{:}".format(key).lower(): value
-                     for key, value in cognateset_assignments.get(
-                             row[f_id], {}).items()}
+                cognates = cognateset_assignments.get(row[f_id])
+                s = dict(zip(cognate_names, cognates)) if cognates else {}
                 s.update(
-                    {"language_{:}".format(key).lower(): value
-                     for key, value in languages[row[language_column]].items()})
+                    language_lookup[language] if language_lookup is not None
+                    else {"language_id": language})
                 s.update(
-                    {"concept_{:}".format(key).lower(): value
-                     for key, value in concepts[row[parameter_column]].items()})
+                    concept_lookup[concept] if concept_lookup is not None
+                    else {"concept_id": concept})
                 s.update({k.lower(): v for k, v in row.items()})
 
                 if not filter(s):
@@ -1197,16 +1504,17 @@ class Wordlist(QLCParserWithRowsAndCols):
                 while idx in D:
                     idx += 1
 
-                if not D[0]:
-                    columns = list(s.keys())
-                    D[0] = [c.lower() for c in columns]
-
-                D[idx] = [datatypes.get(
-                    namespace.get(
-                        column,
-                        ''),
-                    lambda x: x)(
-                    s.get(column, '')) for column in columns]
+                if converters is None:
+                    if not D[0]:
+                        columns = list(s.keys())
+                        D[0] = [c.lower() for c in columns]
+                    converters = [
+                        datatypes.get(namespace.get(column, ''), lambda x: x)
+                        for column in columns]
+
+                D[idx] = [
+                    converter(s.get(column, '')) for converter, column in
+                    zip(converters, columns)]
             D[0] = [namespace.get(c, c) for c in columns]
             if len(D[0]) != len(set(D[0])):
                 log.warning('|'.join(columns))
@@ -1214,7 +1522,10 @@ class Wordlist(QLCParserWithRowsAndCols):
                 raise ValueError('name space clashes, cannot parse data')
 
             # convert to wordlist and return
-            return cls(D, **kwargs)
+            wordlist = cls(D, **kwargs)
+            if snapshot:
+                wordlist.save_snapshot(snapshot)
+            return wordlist
         else:
             # For most LingPy applications, it might be best to see whether we got
             # a Wordlist module.
@@ -1236,6 +1547,8 @@ def get_wordlist(path, delimiter=",", quotechar='"', normalization_form="NFC", *
         The delimiter in the CSV file.
     quotechar : str
         The quote character in your data.
+    normalization_form : { None, "NFC", "NFD", "NFKC", "NFKD" } (default="NFC")
+        The Unicode normalization form applied to all cells.
     row : str (default = "concept")
         A string indicating the name of the row that shall be taken as the
         basis for the tabular representation of the word list.
@@ -1244,6 +1557,8 @@ def get_wordlist(path, delimiter=",", quotechar='"', normalization_form="NFC", *
         basis for the tabular representation of the word list.
     conf : string (default='')
         A string defining the path to the configuration file.
+    chunksize : int (default=10000)
+        The number of rows which are read and converted at once.
     
     Notes
     -----
@@ -1253,23 +1568,81 @@ def get_wordlist(path, delimiter=",", quotechar='"', normalization_form="NFC", *
     csv-file, with your own specified delimiters and quote characters. If the
     first cell in the first row of your CSV file is not named "ID", the integer
     identifiers, which are required by LingPy will be automatically created.
+    The same happens if the identifiers are not integers, in which case they
+    are kept in the column "id", while duplicate integer identifiers raise a
+    :py:class:`ValueError`.
+
+    The file is read in chunks of rows, and all cells are normalized and
+    converted to the datatypes defined in the configuration file while they
+    are read, so that the content of the file is never held twice in memory.
 
     """
-    kw = dict(conf="", col="doculect", row="concept")
+    kw = dict(conf="", col="doculect", row="concept", chunksize=10000)
     kw.update(keywords)
-    data = list(dsv.reader(path, delimiter=delimiter, quotechar=quotechar))
-    header = [h.lower() for h in data[0]]
-    data = data[1:]
+    conf = kw['conf'] or util.data_path('conf', 'wordlist.rc')
+    classes = read_conf(conf)[1]
+
     D = {}
-    if header[0] == 'ID':
-        D[0] = header[1:]
-        for row in data:
-            D[row[0]] = [normalize(normalization_form, n) for n in row[1:]]
-    else:
-        D[0] = header
-        for idx, row in enumerate(data):
-            D[idx + 1] = row
-    return Wordlist(D, row=kw['row'].lower(), col=kw['col'].lower())
+    with io.open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter, quotechar=quotechar)
+        header = [h.lower() for h in next(reader)]
+        with_ids = header[0] == 'id'
+        D[0] = header[1:] if with_ids else header
+
+        # converters for all columns, strings are not converted
+        converters = [
+            (i, head, classes[head]) for i, head in enumerate(D[0])
+            if classes.get(head, str) != str]
+
+        def convert(idx, row):
+            for i, head, converter in converters:
+                # short rows are reported by the parser
+                if i >= len(row):
+                    break
+                try:
+                    row[i] = converter(row[i])
+                except (ValueError, TypeError):
+                    log.warning(
+                        'Problem with row {0} in col {1}, expected «{2}» as '
+                        'datatype but received «{3}».'.format(
+                            idx, head, converter, row[i]))
+            return row
+
+        idx, ids = 0, []
+        with util.pb(desc='LOADING WORDLIST', unit='rows') as progress:
+            for chunk in iter(
+                    lambda: list(itertools.islice(reader, kw['chunksize'])), []):
+                for row in chunk:
+                    if normalization_form:
+                        row = [normalize(normalization_form, n) for n in row]
+                    idx += 1
+                    if with_ids:
+                        ids.append(row[0])
+                        row = row[1:]
+                    D[idx] = convert(idx, row) if converters else row
+                progress.update(len(chunk))
+
+    if with_ids:
+        try:
+            keys = [int(key) for key in ids]
+        except ValueError:
+            log.warning(
+                'The IDs in your data are not integers and will be stored '
+                'in the column «id».')
+            D[0] = ['id'] + D[0]
+            for i, key in enumerate(ids):
+                D[i + 1] = [key] + D[i + 1]
+        else:
+            duplicates = sorted(
+                key for key, count in Counter(keys).items() if count > 1)
+            if duplicates:
+                raise ValueError('Duplicate IDs in your data: {0}'.format(
+                    ', '.join(str(key) for key in duplicates)))
+            D = dict(
+                [(0, D[0])] + [(key, D[i + 1]) for i, key in enumerate(keys)])
+
+    return Wordlist(
+        D, row=kw['row'].lower(), col=kw['col'].lower(), conf=kw['conf'] or None)
 
 
 def from_cldf(path, to=Wordlist, concept='Name', concepticon='Concepticon_ID',
@@ -463,6 +463,11 @@ class pairwise(Command):
             "Choose whether you want distances or similarities to be reported.",
             short_opt='d')
         add_method_option(p, 'basic', ['sca', 'basic'], spec='basic')
+        add_option(
+            p,
+            'processes',
+            1,
+            "Number of worker processes for sound-class based analyses of input files.")
 
     def __call__(self, args):
         def make_out(x, y, z):
@@ -486,19 +491,32 @@ class pairwise(Command):
                 almA, almB, sim = pair.alignments[0]
 
             self.output(args, make_out(almA, almB, sim))
+        elif args.input_file and args.method == 'sca':
+            kw = dict(
+                processes=int(args.processes),
+                mode=args.mode,
+                gop=args.gop,
+                scale=args.scale,
+                factor=args.factor,
+                restricted_chars=args.restricted_chars,
+                distance=args.distance)
+            if args.output_file:
+                lingpy.align.sca.align_psq(
+                    args.input_file, filename=args.output_file, **kw)
+            else:
+                _, pairs = lingpy.align.sca.iter_psq(args.input_file)
+                for almA, almB, sim in lingpy.align.pairwise.batch_align(
+                        (pair for _, _, pair in pairs), **kw):
+                    print(make_out(almA, almB, sim))
+                print()
         elif args.input_file:
             pairs = lingpy.align.sca.PSA(args.input_file)
             output = ''
-            if args.method == 'basic':
-                for i, (seqA, seqB) in enumerate(pairs.tokens):
-                    almA, almB, sim = lingpy.align.pairwise.pw_align(
-                        ''.join(seqA), ''.join(seqB), **args.__dict__)
-                    pairs.alignments[i] = [almA, almB, sim]
-                    output += make_out(almA, almB, sim) + '\n'
-            elif args.method == 'sca':
-                pairs.align(**args.__dict__)
-                for almA, almB, sim in pairs.alignments:
-                    output += make_out(almA, almB, sim) + '\n'
+            for i, (seqA, seqB) in enumerate(pairs.tokens):
+                almA, almB, sim = lingpy.align.pairwise.pw_align(
+                    ''.join(seqA), ''.join(seqB), **args.__dict__)
+                pairs.alignments[i] = [almA, almB, sim]
+                output += make_out(almA, almB, sim) + '\n'
 
             if args.output_file:
                 pairs.output('psa', filename=args.output_file)
@@ -62,10 +62,108 @@ def get_score_dict(chars, model):
     return misc.ScoreDict(chars, matrix)
 
 
+def extend_score_dict(scorer, chars, model):
+    """
+    Return a copy of a scoring dictionary extended by new characters.
+
+    Parameters
+    ----------
+    scorer : :py:class:`~lingpy.algorithm.cython.misc.ScoreDict`
+        The scoring dictionary which shall be extended.
+    chars : list
+        The characters which are not yet contained in the scoring dictionary.
+    model : :py:class:`~lingpy.data.model.Model`
+        The sound-class model which scores the new characters.
+    """
+    old = sorted(scorer.chars2int, key=lambda x: scorer.chars2int[x])
+    chars = old + list(chars)
+    matrix = [list(line) + [0.0 for char in chars[len(old):]]
+              for line in scorer.matrix]
+    matrix += [[0.0 for char in chars] for char in chars[len(old):]]
+    for i in range(len(old), len(chars)):
+        for j in range(i + 1):
+            matrix[i][j] = matrix[j][i] = model(
+                char_from_charstring(chars[i]), char_from_charstring(chars[j]))
+    return misc.ScoreDict(chars, matrix)
+
+
+def _concept_products(sizesA, sizesB):
+    """
+    Return the positions of the words in the products of words per concept.
+
+    Notes
+    -----
+    The words of both languages are assumed to be ordered by concept, with
+    *sizesA* and *sizesB* giving the number of words per concept. The
+    positions are returned in the order of
+    :py:func:`itertools.product` applied to the words of each concept.
+    """
+    counts = sizesA * sizesB
+    block = np.repeat(np.arange(len(counts)), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts,
+                                                counts)
+    a = (np.cumsum(sizesA) - sizesA)[block] + local // sizesB[block]
+    b = (np.cumsum(sizesB) - sizesB)[block] + local % sizesB[block]
+    return a, b
+
+
+def _stable_clusters(clusters, former, start):
+    """
+    Relabel clusters with the identifiers which their members had before.
+
+    Notes
+    -----
+    Larger clusters choose first among the former identifiers of their
+    members, picking the most frequent one. Clusters for which no former
+    identifier is left receive new identifiers counting from *start*.
+    """
+    groups = defaultdict(list)
+    for i, label in enumerate(clusters):
+        groups[label].append(i)
+    out, used = [0 for label in clusters], set()
+    for members in sorted(groups.values(), key=lambda x: (-len(x), x[0])):
+        counts = Counter(
+            former[i] for i in members
+            if isinstance(former[i], int) and former[i] > 0)
+        candidates = sorted(
+            [label for label in counts if label not in used],
+            key=lambda x: (-counts[x], x))
+        if candidates:
+            label = candidates[0]
+        else:
+            start += 1
+            label = start
+        used.add(label)
+        for i in members:
+            out[i] = label
+    return out
+
+
 def _lexstat(x, y):
     return x if x != '-' else charstring(y)
 
 
+def _null_distances(task, data, scorer, kw):
+    """
+    Align pairs of words by their indices and return the distances.
+    """
+    idxA, idxB = task
+    if scorer is None:
+        return [edit_dist(data[a], data[b], True, kw['restriction'])
+                for a, b in zip(idxA, idxB)]
+    return [alm[2] for alm in calign.align_pairs(
+        [(data[a][0], data[b][0]) for a, b in zip(idxA, idxB)],
+        [(data[a][1], data[b][1]) for a, b in zip(idxA, idxB)],
+        [(data[a][2], data[b][2]) for a, b in zip(idxA, idxB)],
+        kw['gop'],
+        kw['scale'],
+        kw['factor'],
+        scorer,
+        kw['mode'],
+        kw['restricted_chars'],
+        1)]
+
+
 class LexStat(Wordlist):
     """
     Basic class for automatic cognate detection.
@@ -188,9 +286,9 @@ class LexStat(Wordlist):
     Attributes
     ----------
     pairs : dict
-        A dictionary with tuples of language names as key and indices as value,
-        pointing to unique combinations of words with the same meaning in all
-        language pairs.
+        A dictionary with tuples of language names as key and arrays of
+        indices as value, with one row per pair, pointing to unique
+        combinations of words with the same meaning in all language pairs.
     model : :py:class:`~lingpy.data.model.Model`
         The sound class model instance which serves to convert the phonetic
         data into sound classes.
@@ -322,10 +420,16 @@ class LexStat(Wordlist):
                         filename=self.filename + '_cleaned',
                         subset=True,
                         rows={"ID": "not in " + str([i[0] for i in errors])})
-                    # load the data in a new LexStat instance
-                    # and copy the __dict__
-                    lexstat = LexStat(self.filename + '_cleaned.tsv', **kw)
+                    # create a new LexStat instance from a view on the clean
+                    # data and copy the __dict__
+                    bad = set(i[0] for i in errors)
+                    lexstat = self.view(
+                        ids=[key for key in self if key not in bad],
+                        cls=LexStat, **kw)
+                    lexstat.filename = self.filename + '_cleaned.tsv'
                     lexstat._meta['errors'] = [i[0] for i in errors]
+                    # the rows are no longer shared with the discarded data
+                    lexstat._shared = set()
                     self.__dict__ = copy(lexstat.__dict__)
                 return
             else:
@@ -439,30 +543,68 @@ class LexStat(Wordlist):
         # make the language pairs
         if not hasattr(self, "pairs"):
             self.pairs = {}
-            self._same_vals = defaultdict(list)
-            for (i, taxonA), (j, taxonB) in util.multicombinations2(
-                    enumerate(self.cols)):
-                self.pairs[taxonA, taxonB] = []
-                dictA = self.get_dict(col=taxonA)
-                dictB = self.get_dict(col=taxonB)
-                if i < j:
-                    for c in sorted(set(dictA).intersection(dictB)):
-                        for idxA, idxB in product(dictA[c], dictB[c]):
-                            this_pair = '{0}-{1}/{2}-{3}'.format(
-                                    ''.join(self[idxA, self._segments]),
-                                    taxonA,
-                                    ''.join(self[idxB, self._segments]),
-                                    taxonB
-                                    )
-                            if not self._same_vals[this_pair]:
-                                self.pairs[taxonA, taxonB] += [(idxA, idxB)]
-                            self._same_vals[this_pair] += [(idxA, idxB)]
-                elif i == j:
-                    for c in sorted(dictA):
-                        for idx in dictA[c]:
-                            dAB = self[idx, self._duplicates]
-                            if dAB != 1:
-                                self.pairs[taxonA, taxonA] += [(idx, idx)]
+            self._make_pairs()
+
+    def _language_pairs(self, doculects=None):
+        """
+        Return all pairs of languages along with their indices.
+
+        Notes
+        -----
+        If *doculects* is given, only those pairs which contain at least one
+        of the doculects are returned.
+        """
+        return [
+            ((i, tA), (j, tB)) for (i, tA), (j, tB) in util.multicombinations2(
+                enumerate(self.cols))
+            if not doculects or tA in doculects or tB in doculects]
+
+    def _make_pairs(self, doculects=None):
+        """
+        Collect the pairs of words with the same meaning in all language pairs.
+
+        Notes
+        -----
+        The pairs are stored as arrays with one row per pair. Of all pairs of
+        words with identical transcriptions in a language pair, only the first
+        one is kept.
+        """
+        # identical transcriptions share the same integer code
+        words = {}
+        codes = {idx: words.setdefault(
+            ''.join(self[idx, self._segments]), len(words)) for idx in self}
+
+        for (i, taxonA), (j, taxonB) in self._language_pairs(doculects):
+            dictA = self.get_dict(col=taxonA)
+            if i == j:
+                self.pairs[taxonA, taxonA] = np.array([
+                    (idx, idx) for c in sorted(dictA) for idx in dictA[c]
+                    if self[idx, self._duplicates] != 1],
+                    dtype=int).reshape(-1, 2)
+                continue
+            dictB = self.get_dict(col=taxonB)
+            concepts = sorted(set(dictA).intersection(dictB))
+            idxA = np.array(
+                [idx for c in concepts for idx in dictA[c]], dtype=int)
+            idxB = np.array(
+                [idx for c in concepts for idx in dictB[c]], dtype=int)
+            a, b = _concept_products(
+                np.array([len(dictA[c]) for c in concepts], dtype=int),
+                np.array([len(dictB[c]) for c in concepts], dtype=int))
+            keys = np.array([codes[idx] for idx in idxA.tolist()],
+                            dtype=np.int64)[a] * len(words) + np.array(
+                [codes[idx] for idx in idxB.tolist()], dtype=np.int64)[b]
+            first = np.sort(np.unique(keys, return_index=True)[1])
+            self.pairs[taxonA, taxonB] = np.stack(
+                [idxA[a[first]], idxB[b[first]]], axis=1)
+
+    def _get_pair_entries(self, pairs, entry):
+        """
+        Return the values of an entry for both words of all word pairs.
+        """
+        col = self._header[self._alias[entry]]
+        return [(self._data[idxA][col], self._data[idxB][col])
+                for idxA, idxB in pairs.tolist()]
 
     def __repr__(self):
         return "<lexstat-model {0}>".format(self.filename)
@@ -631,9 +773,10 @@ class LexStat(Wordlist):
         """
         self.subsets = {}
         for tA, tB in util.multicombinations2(self.cols):
-            self.subsets[tA, tB] = [
-                pair for pair in self.pairs[tA, tB] if self[
-                    pair, ref][0] in sublist]
+            pairs = self.pairs[tA, tB]
+            self.subsets[tA, tB] = pairs[np.array([
+                self[idx, ref] in sublist for idx in pairs[:, 0].tolist()],
+                dtype=bool)]
 
     def _get_corrdist(self, **keywords):
         """
@@ -651,11 +794,14 @@ class LexStat(Wordlist):
             ref='scaid',
             restricted_chars=rcParams['restricted_chars'],
             threshold=rcParams['lexstat_scoring_threshold'],
-            subset=False)
+            subset=False,
+            doculects=None)
         kw.update(keywords)
 
-        self._included = {}
+        if not kw['doculects'] or not hasattr(self, '_included'):
+            self._included = {}
         corrdist = {}
+        lpairs = self._language_pairs(kw['doculects'])
 
         if kw['preprocessing']:
             if kw['ref'] not in self.header:
@@ -668,9 +814,8 @@ class LexStat(Wordlist):
 
         with util.pb(
                 desc='CORRESPONDENCE CALCULATION',
-                total=self.width ** 2 / 2) as pb:
-            for (i, tA), (j, tB) in util.multicombinations2(
-                    enumerate(self.cols)):
+                total=len(lpairs)) as pb:
+            for (i, tA), (j, tB) in lpairs:
                 pb.update(1)
                 log.info("Calculating alignments for pair {0} / {1}.".format(
                     tA, tB))
@@ -679,26 +824,24 @@ class LexStat(Wordlist):
                 for mode, gop, scale in kw['modes']:
                     pairs = self.pairs[tA, tB]
                     if kw['subset']:
-                        pairs = [
-                                pair for pair in pairs if pair in
-                                self.subsets[tA, tB]]
+                        pairs = self.subsets[tA, tB]
 
                     # threshold and preprocessing, make sure threshold is
                     # different from pre-processing threshold when
                     # preprocessing is set to false
                     if kw['preprocessing']:
-                        pairs = [pair for pair in pairs
-                                 if self[pair, kw['ref']][0] == self[
-                                     pair, kw['ref']][1]]
+                        pairs = pairs[np.array([
+                            a == b for a, b in self._get_pair_entries(
+                                pairs, kw['ref'])], dtype=bool)]
                         threshold = 10.0
                     else:
                         threshold = kw['threshold']
 
                     corrs, self._included[tA, tB] = calign.corrdist(
                         threshold,
-                        [self[pair, self._numbers] for pair in pairs],
-                        [self[pair, self._weights] for pair in pairs],
-                        [self[pair, self._prostrings] for pair in pairs],
+                        self._get_pair_entries(pairs, self._numbers),
+                        self._get_pair_entries(pairs, self._weights),
+                        self._get_pair_entries(pairs, self._prostrings),
                         gop,
                         scale,
                         kw['factor'],
@@ -728,7 +871,8 @@ class LexStat(Wordlist):
             runs=rcParams['lexstat_runs'],
             rands=rcParams['lexstat_rands'],
             limit=rcParams['lexstat_limit'],
-            method=rcParams['lexstat_scoring_method'])
+            method=rcParams['lexstat_scoring_method'],
+            doculects=None)
         kw.update(keywords)
 
         # determine the mode
@@ -736,7 +880,8 @@ class LexStat(Wordlist):
             else 'shuffle'
 
         corrdist = {}
-        tasks = (self.width ** 2) / 2
+        lpairs = self._language_pairs(kw['doculects'])
+        tasks = len(lpairs)
 
         if method == 'markov':
             seqs, pros, weights = {}, {}, {}
@@ -790,8 +935,7 @@ class LexStat(Wordlist):
             with util.pb(
                     desc='RANDOM CORRESPONDENCE CALCULATION',
                     total=tasks) as progress:
-                for (i, tA), (j, tB) in util.multicombinations2(
-                        enumerate(self.cols)):
+                for (i, tA), (j, tB) in lpairs:
                     progress.update(1)
                     log.info(
                         "Calculating random alignments"
@@ -829,12 +973,10 @@ class LexStat(Wordlist):
                             corrdist[tA, tB][a, b] += d / len(kw['modes'])
         # use shuffle approach otherwise
         else:
-            tasks = self.width ** 2 / 2
             with util.pb(
                     desc='RANDOM CORRESPONDENCE CALCULATION',
                     total=tasks) as progress:
-                for (i, tA), (j, tB) in util.multicombinations2(
-                        enumerate(self.cols)):
+                for (i, tA), (j, tB) in lpairs:
                     progress.update(1)
                     log.info(
                         "Calculating random alignments"
@@ -843,15 +985,12 @@ class LexStat(Wordlist):
                     corrdist[tA, tB] = defaultdict(float)
 
                     # get the number pairs etc.
-                    numbers = [
-                            self[pair, self._numbers] for pair in
-                            self.pairs[tA, tB]]
-                    gops = [
-                            self[pair, self._weights] for pair in
-                            self.pairs[tA, tB]]
-                    prostrings = [
-                            self[pair, self._prostrings] for pair in
-                            self.pairs[tA, tB]]
+                    numbers = self._get_pair_entries(
+                            self.pairs[tA, tB], self._numbers)
+                    gops = self._get_pair_entries(
+                            self.pairs[tA, tB], self._weights)
+                    prostrings = self._get_pair_entries(
+                            self.pairs[tA, tB], self._prostrings)
                     sample = [
                             (x, y)
                             for x in range(len(numbers)) for y in
@@ -891,6 +1030,64 @@ class LexStat(Wordlist):
                             corrdist[tA, tB][a, b] += d / len(kw['modes'])
         return corrdist
 
+    def _score_correspondences(self, matrix, doculects=None, **kw):
+        """
+        Fill a scoring matrix with the scores of the sound correspondences.
+
+        Notes
+        -----
+        The scores are derived from the attested and the expected distribution
+        of correspondences of all language pairs, or of those language pairs
+        which contain one of the *doculects*, if these are given.
+        """
+        # get the average gop
+        gop = sum([m[1] for m in kw['modes']]) / len(kw['modes'])
+
+        char_dict = self.bscorer.chars2int
+        for (i, tA), (j, tB) in self._language_pairs(doculects):
+            for charA, charB in product(
+                list(self.freqs[tA]) + [charstring(i + 1)],
+                list(self.freqs[tB]) + [charstring(j + 1)]
+            ):
+                exp = self._randist.get(
+                        (tA, tB), {}).get((charA, charB), False)
+                att = self._corrdist.get(
+                        (tA, tB), {}).get((charA, charB), False)
+                # in the following we follow the former lexstat protocol
+                if att <= kw['smooth'] and i != j:
+                    att = False
+
+                if att and exp:
+                    score = np.log2((att ** 2) / (exp ** 2))
+                elif att and not exp:
+                    score = np.log2((att ** 2) / kw['unexpected'])
+                elif exp and not att:
+                    score = kw['unattested']  # XXX gop ???
+                else:  # elif not exp and not att:
+                    score = -90  # ???
+
+                # combine the scores
+                if rcParams['gap_symbol'] not in charA + charB:
+                    sim = self.bscorer[charA, charB]
+                else:
+                    sim = gop
+
+                # get the real score
+                rscore = (kw['ratio'][0] * score + kw['ratio'][1] * sim) \
+                    / sum(kw['ratio'])
+
+                try:
+                    iA = char_dict[charA]
+                    iB = char_dict[charB]
+
+                    # use the vowel scale
+                    if charA[4] in self.vowels and charB[4] in self.vowels:
+                        matrix[iA][iB] = matrix[iB][iA] = kw['vscale'] * rscore
+                    else:
+                        matrix[iA][iB] = matrix[iB][iA] = rscore
+                except:
+                    pass
+
     def get_scorer(self, **keywords):
         """
         Create a scoring function based on sound correspondences.
@@ -1050,59 +1247,162 @@ class LexStat(Wordlist):
         # get the random distribution
         self._randist = self._get_randist(**kw)
 
-        # get the average gop
-        gop = sum([m[1] for m in kw['modes']]) / len(kw['modes'])
-
         # create the new scoring matrix
         matrix = [[c for c in line] for line in self.bscorer.matrix]
-        char_dict = self.bscorer.chars2int
+        self._score_correspondences(matrix, **kw)
 
-        for (i, tA), (j, tB) in util.multicombinations2(enumerate(self.cols)):
-            for charA, charB in product(
-                list(self.freqs[tA]) + [charstring(i + 1)],
-                list(self.freqs[tB]) + [charstring(j + 1)]
-            ):
-                exp = self._randist.get(
-                        (tA, tB), {}).get((charA, charB), False)
-                att = self._corrdist.get(
-                        (tA, tB), {}).get((charA, charB), False)
-                # in the following we follow the former lexstat protocol
-                if att <= kw['smooth'] and i != j:
-                    att = False
+        self.cscorer = misc.ScoreDict(self.chars, matrix)
+        self._meta['scorer']['cscorer'] = self.cscorer
 
-                if att and exp:
-                    score = np.log2((att ** 2) / (exp ** 2))
-                elif att and not exp:
-                    score = np.log2((att ** 2) / kw['unexpected'])
-                elif exp and not att:
-                    score = kw['unattested']  # XXX gop ???
-                else:  # elif not exp and not att:
-                    score = -90  # ???
+    def add_doculects(self, data, **keywords):
+        """
+        Add the words of new doculects to the analysis.
 
-                # combine the scores
-                if rcParams['gap_symbol'] not in charA + charB:
-                    sim = self.bscorer[charA, charB]
-                else:
-                    sim = gop
+        Parameters
+        ----------
+        data : {str, dict, ~lingpy.basic.wordlist.Wordlist}
+            The words of the new doculects, passed in any of the formats from
+            which a :py:class:`~lingpy.basic.wordlist.Wordlist` can be created.
+        keywords : dict
+            The keywords which were passed to
+            :py:meth:`~lingpy.compare.lexstat.LexStat.get_scorer`, used to
+            update the language-specific scoring function.
 
-                # get the real score
-                rscore = (kw['ratio'][0] * score + kw['ratio'][1] * sim) \
-                    / sum(kw['ratio'])
+        Returns
+        -------
+        concepts : list
+            The concepts which gained words, which can be passed to
+            :py:meth:`~lingpy.compare.lexstat.LexStat.cluster` in order to
+            re-cluster only these concepts.
 
-                try:
-                    iA = char_dict[charA]
-                    iB = char_dict[charB]
+        Notes
+        -----
+        The new words are converted to sound classes, prosodic strings, and
+        weights, unless these are provided, and appended to the data. The new
+        doculects are appended to the doculects of the wordlist, so that the
+        language identifiers of the existing doculects remain valid. Word
+        pairs, sound frequencies, and scoring dictionaries are extended for
+        the new doculects only. If a language-specific scoring function has
+        been calculated, the distributions of attested and expected sound
+        correspondences are only calculated for the language pairs involving
+        the new doculects, and the scoring function is extended accordingly.
+        Since the new doculects are not sorted with the existing ones, the
+        columns with language identifiers and numbers should not be reused
+        when the data is written to file and loaded again.
 
-                    # use the vowel scale
-                    if charA[4] in self.vowels and charB[4] in self.vowels:
-                        matrix[iA][iB] = matrix[iB][iA] = kw['vscale'] * rscore
-                    else:
-                        matrix[iA][iB] = matrix[iB][iA] = rscore
-                except:
-                    pass
+        Examples
+        --------
+        Add a doculect and re-cluster the concepts which gained words::
 
-        self.cscorer = misc.ScoreDict(self.chars, matrix)
-        self._meta['scorer']['cscorer'] = self.cscorer
+            >>> lex.get_scorer(runs=1000)
+            >>> lex.cluster(method='lexstat', threshold=0.6, ref='cogid')
+            >>> concepts = lex.add_doculects('new.tsv', runs=1000)
+            >>> lex.cluster(method='lexstat', threshold=0.6, ref='cogid',
+            ...     concepts=concepts)
+        """
+        kw = self.get_scorer(defaults=True)
+        kw.update(keywords)
+
+        wordlist = Wordlist(data, row=self._row_name, col=self._col_name)
+        doculects = [taxon for taxon in wordlist.cols]
+        if set(doculects).intersection(self.cols):
+            raise ValueError(
+                "[!] The doculects {0} are already in the wordlist.".format(
+                    ', '.join(sorted(set(doculects).intersection(
+                        self.cols)))))
+
+        # compute the missing columns with the language identifiers which
+        # follow the existing ones
+        langids = {taxon: str(self.width + i + 1)
+                   for i, taxon in enumerate(doculects)}
+        wordlist.add_entries(
+            self._langid, wordlist._col_name, lambda x: langids[x],
+            override=self._langid in wordlist.header)
+        lex = LexStat(
+            wordlist,
+            model=self.model,
+            transform=getattr(
+                self, '_transform', rcParams['lexstat_transform']),
+            segments=self._segments,
+            numbers=self._numbers,
+            classes=self._classes,
+            transcription=self._transcription,
+            prostrings=self._prostrings,
+            weights=self._weights,
+            sonars=self._sonars,
+            langid=self._langid,
+            duplicates=self._duplicates,
+            row=self._row_name,
+            col=self._col_name,
+            no_bscorer=True,
+            cldf=self._cldf)
+
+        # append the new rows
+        columns = sorted(self.header, key=lambda x: self.header[x])
+        idx = max(self._data)
+        concepts = set()
+        for key in sorted(lex):
+            idx += 1
+            self._data[idx] = [
+                lex[key, column] if column in lex.header else ''
+                for column in columns]
+            concepts.add(lex[key, self._row_name])
+        self.cols = self.cols + doculects
+        self.rows = sorted(
+            set(self.rows).union(concepts), key=lambda x: ('%s' % x).lower())
+        self.width, self.height = len(self.cols), len(self.rows)
+        self._make_index()
+        self._etym_dict = {}
+
+        # extend the frequencies, characters, and scoring dictionaries
+        chars, rchars = set(), set()
+        for taxon in doculects:
+            self.freqs[taxon] = lex.freqs[taxon]
+            chars.update(lex.freqs[taxon])
+        rchars = sorted(set(
+            char.split('.', 1)[1] for char in chars).difference(self.rchars))
+        chars = sorted(chars.difference(self.chars)) + [
+            charstring(self.cols.index(taxon) + 1) for taxon in doculects]
+        self.chars = self.chars + chars
+        self.rchars = self.rchars + rchars
+        self.bad_chars = [char for char in self.chars if char[2] == '0']
+        self._meta['scorer']['rscorer'] = self.rscorer = extend_score_dict(
+            self.rscorer, rchars, self.model)
+        if hasattr(self, 'bscorer'):
+            self._meta['scorer']['bscorer'] = self.bscorer = \
+                extend_score_dict(self.bscorer, chars, self.model)
+
+        # extend the word pairs
+        self._make_pairs(doculects)
+
+        # extend the scoring function for the new language pairs
+        if hasattr(self, 'cscorer'):
+            kw['doculects'] = doculects
+            if kw['preprocessing'] and kw['ref'] in self.header:
+                self.cluster(
+                    method=kw['preprocessing_method'],
+                    threshold=kw['preprocessing_threshold'],
+                    gop=kw['gop'],
+                    cluster_method=kw['cluster_method'],
+                    ref=kw['ref'],
+                    concepts=sorted(concepts))
+            if not hasattr(self, '_corrdist'):
+                self._corrdist, self._randist = {}, {}
+            self._corrdist.update(self._get_corrdist(**kw))
+            self._randist.update(self._get_randist(**kw))
+
+            # the cells of the new characters start from the scores of the
+            # basic scorer, as in the creation of the scoring function
+            matrix = [
+                list(line) + [self.bscorer[charA, charB] for charB in chars]
+                for charA, line in zip(self.chars, self.cscorer.matrix)]
+            matrix += [[self.bscorer[charA, charB] for charB in self.chars]
+                       for charA in chars]
+            self._score_correspondences(matrix, **kw)
+            self.cscorer = misc.ScoreDict(self.chars, matrix)
+            self._meta['scorer']['cscorer'] = self.cscorer
+
+        return sorted(concepts)
 
     def align_pairs(self, idxA, idxB, concept=None, **keywords):
         """
@@ -1248,6 +1548,7 @@ class LexStat(Wordlist):
             mode='overlap',
             gop=-2,
             restriction='',
+            concepts=None,
             **keywords):
         """
         Calculate alignment matrices.
@@ -1267,7 +1568,7 @@ class LexStat(Wordlist):
                 method, scale=scale, factor=factor,
                 restricted_chars=restricted_chars, mode=mode, gop=gop,
                 restriction=restriction, external_scorer=kw['external_scorer'])
-        concepts = [concept] if concept else sorted(self.rows)
+        concepts = [concept] if concept else sorted(concepts or self.rows)
         for c in concepts:
             log.info("Analyzing words for concept <{0}>.".format(c))
             indices = self.get_list(row=c, flat=True)
@@ -1291,6 +1592,89 @@ class LexStat(Wordlist):
             else:
                 yield matrix
 
+    def _get_null_distances(
+            self, method, seed=None, processes=1, chunksize=10000, **kw):
+        """
+        Compute the distances of words aligned with random partners.
+
+        Parameters
+        ----------
+        method : {'sca', 'lexstat', 'edit-dist'}
+            The method used to compute the distances.
+        seed : int (default=None)
+            The seed for the random number generator.
+        processes : int (default=1)
+            The number of processes among which the alignments are
+            distributed.
+        chunksize : int (default=10000)
+            The maximal number of word pairs aligned in one batch.
+
+        Returns
+        -------
+        total, count : tuple
+            The sum of all distances and the number of word pairs.
+
+        Notes
+        -----
+        For each language pair, each word of the first language is aligned
+        with *n* randomly drawn words of the second language, with *n* being
+        a twentieth of the number of word pairs (at least 5). The partners for
+        all words are drawn at once and word pairs which are drawn more than
+        once are aligned only once.
+        """
+        if method not in ['lexstat', 'sca', 'edit-dist']:
+            raise ValueError(
+                "[!] The method {0} cannot be used to guess the "
+                "threshold.".format(method))
+
+        if method == 'edit-dist':
+            data = {idx: self[idx, self._segments] for idx in self}
+            scorer = None
+        else:
+            data = {}
+            for idx, lang, numbers, weights, prostring in self.iter_rows(
+                    self._langid, self._numbers, self._weights,
+                    self._prostrings):
+                if method == 'lexstat':
+                    weights = [
+                        self.cscorer[charstring(lang), n] for n in numbers]
+                data[idx] = (numbers, weights, prostring)
+            scorer = self.cscorer if method == 'lexstat' else self.bscorer
+            if method == 'lexstat':
+                kw['gop'] = abs(kw['gop'])
+
+        rnd = np.random.RandomState(seed)
+        total, count = 0.0, 0
+        with util.worker_pool(
+                _null_distances, processes, (data, scorer, kw)) as map_tasks:
+            with util.pb(
+                    desc='THRESHOLD DETERMINATION',
+                    total=len(self.pairs)-len(self.cols)) as progress:
+                for l1, l2 in self.pairs:
+                    if l1 == l2:
+                        continue
+                    progress.update(1)
+                    pairs = self.pairs[l1, l2]
+                    if not len(pairs):
+                        continue
+                    draws = len(pairs) // 20 or 5
+                    partners = rnd.randint(0, len(pairs), (len(pairs), draws))
+                    keys, counts = np.unique(
+                        np.stack([
+                            np.repeat(pairs[:, 0], draws),
+                            pairs[partners.ravel(), 1]], axis=1),
+                        axis=0, return_counts=True)
+                    tasks = [
+                        (keys[i:i + chunksize, 0].tolist(),
+                         keys[i:i + chunksize, 1].tolist())
+                        for i in range(0, len(keys), chunksize)]
+                    for i, distances in zip(
+                            range(0, len(keys), chunksize), map_tasks(tasks)):
+                        total += float(np.dot(
+                            distances, counts[i:i + chunksize]))
+                    count += int(counts.sum())
+        return total, count
+
     def cluster(
             self,
             method='sca',
@@ -1344,6 +1728,20 @@ class LexStat(Wordlist):
             Specify the inflation parameter for the use of the MCL algorithm.
         expansion : int (default=2)
             Specify the expansion parameter for the use of the MCL algorithm.
+        gt_seed : int (default=None)
+            The seed for the random partners drawn when the threshold is
+            guessed with *gt_mode* "nulld".
+        processes : int (default=1)
+            The number of processes among which the alignments of the random
+            word pairs are distributed when the threshold is guessed with
+            *gt_mode* "nulld".
+        concepts : list (default=None)
+            Re-cluster only the words of these concepts, for example the
+            concepts which gained words after calling
+            :py:meth:`~lingpy.compare.lexstat.LexStat.add_doculects`. The
+            column *ref* must exist. The clusters keep the identifiers they
+            had before as far as possible, new identifiers are added for new
+            clusters, and the identifiers of all other words are not changed.
 
         """
         kw = dict(
@@ -1355,6 +1753,9 @@ class LexStat(Wordlist):
             gt_trange=(0.4, 0.6, 0.02),
             mcl_logs=lambda x: -np.log2((1 - x) ** 2),
             gt_mode='average',
+            gt_seed=None,
+            processes=1,
+            concepts=None,
             matrix_type='distances',
             link_threshold=False,
             _return_matrix=False,  # help function for test purposes
@@ -1385,9 +1786,20 @@ class LexStat(Wordlist):
         else:
             fclust = self._cluster_method(cluster_method, **kw)
 
+        if not ref:
+            ref = method + 'id' if method in [
+                    'turchin', 'lexstat', 'sca', 'custom'] else 'editid'
+        if kw['concepts'] and ref not in self.header:
+            raise ValueError(
+                "[!] The column {0} is needed to re-cluster concepts.".format(
+                    ref))
+
         # make a dictionary that stores the clusters for later update
         clr = {}
         k = 0
+        if kw['concepts']:
+            clr = {idx: self[idx, ref] for idx in self}
+            k = max([x for x in clr.values() if isinstance(x, int)] or [0])
 
         # create a matrix iterator
         matrices = self._get_matrices(
@@ -1413,29 +1825,21 @@ class LexStat(Wordlist):
             # approximate random distributions of similarities for each
             # sequence
             elif kw['gt_mode'] == 'nulld':
-                align = self._align_method(
+                total, count = self._get_null_distances(
                         method, restricted_chars=restricted_chars, mode=mode,
                         scale=scale, factor=factor, gop=gop,
-                        return_distance=True)
-                with util.pb(
-                        desc='THRESHOLD DETERMINATION',
-                        total=len(self.pairs)-len(self.cols)) as progress:
-                    for l1, l2 in self.pairs:
-                        progress.update(1)
-                        if l1 != l2:
-                            pairs = self.pairs[l1, l2]
-                            for p1, p2 in pairs:
-                                dx = [align(p1, pairs[random.randint(
-                                    0, len(pairs) - 1)][1])
-                                      for i in range(len(pairs) // 20 or 5)]
-                                thresholds.extend(dx)
+                        restriction=restriction, seed=kw['gt_seed'],
+                        processes=kw['processes'])
+                if count:
+                    threshold = total / count * 0.5
+                    self._meta['guessed_threshold'] = threshold
             if thresholds:
                 threshold = sum(thresholds) / len(thresholds) * 0.5
                 self._meta['guessed_threshold'] = threshold
 
         with util.pb(
                 desc='SEQUENCE CLUSTERING',
-                total=len(self.rows)) as progress:
+                total=len(kw['concepts'] or self.rows)) as progress:
             for concept, indices, matrix in matrices:
                 progress.update(1)
 
@@ -1463,22 +1867,223 @@ class LexStat(Wordlist):
                     # int index.
                     clusters = [c.get(str(i), c.get(i)) + k for i in range(len(matrix))]
 
+                    # keep the former identifiers of re-clustered concepts
+                    if kw['concepts']:
+                        clusters = _stable_clusters(
+                            clusters, [clr[idx] for idx in indices], k)
+
                     # reassign the "k" value
-                    k = max(clusters)
+                    k = max([k] + clusters)
 
                     # add values to cluster dictionary
                     for idxA, idxB in zip(indices, clusters):
                         clr[idxA] = idxB
 
-        if not ref:
-            ref = method + 'id' if method in [
-                    'turchin', 'lexstat', 'sca', 'custom'] else 'editid'
         self.add_entries(
-                ref, clr, util.identity, override=kw.get('override', False))
+                ref, clr, util.identity,
+                override=kw.get('override', False) or bool(kw['concepts']))
 
         # assign thresholds to parameters
         self._current_threshold = threshold
 
+    def get_candidates(
+            self,
+            k=2,
+            min_shared=1,
+            max_postings=1000,
+            same_language=False,
+            chunksize=10000000):
+        """
+        Propose candidate pairs of words across all concepts.
+
+        Parameters
+        ----------
+        k : int (default=2)
+            The length of the sound-class k-mers which are used to index the
+            words. The sound-class strings are padded with boundary markers,
+            so that k-mers at the beginning and the end of a word are
+            distinguished from word-internal ones.
+        min_shared : int (default=1)
+            The minimal number of k-mers two words need to share in order to
+            be proposed as a candidate pair.
+        max_postings : int (default=1000)
+            K-mers occurring in more words than this number are not used to
+            propose candidates, since they are not informative and would
+            yield a quadratic number of pairs.
+        same_language : bool (default=False)
+            Propose also pairs of words from the same language.
+        chunksize : int (default=10000000)
+            The number of pair codes which are collected before counting them,
+            in order to keep the memory consumption low.
+
+        Returns
+        -------
+        idxA, idxB : numpy.ndarray
+            Two arrays with the identifiers of the words in each candidate
+            pair.
+
+        Notes
+        -----
+        The candidates are computed from an inverted index of the sound-class
+        k-mers of all words, which means that no full matrix of all pairs of
+        words needs to be computed.
+        """
+        keys = sorted(self)
+        size = len(keys)
+        index = defaultdict(list)
+        for pos, key in enumerate(keys):
+            classes = '#' + ''.join(self[key, self._classes]) + '#'
+            for kmer in set(classes[i:i + k] for i in range(
+                    max(1, len(classes) - k + 1))):
+                index[kmer].append(pos)
+
+        codes, counts, collected = [], [], 0
+
+        def reduce(codes, counts):
+            codes, inverse = np.unique(
+                np.concatenate(codes), return_inverse=True)
+            return [codes], [np.bincount(
+                inverse, weights=np.concatenate(counts)).astype(int)]
+
+        for postings in index.values():
+            if 1 < len(postings) <= max_postings:
+                postings = np.array(postings, dtype=np.int64)
+                i, j = np.triu_indices(len(postings), 1)
+                codes.append(postings[i] * size + postings[j])
+                counts.append(np.ones(len(i), dtype=int))
+                collected += len(i)
+                if collected > chunksize:
+                    codes, counts = reduce(codes, counts)
+                    collected = len(codes[0])
+        if not codes:
+            return np.array([], dtype=int), np.array([], dtype=int)
+        codes, counts = reduce(codes, counts)
+        codes = codes[0][counts[0] >= min_shared]
+        posA, posB = codes // size, codes % size
+
+        if not same_language:
+            languages = np.array([self[key, self._col_name] for key in keys])
+            keep = languages[posA] != languages[posB]
+            posA, posB = posA[keep], posB[keep]
+        keys = np.array(keys)
+        return keys[posA], keys[posB]
+
+    def cluster_dataset(
+            self,
+            method='sca',
+            cluster_method='single',
+            threshold=0.3,
+            scale=0.5,
+            factor=0.3,
+            restricted_chars='_T',
+            mode='overlap',
+            gop=-2,
+            restriction='',
+            ref='crossid',
+            **keywords):
+        """
+        Cluster words into cognate sets across all concepts in the wordlist.
+
+        Parameters
+        ----------
+        method : {'sca','lexstat','edit-dist','turchin'} (default='sca')
+            Select the method that shall be used for the calculation.
+        cluster_method : {'single','mcl'} (default='single')
+            Select the cluster method. 'single' refers to single linkage
+            clustering, computed as the connected components of the graph of
+            all candidate pairs below the threshold, 'mcl' refers to the
+            "Markov Clustering Algorithm" (:evobib:`Dongen2000`) in its sparse
+            version, which requires the scipy package.
+        threshold : float (default=0.3)
+            Select the threshold for the cluster approach.
+        ref : str (default="crossid")
+            The column to which the cognate sets will be written.
+        k : int (default=2)
+            The length of the sound-class k-mers used to find candidate pairs.
+        min_shared : int (default=1)
+            The minimal number of shared k-mers of a candidate pair.
+        max_postings : int (default=1000)
+            The maximal number of words a k-mer may occur in to be used for
+            the search of candidate pairs.
+        same_language : bool (default=False)
+            Compare also words from the same language.
+
+        Notes
+        -----
+        Unlike :py:meth:`~lingpy.compare.lexstat.LexStat.cluster`, this
+        method compares words regardless of their concept, which can be used
+        to search for borrowings and semantic shifts. In order to scale to
+        large wordlists, only candidate pairs proposed by
+        :py:meth:`~lingpy.compare.lexstat.LexStat.get_candidates` are aligned,
+        and the clustering is carried out on the resulting sparse graph. The
+        remaining parameters are the same as for
+        :py:meth:`~lingpy.compare.lexstat.LexStat.cluster`.
+        """
+        kw = dict(
+            k=2,
+            min_shared=1,
+            max_postings=1000,
+            same_language=False,
+            inflation=2,
+            expansion=2,
+            max_steps=1000,
+            pruning=1e-4,
+            select=None,
+            recover=0,
+            external_scorer=False,
+            override=False,
+        )
+        kw.update(keywords)
+        if cluster_method not in ['single', 'mcl']:
+            raise ValueError(
+                "[!] The cluster method you selected is not available.")
+
+        idxA, idxB = self.get_candidates(
+            k=kw['k'], min_shared=kw['min_shared'],
+            max_postings=kw['max_postings'],
+            same_language=kw['same_language'])
+        function = self._distance_method(
+                method, scale=scale, factor=factor,
+                restricted_chars=restricted_chars, mode=mode, gop=gop,
+                restriction=restriction, external_scorer=kw['external_scorer'])
+
+        distances = np.zeros(len(idxA))
+        with util.pb(desc='CANDIDATE ALIGNMENT', total=len(idxA)) as progress:
+            for i, (x, y) in enumerate(zip(idxA.tolist(), idxB.tolist())):
+                progress.update(1)
+                try:
+                    distances[i] = function(x, y)
+                except ZeroDivisionError:
+                    distances[i] = 100
+        log.info("Aligned {0} candidate pairs.".format(len(idxA)))
+
+        keys = sorted(self)
+        positions = {key: i for i, key in enumerate(keys)}
+        posA = np.array([positions[x] for x in idxA.tolist()], dtype=int)
+        posB = np.array([positions[x] for x in idxB.tolist()], dtype=int)
+
+        if cluster_method == 'single':
+            keep = distances < threshold
+            clusters = clustering.connected_components(
+                len(keys), posA[keep], posB[keep])
+        else:
+            if not clustering.sparse:
+                raise ValueError(
+                    "The package scipy is needed to run this analysis.")
+            matrix = clustering.sparse.coo_matrix(
+                (1 - distances, (posA, posB)), shape=(len(keys), len(keys)))
+            flats = clustering.mcl(
+                1 - threshold, matrix, keys, max_steps=kw['max_steps'],
+                inflation=kw['inflation'], expansion=kw['expansion'],
+                logs=False, matrix_type='similarities', revert=True,
+                sparse_matrix=True, pruning=kw['pruning'],
+                select=kw['select'], recover=kw['recover'])
+            clusters = [flats[i] for i in range(len(keys))]
+
+        self.add_entries(
+                ref, dict(zip(keys, clusters)), util.identity,
+                override=kw['override'])
+
     def _get_distances(
             self, method, mode, scale, factor, gop, sample,
             edit_dist_normalized):
@@ -226,17 +226,15 @@ class Partial(LexStat):
                 for mode, gop, scale in kw['modes']:
                     pairs = self.pairs[tA, tB]
                     if kw['subset']:
-                        pairs = [
-                                pair for pair in pairs if pair in
-                                self.subsets[tA, tB]]
+                        pairs = self.subsets[tA, tB]
 
                     # threshold and preprocessing, make sure threshold is
                     # different from pre-processing threshold when
                     # preprocessing is set to false
                     if kw['preprocessing']:
-                        pairs = [pair for pair in pairs
-                                 if self[pair, kw['ref']][0] == self[
-                                     pair, kw['ref']][1]]
+                        pairs = pairs[np.array([
+                            a == b for a, b in self._get_pair_entries(
+                                pairs, kw['ref'])], dtype=bool)]
                         threshold = 10.0
                     else:
                         threshold = kw['threshold']
@@ -1,6 +1,7 @@
 """
 Module provides basic checks for wordlists.
 """
+import numpy as np
 import networkx as nx
 from networkx.algorithms.clique import find_cliques
 from itertools import combinations
@@ -23,6 +24,61 @@ def _get_concepts(wordlist, concepts):
     return {c: set(wordlist.get_list(col=c, flat=True, entry=concepts)) for c in
         wordlist.cols}
 
+def _coverage_matrix(wordlist, concepts):
+    """
+    Return a boolean matrix of concepts by languages in the order of the cols.
+    """
+    if wordlist._alias.get(concepts) == wordlist._row_name:
+        return wordlist.get_coverage_matrix().astype(bool)
+    positions = wordlist._get_col_positions()
+    concept_idx, cells = {}, set()
+    for idx, concept, language in wordlist.iter_rows(
+            concepts, wordlist._col_name):
+        cells.add((concept_idx.setdefault(concept, len(concept_idx)),
+                   positions[language]))
+    matrix = np.zeros((len(concept_idx), wordlist.width), dtype=bool)
+    if cells:
+        matrix[tuple(zip(*cells))] = True
+    return matrix
+
+
+def mutual_coverage_matrix(wordlist, concepts='concept'):
+    """Compute the number of concepts shared by all language pairs.
+
+    Parameters
+    ----------
+    wordlist : ~lingpy.basic.wordlist.Wordlist
+        Your Wordlist object (or a descendant class).
+    concepts : str (default="concept")
+        The column which stores your concepts.
+
+    Returns
+    -------
+    matrix : numpy.ndarray
+        A square integer matrix in the order of the languages of the wordlist
+        (see :py:attr:`~lingpy.basic.wordlist.Wordlist.cols`), whose cells
+        contain the number of concepts two languages share, with the number
+        of concepts of each language in the diagonal.
+
+    Notes
+    -----
+    The matrix is computed as the product of a boolean matrix of concepts by
+    languages with its transpose, which is considerably faster than
+    intersecting the concept sets of all language pairs.
+
+    See also
+    --------
+    mutual_coverage
+    mutual_coverage_check
+    """
+    matrix = _coverage_matrix(wordlist, concepts).astype(np.float32)
+    return (matrix.T @ matrix).round().astype(int)
+
+
+def _off_diagonal(matrix):
+    return matrix[np.triu_indices(len(matrix), k=1)]
+
+
 def mutual_coverage(wordlist, concepts='concept'):
     """Compute mutual coverage for all language pairs in your data.
     
@@ -36,7 +92,7 @@ def mutual_coverage(wordlist, concepts='concept'):
     Returns
     -------
     coverage : dict
-        A dictionary of dictionaries whose value is the number of items two
+        A dictionary of dictionaries whose value is the set of concepts two
         languages share.
 
     Examples
@@ -49,11 +105,12 @@ def mutual_coverage(wordlist, concepts='concept'):
       >>> from lingpy.tests.util import test_data
       >>> wl = Wordlist(test_data('KSL.qlc'))
       >>> cov = mutual_coverage(wl)
-      >>> cov['English']['German']
+      >>> len(cov['English']['German'])
       200
 
     See also
     --------
+    mutual_coverage_matrix
     mutual_coverage_check
     mutual_coverage_subset
     average_coverage
@@ -103,13 +160,33 @@ def mutual_coverage_check(wordlist, threshold, concepts='concept'):
     mutual_coverage_subset
     average_coverage
     """
-    mc = mutual_coverage(wordlist, concepts)
-    for coverage in mc.values():
-        if [x for x in coverage if len(coverage[x]) < threshold]:
-            return False
-    return True
+    coverage = _off_diagonal(mutual_coverage_matrix(wordlist, concepts))
+    return not coverage.size or coverage.min() >= threshold
+
 
-def mutual_coverage_subset(wordlist, threshold, concepts='concept'):
+def _greedy_clique(edges):
+    """
+    Search a large clique by adding the node with most candidates in turn.
+
+    Notes
+    -----
+    The number of neighbours of each node among the remaining candidates is
+    updated incrementally by subtracting the edges to the nodes which are
+    discarded in each step, so that each node is only discarded once.
+    """
+    clique, candidates = [], np.ones(len(edges), dtype=bool)
+    counts = edges.sum(1)
+    while candidates.any():
+        best = int(np.argmax(np.where(candidates, counts, -1)))
+        clique.append(best)
+        discarded = candidates & ~edges[best]
+        candidates &= edges[best]
+        counts -= edges[:, discarded].sum(1)
+    return clique
+
+
+def mutual_coverage_subset(wordlist, threshold, concepts='concept',
+                           greedy=False):
     """Compute maximal mutual coverage for all language in a wordlist.
     
     Parameters
@@ -120,6 +197,11 @@ def mutual_coverage_subset(wordlist, threshold, concepts='concept'):
         The column which stores your concepts.
     threshold : int
         The threshold which should be checked.  
+    greedy : bool (default=False)
+        Instead of searching all maximal cliques of languages, which can take
+        very long for large datasets, search one large clique by adding the
+        language which shares the threshold with most of the remaining
+        candidates in turn.
 
     Returns
     -------
@@ -148,30 +230,40 @@ def mutual_coverage_subset(wordlist, threshold, concepts='concept'):
     mutual_coverage_check
     average_coverage
     """
-    coverage = mutual_coverage(wordlist, concepts)
+    coverage = mutual_coverage_matrix(wordlist, concepts)
+    edges = coverage >= threshold
+    np.fill_diagonal(edges, False)
+
+    def average(clique):
+        sub = coverage[np.ix_(clique, clique)]
+        return int(_off_diagonal(sub).mean() + 0.5)
+
+    if greedy:
+        clique = _greedy_clique(edges)
+        if len(clique) < 2:
+            return 0, []
+        return len(clique), [
+            (average(clique), sorted(wordlist.cols[i] for i in clique))]
 
     G = nx.Graph()
-    for tax in wordlist.cols:
-        G.add_node(tax)
-    for taxA, taxB in combinations(wordlist.cols, r=2):
-        if len(coverage[taxA][taxB]) >= threshold:
-            G.add_edge(taxA, taxB, coverage=coverage[taxA][taxB])
+    G.add_nodes_from(wordlist.cols)
+    G.add_edges_from(
+        (wordlist.cols[i], wordlist.cols[j])
+        for i, j in zip(*np.nonzero(np.triu(edges))))
     
+    index = {tax: i for i, tax in enumerate(wordlist.cols)}
     best_cliques = defaultdict(list)
     best_clique = 0
     for clique in find_cliques(G):
-        sums = []
-        for taxA, taxB in combinations(clique, r=2):
-            sums += [len(G[taxA][taxB]['coverage'])]
-        if sums:
-            val = int(sum(sums) / len(sums) + 0.5)
-            best_cliques[len(clique)] += [(val, sorted(clique))]
+        if len(clique) > 1:
+            best_cliques[len(clique)] += [
+                (average([index[tax] for tax in clique]), sorted(clique))]
             if len(clique) > best_clique:
                 best_clique = len(clique)
     return best_clique, best_cliques[best_clique]
 
 
-def average_coverage(wordlist, concepts='concepts'):
+def average_coverage(wordlist, concepts='concept'):
     """Compute average mutual coverage for a given wordlist.
     
     Parameters
@@ -183,9 +275,9 @@ def average_coverage(wordlist, concepts='concepts'):
 
     Returns
     -------
-    coverage : dict
-        A dictionary of dictionaries whose value is the number of items two
-        languages share.
+    coverage : float
+        The average number of concepts shared by all language pairs, divided
+        by the number of concepts in the wordlist.
 
     Examples
     --------
@@ -206,12 +298,8 @@ def average_coverage(wordlist, concepts='concepts'):
     mutual_coverage
 
     """
-    mc = mutual_coverage(wordlist)
-    score = []
-    for v in mc.values():
-        for key, val in v.items():
-            score += [len(val)]
-    return sum(score) / len(score) / wordlist.height
+    coverage = _off_diagonal(mutual_coverage_matrix(wordlist, concepts))
+    return coverage.sum() / coverage.size / wordlist.height
 
 
 def synonymy(wordlist, concepts='concept', languages='doculect'):
@@ -250,6 +338,15 @@ def synonymy(wordlist, concepts='concept', languages='doculect'):
     synonyms.
     """
     synonyms = defaultdict(int)
+    if (wordlist._alias.get(concepts), wordlist._alias.get(languages)) == (
+            wordlist._row_name, wordlist._col_name):
+        # the counts can be read directly from the word list
+        for concept, entries in wordlist._dict.items():
+            for language, idxs in entries.items():
+                if idxs:
+                    synonyms[language, concept] = len(idxs)
+        return synonyms
+
     for idx, language, concept in wordlist.iter_rows(languages, concepts):
         synonyms[language, concept] += 1
 
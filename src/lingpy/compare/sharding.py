@@ -0,0 +1,214 @@
+"""
+Process large wordlists in shards of concepts.
+
+Since cognate detection, alignment, and the computation of consensus strings
+are carried out for each concept independently, a wordlist can be split into
+shards of concepts which are processed one after the other, or in parallel,
+so that only the data of one shard needs to be held in memory by each
+process. The shards are stored on disk as binary snapshots (see
+:py:meth:`~lingpy.basic.wordlist.Wordlist.save_snapshot`).
+"""
+from pathlib import Path
+
+from lingpy.basic.wordlist import Wordlist
+from lingpy.compare.lexstat import LexStat
+from lingpy.align.sca import Alignments
+from lingpy import util
+from lingpy import log
+
+
+def split_wordlist(wordlist, path, size=100, langid='langid', compressed=False):
+    """
+    Split a wordlist into shards of concepts stored on disk.
+
+    Parameters
+    ----------
+    wordlist : ~lingpy.basic.wordlist.Wordlist
+        The wordlist, or one of its daughter classes.
+    path : str
+        The directory in which the shards are stored, which is created if it
+        does not exist.
+    size : int (default=100)
+        The maximal number of concepts in one shard.
+    langid : str (default="langid")
+        The column storing the numerical identifiers of the languages, which
+        is added to the shards if it is missing in the wordlist.
+    compressed : bool (default=False)
+        Compress the snapshot files of the shards.
+
+    Returns
+    -------
+    filenames : list
+        The names of the snapshot files of the shards.
+
+    Notes
+    -----
+    The identifiers of the languages are assigned with respect to all
+    languages of the wordlist, in the same way as they are assigned by
+    :py:class:`~lingpy.compare.lexstat.LexStat`, so that a scorer computed
+    for the whole wordlist can be used in all shards.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    langids = {col: str(i + 1) for i, col in enumerate(wordlist.cols)}
+
+    filenames = []
+    with util.pb(desc='SPLITTING WORDLIST', total=len(wordlist.rows)) as progress:
+        for i in range(0, len(wordlist.rows), size):
+            shard = wordlist.view(rows=wordlist.rows[i:i + size])
+            if langid not in shard.header:
+                shard.add_entries(
+                    langid, shard._col_name, lambda x: langids[x])
+            filename = str(path / 'shard-{0:05d}.npz'.format(i // size + 1))
+            shard.save_snapshot(filename, compressed=compressed)
+            filenames.append(filename)
+            progress.update(len(shard.rows))
+    return filenames
+
+
+def _process_shard(filename, scorer, kw):
+    """
+    Cluster, align, and compute consensus strings for one shard.
+    """
+    shard = Wordlist.load_snapshot(filename)
+    lex = shard.view(cls=LexStat, **kw['lexstat'])
+    del shard
+    if scorer is not None:
+        lex.cscorer = lex._meta['scorer']['cscorer'] = scorer
+    lex.cluster(
+        method=kw['method'], threshold=kw['threshold'], ref=kw['ref'],
+        override=True, **kw['cluster'])
+    out = {kw['ref']: {key: lex[key, kw['ref']] for key in lex}}
+
+    if kw['align'] or kw['consensus']:
+        alm = lex.view(cls=Alignments, ref=kw['ref'])
+        del lex
+        alm.align(**kw['align_kw'])
+        columns = ['alignment']
+        if kw['consensus']:
+            alm.get_consensus(ref=kw['ref'])
+            columns.append('consensus')
+        # sequences are returned as plain lists, which can be pickled
+        for column in columns:
+            out[column] = {
+                key: list(alm[key, column])
+                if isinstance(alm[key, column], list) else alm[key, column]
+                for key in alm}
+    return out
+
+
+def process_shards(
+        filenames,
+        method='lexstat',
+        threshold=0.6,
+        ref='',
+        scorer=None,
+        align=False,
+        consensus=False,
+        processes=1,
+        lexstat=None,
+        align_kw=None,
+        **keywords):
+    """
+    Run cognate detection, alignment, and consensus computation on shards.
+
+    Parameters
+    ----------
+    filenames : list
+        The snapshot files of the shards, as returned by
+        :py:func:`~lingpy.compare.sharding.split_wordlist`.
+    method : str (default="lexstat")
+        The method passed to
+        :py:meth:`~lingpy.compare.lexstat.LexStat.cluster`.
+    threshold : float (default=0.6)
+        The threshold for the clustering.
+    ref : str (default="")
+        The column in which the cognate identifiers are stored, defaults to
+        the method name followed by "id".
+    scorer : ~lingpy.algorithm.cython.misc.ScoreDict (default=None)
+        The scorer which is shared by all shards and which is required for
+        the "lexstat" method, usually the attribute *cscorer* of a
+        :py:class:`~lingpy.compare.lexstat.LexStat` object.
+    align : bool (default=False)
+        Align the words in each cognate set, see
+        :py:meth:`~lingpy.align.sca.Alignments.align`.
+    consensus : bool (default=False)
+        Compute consensus strings of the cognate sets, which implies
+        *align*, see :py:meth:`~lingpy.align.sca.Alignments.get_consensus`.
+    processes : int (default=1)
+        The number of processes among which the shards are distributed.
+    lexstat : dict (default=None)
+        Keywords passed to :py:class:`~lingpy.compare.lexstat.LexStat` when
+        the shards are loaded.
+    align_kw : dict (default=None)
+        Keywords passed to :py:meth:`~lingpy.align.sca.Alignments.align`.
+
+    Returns
+    -------
+    results : dict
+        A dictionary with the column names as keys and dictionaries from the
+        IDs of the words to the values as values, containing the cognate
+        identifiers, and, if computed, the alignments (in the column
+        "alignment") and the consensus strings (in the column "consensus"),
+        with sequences given as plain lists.
+
+    Notes
+    -----
+    All further keywords are passed to
+    :py:meth:`~lingpy.compare.lexstat.LexStat.cluster`. The cognate
+    identifiers of each shard are renumbered, so that they are unique across
+    all shards. Since a scorer is used for all shards, it can be computed for
+    the complete wordlist in advance, or only for a sample of its concepts,
+    in which case characters missing from the sample obtain the lowest
+    score.
+
+    Examples
+    --------
+    Split a wordlist into shards of 50 concepts and cluster them::
+
+        >>> from lingpy.compare.sharding import split_wordlist, process_shards
+        >>> lex = LexStat(test_data('KSL.qlc'))
+        >>> lex.get_scorer()
+        >>> shards = split_wordlist(lex, 'shards', size=50)
+        >>> results = process_shards(shards, scorer=lex.cscorer)
+        >>> lex.add_entries(
+        ...     'lexstatid', results['lexstatid'], lambda x: x, override=True)
+    """
+    if method == 'lexstat' and scorer is None:
+        raise ValueError("The lexstat method requires a scorer.")
+    ref = ref or method + 'id'
+    kw = dict(
+        method=method,
+        threshold=threshold,
+        ref=ref,
+        align=align,
+        consensus=consensus,
+        lexstat=lexstat or {},
+        align_kw=align_kw or {},
+        cluster=keywords)
+
+    results = _merge_shards(
+        util.parallel_map(_process_shard, filenames, processes, (scorer, kw)),
+        ref, len(filenames))
+    log.info("Processed {0} shards.".format(len(filenames)))
+    return results
+
+
+def _merge_shards(runs, ref, total):
+    """
+    Merge the results of the shards, renumbering the cognate identifiers.
+    """
+    results, offset = {}, 0
+    with util.pb(desc='SHARDED PROCESSING', total=total) as progress:
+        for run in runs:
+            cogids = run.pop(ref)
+            converter = {
+                cogid: offset + i + 1 for i, cogid in enumerate(
+                    sorted(set(cogids.values())))}
+            offset += len(converter)
+            results.setdefault(ref, {}).update(
+                (key, converter[cogid]) for key, cogid in cogids.items())
+            for column, values in run.items():
+                results.setdefault(column, {}).update(values)
+            progress.update(1)
+    return results
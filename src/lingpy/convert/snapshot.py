@@ -0,0 +1,435 @@
+"""
+Binary snapshots of word lists and their daughter classes.
+
+A snapshot is a single NumPy ``.npz`` file. The cells of the word list are
+stored column-wise as arrays, the header, the aliases, the metadata, and all
+further attributes of the object, such as index structures or scorers, are
+stored in a JSON document, which refers to additional arrays for large
+numerical data.
+"""
+import os
+import json
+import functools
+from collections import Counter, defaultdict
+from itertools import chain
+
+import numpy as np
+
+from lingpy import basictypes
+from lingpy import log
+from lingpy import util
+from lingpy.algorithm import misc
+from lingpy.basic.parser import read_conf
+from lingpy.basic.tree import Tree
+from lingpy.data.model import Model
+from lingpy.settings import rcParams
+from lingpy.thirdparty.cogent import LoadTree, PhyloNode
+
+FORMAT = 'lingpy-snapshot'
+VERSION = 1
+
+# types which can be restored by name
+_TYPES = {t.__name__: t for t in [int, float, str, bool, list, tuple, dict]}
+_FACTORIES = {t.__name__: t for t in [int, float, str, list, dict, set]}
+_BASICTYPES = {
+    'strings': basictypes.strings,
+    'ints': basictypes.ints,
+    'floats': basictypes.floats,
+}
+
+# sequences which are stored column-wise, along with their constructors
+_SEQUENCES = {
+    'list': list,
+    'tuple': tuple,
+    'strings': basictypes.strings,
+    'ints': basictypes.ints,
+    'floats': basictypes.floats,
+    'aligned': basictypes.aligned,
+}
+
+# attributes which are restored without being stored
+_SKIP = {'log', '_class', '_cache', '_data', '_shared'}
+
+
+def _sequence_type(value):
+    """
+    Return the name of the type of a sequence stored column-wise.
+    """
+    if type(value) in (list, tuple):
+        return type(value).__name__
+    if type(value) is basictypes.aligned:
+        return 'aligned'
+    if type(value) is basictypes.lists:
+        return 'lists:' + value.sep
+    if type(value) is basictypes._strings:
+        return {str: 'strings', int: 'ints', float: 'floats'}.get(value._type)
+
+
+class _Encoder(object):
+    """
+    Convert Python objects to JSON, storing arrays separately.
+    """
+    def __init__(self):
+        self.arrays = {}
+        self.strings = {}
+        self.objects = {}
+
+    def shared(self, obj):
+        """
+        Encode an object which may be referenced more than once.
+        """
+        if obj is None or isinstance(obj, (bool, int, float, str, tuple)):
+            return self(obj)
+        if id(obj) in self.objects:
+            return {'__ref__': self.objects[id(obj)][0]}
+        self.objects[id(obj)] = (len(self.objects), obj)
+        return {'__id__': self.objects[id(obj)][0], 'value': self.scorer(
+            obj) if isinstance(obj, misc.ScoreDict) else self(obj)}
+
+    def scorer(self, obj):
+        chars = sorted(obj.chars2int, key=lambda x: obj.chars2int[x])
+        matrix = obj.matrix
+        if not isinstance(matrix, np.ndarray):
+            types = set(map(type, chain(*matrix)))
+            if types in ({int}, {float}):
+                return {'__scoredict__': chars, 'matrix': {
+                    '__matrix__': self.array(np.array(
+                        matrix, dtype=types.pop()).reshape(len(matrix), -1))}}
+        return {'__scoredict__': chars, 'matrix': self(matrix)}
+
+    def array(self, array):
+        name = 'array.{0}'.format(len(self.arrays))
+        self.arrays[name] = array
+        return name
+
+    def string(self, string):
+        return self.strings.setdefault(string, len(self.strings))
+
+    def __call__(self, obj):
+        if obj is None or isinstance(obj, (bool, int, float, str)):
+            return obj
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.kind not in 'biuf':
+                raise TypeError('Cannot store arrays of type {0}.'.format(
+                    obj.dtype))
+            return {'__array__': self.array(obj)}
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, basictypes.lists):
+            return {'__lists__': list(obj), 'sep': obj.sep}
+        if isinstance(obj, basictypes._strings):
+            return {'__sequence__': _sequence_type(obj), 'items': [
+                self(x) for x in obj]}
+        if type(obj) is list:
+            return [self(x) for x in obj]
+        if type(obj) is tuple:
+            return {'__tuple__': [self(x) for x in obj]}
+        if isinstance(obj, (set, frozenset)):
+            return {'__set__': [self(x) for x in obj]}
+        if isinstance(obj, Counter):
+            return {'__counter__': self.items(obj)}
+        if isinstance(obj, defaultdict):
+            if obj.default_factory not in _FACTORIES.values():
+                raise TypeError('Cannot store default dictionaries of type '
+                                '{0}.'.format(obj.default_factory))
+            return {'__defaultdict__': obj.default_factory.__name__,
+                    'items': self.items(obj)}
+        if type(obj) is dict:
+            if all(isinstance(k, str) and not k.startswith('__') for k in obj):
+                return {k: self(v) for k, v in obj.items()}
+            return {'__dict__': self.items(obj)}
+        if isinstance(obj, misc.ScoreDict):
+            return self.shared(obj)
+        if isinstance(obj, Model):
+            return {'__model__': obj.name}
+        if isinstance(obj, PhyloNode):
+            return {'__tree__': obj.getNewick(with_distances=True),
+                    'class': 'Tree' if isinstance(obj, Tree) else 'PhyloNode'}
+        if isinstance(obj, type) and obj in _TYPES.values():
+            return {'__type__': obj.__name__}
+        if isinstance(obj, functools.partial):
+            for name, value in _BASICTYPES.items():
+                if obj.func is value.func and obj.args == value.args:
+                    return {'__basictype__': name}
+        raise TypeError('Cannot store objects of type {0}.'.format(
+            type(obj).__name__))
+
+    def items(self, obj):
+        return [[self(k), self(v)] for k, v in obj.items()]
+
+
+class _Decoder(object):
+    """
+    Restore the Python objects converted by the encoder.
+
+    Notes
+    -----
+    The decoder is passed as *object_hook* to :py:func:`json.loads`, so it
+    is called for each JSON object, after its values have been decoded.
+    """
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.objects = {}
+
+    def __call__(self, obj):
+        if '__id__' in obj:
+            self.objects[obj['__id__']] = obj['value']
+            return obj['value']
+        if '__ref__' in obj:
+            return self.objects[obj['__ref__']]
+        if '__array__' in obj:
+            return self.arrays[obj['__array__']]
+        if '__matrix__' in obj:
+            return self.arrays[obj['__matrix__']].tolist()
+        if '__lists__' in obj:
+            return basictypes.lists(obj['__lists__'], sep=obj['sep'])
+        if '__sequence__' in obj:
+            return _SEQUENCES[obj['__sequence__']](obj['items'])
+        if '__tuple__' in obj:
+            return tuple(obj['__tuple__'])
+        if '__set__' in obj:
+            return set(obj['__set__'])
+        if '__counter__' in obj:
+            return Counter(dict(obj['__counter__']))
+        if '__defaultdict__' in obj:
+            return defaultdict(
+                _FACTORIES[obj['__defaultdict__']], obj['items'])
+        if '__dict__' in obj:
+            return dict(obj['__dict__'])
+        if '__scoredict__' in obj:
+            return misc.ScoreDict(obj['__scoredict__'], obj['matrix'])
+        if '__model__' in obj:
+            model = rcParams.get(obj['__model__'])
+            return model if isinstance(model, Model) else Model(
+                obj['__model__'])
+        if '__tree__' in obj:
+            if obj['class'] == 'Tree':
+                return Tree(obj['__tree__'])
+            return LoadTree(treestring=obj['__tree__'])
+        if '__type__' in obj:
+            return _TYPES[obj['__type__']]
+        if '__basictype__' in obj:
+            return _BASICTYPES[obj['__basictype__']]
+        return obj
+
+
+def _encode_column(cells, encoder):
+    """
+    Store the cells of one column as arrays.
+
+    Returns
+    -------
+    spec, arrays : tuple
+        A JSON-compatible description of the column and a dictionary of
+        arrays.
+    """
+    types = set(map(type, cells))
+    if types == {str}:
+        return {'kind': 'str'}, {'codes': np.array(
+            [encoder.string(c) for c in cells], dtype=np.int64)}
+    if types in ({int}, {float}):
+        values = np.array(cells)
+        if values.dtype.kind in 'if':
+            return {'kind': types.pop().__name__}, {'values': values}
+    sequences = set(map(_sequence_type, cells))
+    elements = set(map(type, chain(*cells))) \
+        if None not in sequences else set()
+    if len(sequences) == 1 and None not in sequences and (
+            len(elements) <= 1 and elements <= {str, int, float}):
+        element = elements.pop() if elements else int
+        values = list(chain(*cells))
+        if element is str:
+            values = [encoder.string(v) for v in values]
+        return {'kind': 'sequence', 'type': sequences.pop(),
+                'elements': element.__name__}, {
+            'values': np.array(
+                values, dtype=np.float64 if element is float else np.int64),
+            'offsets': np.cumsum(
+                [0] + [len(c) for c in cells], dtype=np.int64)}
+    return {'kind': 'json'}, {'codes': np.array([encoder.string(json.dumps(
+        [encoder(c) for c in cells]))], dtype=np.int64)}
+
+
+def _decode_column(spec, arrays, strings, decoder):
+    """
+    Restore the cells of one column.
+    """
+    if spec['kind'] == 'str':
+        return strings[arrays['codes']].tolist()
+    if spec['kind'] in ('int', 'float'):
+        return arrays['values'].tolist()
+    if spec['kind'] == 'json':
+        return json.loads(strings[arrays['codes'][0]], object_hook=decoder)
+    values = arrays['values']
+    values = strings[values].tolist() if spec['elements'] == 'str' else \
+        values.tolist()
+    offsets = arrays['offsets'].tolist()
+    if spec['type'].startswith('lists:'):
+        sep = spec['type'][6:]
+        return [basictypes.lists(values[a:b], sep=sep) for a, b in zip(
+            offsets, offsets[1:])]
+    factory = _SEQUENCES[spec['type']]
+    return [factory(values[a:b]) for a, b in zip(offsets, offsets[1:])]
+
+
+def to_snapshot(wordlist, filename, compressed=False):
+    """
+    Write a word list or one of its daughter classes to a binary snapshot.
+
+    Parameters
+    ----------
+    wordlist : ~lingpy.basic.wordlist.Wordlist
+        The word list which will be stored.
+    filename : str
+        The name of the file, to which the extension ".npz" is added if it is
+        missing.
+    compressed : bool (default=False)
+        Compress the arrays in the file.
+
+    Notes
+    -----
+    Attributes which cannot be stored, such as functions passed by the user,
+    are skipped with a warning.
+    """
+    encoder = _Encoder()
+    arrays = {}
+
+    # objects shared by attributes and metadata, like scorers, are stored
+    # only once, so that they are still identical after loading
+    attributes = {}
+    for name, value in wordlist.__dict__.items():
+        if name in _SKIP:
+            continue
+        if name == '_meta':
+            meta = []
+            for key, entry in value.items():
+                try:
+                    meta.append([encoder(key), encoder.shared(entry)])
+                except TypeError as e:
+                    log.warning('Skipping metadata {0}: {1}'.format(key, e))
+            attributes[name] = {'__dict__': meta}
+            continue
+        try:
+            attributes[name] = encoder.shared(value)
+        except TypeError as e:
+            log.warning('Skipping attribute {0}: {1}'.format(name, e))
+
+    keys = sorted(wordlist._data)
+    columns = []
+    for i in range(len(wordlist.header)):
+        spec, data = _encode_column(
+            [wordlist._data[k][i] for k in keys], encoder)
+        columns.append(spec)
+        for name, array in data.items():
+            arrays['column.{0}.{1}'.format(i, name)] = array
+    arrays['keys'] = np.array(keys, dtype=np.int64)
+
+    header = json.dumps(dict(
+        format=FORMAT,
+        version=VERSION,
+        cls='{0}.{1}'.format(
+            wordlist.__class__.__module__, wordlist.__class__.__qualname__),
+        columns=columns,
+        classes={k: wordlist._class_string.get(k, 'str')
+                 for k in wordlist._class}))
+    strings = list(encoder.strings)
+    arrays['strings'] = np.frombuffer(
+        ''.join(strings).encode('utf-8'), dtype=np.uint8)
+    arrays['strings.offsets'] = np.cumsum(
+        [0] + [len(s) for s in strings], dtype=np.int64)
+    arrays['header'] = np.frombuffer(header.encode('utf-8'), dtype=np.uint8)
+    arrays['attributes'] = np.frombuffer(
+        json.dumps(attributes).encode('utf-8'), dtype=np.uint8)
+    arrays.update(encoder.arrays)
+
+    (np.savez_compressed if compressed else np.savez)(filename, **arrays)
+
+
+def _get_classes(class_strings):
+    """
+    Restore the functions which convert the values of each column.
+
+    Notes
+    -----
+    Only the functions defined in the configuration files of LingPy are
+    restored, since the strings would otherwise have to be evaluated.
+    Unknown functions are replaced by :py:class:`str`.
+    """
+    known = {}
+    for name in os.listdir(util.data_path('conf')):
+        if name.endswith('.rc'):
+            _, classes, strings, _ = read_conf(util.data_path('conf', name))
+            known.update((strings[k], classes[k]) for k in strings)
+    return {k: known.get(v, str) for k, v in class_strings.items()}
+
+
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        for c in _subclasses(subclass):
+            yield c
+
+
+def from_snapshot(filename, cls):
+    """
+    Load a word list or one of its daughter classes from a binary snapshot.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the snapshot file.
+    cls : type
+        The class of the object which is loaded. If the snapshot was written
+        from a daughter class of *cls*, an instance of this class is returned.
+
+    Returns
+    -------
+    wordlist : ~lingpy.basic.wordlist.Wordlist
+        The restored word list, which is created without parsing the data
+        again.
+    """
+    with np.load(filename, allow_pickle=False) as npz:
+        header = json.loads(npz['header'].tobytes().decode('utf-8'))
+        if header.get('format') != FORMAT:
+            raise ValueError('{0} is not a snapshot file.'.format(filename))
+        if header['version'] > VERSION:
+            raise ValueError(
+                'Snapshot version {0} is not supported, please update '
+                'LingPy.'.format(header['version']))
+        for target in _subclasses(cls):
+            if '{0}.{1}'.format(
+                    target.__module__, target.__qualname__) == header['cls']:
+                break
+        else:
+            raise ValueError('The snapshot contains a {0} object, which is '
+                             'not a {1} object.'.format(
+                                 header['cls'], cls.__name__))
+
+        text = npz['strings'].tobytes().decode('utf-8')
+        offsets = npz['strings.offsets'].tolist()
+        strings = np.array(
+            [text[a:b] for a, b in zip(offsets, offsets[1:])], dtype=object)
+        arrays = {name: npz[name] for name in npz.files
+                  if name.startswith('array.')}
+        decoder = _Decoder(arrays)
+        attributes = json.loads(
+            npz['attributes'].tobytes().decode('utf-8'), object_hook=decoder)
+
+        columns = []
+        for i, spec in enumerate(header['columns']):
+            prefix = 'column.{0}.'.format(i)
+            columns.append(_decode_column(
+                spec,
+                {name[len(prefix):]: npz[name] for name in npz.files
+                 if name.startswith(prefix)},
+                strings,
+                decoder))
+        keys = npz['keys'].tolist()
+
+    wordlist = target.__new__(target)
+    wordlist.__dict__.update(attributes)
+    wordlist._data = {k: list(row) for k, row in zip(keys, zip(*columns))}
+    wordlist._class = _get_classes(header['classes'])
+    wordlist._cache = {}
+    wordlist.log = log.get_logger()
+    return wordlist
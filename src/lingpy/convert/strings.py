@@ -298,10 +298,11 @@ def pap2nex(
     # create the matrix
     matrix = ""
 
-    for i, taxon in enumerate(taxa):
+    columns = list(zip(*new_paps)) or [[] for taxon in taxa]
+    for taxon, column in zip(taxa, columns):
         tmp = '{0:XXX} '
         matrix += tmp.replace('XXX', str(maxTax)).format(taxon)
-        matrix += ''.join([str(itm[i]) for itm in new_paps])
+        matrix += ''.join([str(itm) for itm in column])
         matrix += '\n'
 
     if not filename:
@@ -35,6 +35,8 @@ from copy import copy
 from heapq import heappush, heappop
 from itertools import combinations, chain
 
+import numpy as np
+
 
 def swap(a,b):
     if a > b:
@@ -171,3 +173,150 @@ def similarities_weighted(adj, ij2wij):
                 S = ai_dot_aj / (n2a_sqrd[i]+n2a_sqrd[j]-ai_dot_aj) # tanimoto similarity
                 heappush( min_heap, (1-S,edge_pair) )
     return [ heappop(min_heap) for i in range(len(min_heap)) ] # return ordered edge pairs
+
+
+# the following class was added for lingpy (JML), it carries out the same
+# analysis on integer edge ids with NumPy arrays and a union-find structure
+
+
+class ArrayHLC:
+    """
+    Hierarchical link clustering on integer edge identifiers.
+
+    Nodes are given as integers from 0 to size - 1, and edges are given as
+    two arrays of end points, with the edge identifier being the position in
+    the arrays. If weights are passed, the weighted version of the algorithm
+    is carried out.
+    """
+    def __init__(self, size, rows, cols, weights=None):
+        self.size = size
+        self.rows = np.asarray(rows, dtype=int)
+        self.cols = np.asarray(cols, dtype=int)
+        self.weights = None if weights is None else np.asarray(
+                weights, dtype=float)
+        self.Mfactor = 2.0 / len(self.rows)
+        self.D = 0.0
+
+    def similarities(self):
+        """
+        Get the similarities of all pairs of edges sharing a node.
+
+        Returns three arrays with the first and the second edge of each pair
+        and one minus the similarity of the pair.
+        """
+        ids = np.tile(np.arange(len(self.rows)), 2)
+        ends = np.concatenate([self.rows, self.cols])
+        others = np.concatenate([self.cols, self.rows])
+        order = np.argsort(ends, kind='stable')
+        ids, ends, others = ids[order], ends[order], others[order]
+        starts = np.searchsorted(ends, np.arange(self.size + 1))
+        degree = np.diff(starts)
+
+        # inclusive adjacency, the tanimoto coefficient of the unweighted
+        # rows is the jaccard similarity of the inclusive neighbors
+        if self.weights is None:
+            adj = np.eye(self.size)
+            adj[self.rows, self.cols] = adj[self.cols, self.rows] = 1
+        else:
+            adj = np.zeros((self.size, self.size))
+            adj[self.rows, self.cols] = adj[self.cols, self.rows] = \
+                self.weights
+            nodes = np.arange(self.size)[degree > 0]
+            adj[nodes, nodes] = adj[nodes].sum(axis=1) / degree[nodes]
+
+        edgesA, edgesB, nodesA, nodesB = [], [], [], []
+        for n in np.arange(self.size)[degree > 1]:
+            i, j = np.triu_indices(degree[n], 1)
+            edges = ids[starts[n]:starts[n + 1]]
+            nodes = others[starts[n]:starts[n + 1]]
+            edgesA.append(edges[i])
+            edgesB.append(edges[j])
+            nodesA.append(nodes[i])
+            nodesB.append(nodes[j])
+        if not edgesA:
+            return np.array([], dtype=int), np.array([], dtype=int), \
+                np.array([])
+        nodesA, nodesB = np.concatenate(nodesA), np.concatenate(nodesB)
+
+        dots = (adj @ adj.T)[nodesA, nodesB]
+        squares = (adj ** 2).sum(axis=1)
+        sims = dots / (squares[nodesA] + squares[nodesB] - dots)
+        return np.concatenate(edgesA), np.concatenate(edgesB), 1 - sims
+
+    def single_linkage(self, threshold=None):
+        """
+        Merge the edge communities in the order of their similarity.
+
+        If a threshold is given, the merging stops with the first pair of
+        edges below the threshold, and the community of each edge is
+        returned along with the partition density. Otherwise, the best
+        partition is returned along with its similarity threshold, its
+        partition density, and the list of similarities and partition
+        densities, as with HLC.single_linkage.
+        """
+        edgesA, edgesB, omss = self.similarities()
+        parents = list(range(len(self.rows)))
+        nodes = [{i, j} for i, j in zip(self.rows.tolist(),
+                                         self.cols.tolist())]
+        links = [1 for i in range(len(self.rows))]
+
+        def find(node):
+            root = node
+            while parents[root] != root:
+                root = parents[root]
+            while parents[node] != root:
+                parents[node], node = root, parents[node]
+            return root
+
+        def merge(edge1, edge2):
+            cid1, cid2 = find(edge1), find(edge2)
+            if cid1 == cid2:
+                return
+            m1, m2 = links[cid1], links[cid2]
+            n1, n2 = len(nodes[cid1]), len(nodes[cid2])
+            if n2 > n1:  # merge smaller into larger node sets
+                cid1, cid2 = cid2, cid1
+            parents[cid2] = cid1
+            nodes[cid1] |= nodes[cid2]
+            nodes[cid2] = None
+            links[cid1] += links[cid2]
+            Dc12 = Dc(links[cid1], len(nodes[cid1]))
+            self.D = self.D + (Dc12 - Dc(m1, n1) - Dc(m2, n2)) * self.Mfactor
+
+        if threshold is not None:
+            if threshold:
+                keep = 1 - omss >= threshold
+                edgesA, edgesB = edgesA[keep], edgesB[keep]
+            for edge1, edge2 in zip(edgesA.tolist(), edgesB.tolist()):
+                merge(edge1, edge2)
+            return np.array([find(e) for e in range(len(parents))]), self.D
+
+        order = np.argsort(omss, kind='stable')
+        edgesA, edgesB = edgesA[order].tolist(), edgesB[order].tolist()
+        omss = omss[order].tolist()
+
+        self.list_D = [(1.0, 0.0)]
+        self.best_D = 0.0
+        self.best_S = 1.0
+        best_step = 0
+        S_prev = -1
+        for step, oms in enumerate(chain(omss, [1.0])):
+            S = 1 - oms
+            if S != S_prev:
+                if self.D >= self.best_D:
+                    self.best_D = self.D
+                    self.best_S = S
+                    best_step = step
+                self.list_D.append((S, self.D))
+                S_prev = S
+            if step < len(omss):
+                merge(edgesA[step], edgesB[step])
+
+        # replay the merges leading to the best partition
+        parents = list(range(len(self.rows)))
+        for edge1, edge2 in zip(edgesA[:best_step], edgesB[:best_step]):
+            cid1, cid2 = find(edge1), find(edge2)
+            if cid1 != cid2:
+                parents[cid2] = cid1
+        self.best_P = np.array([find(e) for e in range(len(parents))])
+        return self.best_P, self.best_S, self.best_D, self.list_D
@@ -1,10 +1,13 @@
 import io
+import gzip
 import operator
 import random
 import unicodedata
 import logging
 from tempfile import NamedTemporaryFile
 from functools import partial
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 import itertools
 import types
 from pathlib import Path
@@ -135,10 +138,11 @@ def lines_to_text(lines):
 
 
 class TextFile(object):
-    def __init__(self, path, log=True):
+    def __init__(self, path, log=True, compressed=False):
         self.path = path
         self.log = log
-        self.fp = io.open(_str_path(path, mkdir=True), "w", encoding="utf8")
+        self.fp = (gzip.open if compressed else io.open)(
+            _str_path(path, mkdir=True), "wt", encoding="utf8")
 
     def __enter__(self):
         return self.fp
@@ -299,3 +303,94 @@ def random_choices(population, weights=None, cum_weights=None, k=1):
     less_than = [[cw < r for cw in cum_weights] for r in rnd]
 
     return [population[lt.index(False)] for lt in less_than]
+
+
+_WORKER = {}
+
+
+def _init_worker(func, state):
+    _WORKER['func'] = func
+    _WORKER['state'] = state
+
+
+def _call_worker(item):
+    return _WORKER['func'](item, *_WORKER['state'])
+
+
+@contextmanager
+def worker_pool(func, processes=1, state=()):
+    """
+    Provide a function which maps items in a pool of worker processes.
+
+    Parameters
+    ----------
+    func : function
+        A function defined on module level, which is called with each item as
+        the first argument, followed by the values in *state*.
+    processes : int (default=1)
+        The number of worker processes. If it is smaller than 2, the items are
+        processed one after the other in the current process.
+    state : tuple (default=())
+        Further arguments of *func*, which are passed to each worker process
+        only once, when it is started.
+
+    Returns
+    -------
+    map : function
+        A function which takes an iterable of items and returns an iterator
+        over the results in the order of the items. The function can be called
+        several times while the context is open, so that the worker processes
+        are re-used.
+
+    See also
+    --------
+    parallel_map
+    """
+    if processes <= 1:
+        yield lambda items: (func(item, *state) for item in items)
+        return
+
+    with ProcessPoolExecutor(
+            processes, initializer=_init_worker,
+            initargs=(func, state)) as executor:
+        def map_items(items):
+            chunksize = 1
+            if hasattr(items, '__len__'):
+                chunksize = max(1, len(items) // (4 * processes))
+            return executor.map(_call_worker, items, chunksize=chunksize)
+        yield map_items
+
+
+def parallel_map(func, items, processes=1, state=()):
+    """
+    Map a function over items in a pool of worker processes.
+
+    Parameters
+    ----------
+    func : function
+        A function defined on module level, which is called with each item as
+        the first argument, followed by the values in *state*.
+    items : iterable
+        The items to be processed.
+    processes : int (default=1)
+        The number of worker processes. If it is smaller than 2, or if there
+        are less than two items, the items are processed one after the other
+        in the current process.
+    state : tuple (default=())
+        Further arguments of *func*, which are passed to each worker process
+        only once, when it is started.
+
+    Returns
+    -------
+    results : iterator
+        The results in the order of the items. The worker processes are shut
+        down when the iterator is exhausted.
+
+    See also
+    --------
+    worker_pool
+    """
+    if hasattr(items, '__len__') and len(items) < 2:
+        processes = 1
+    with worker_pool(func, processes, state) as map_items:
+        yield from map_items(items)
@@ -0,0 +1,56 @@
+import pytest
+from clldutils import jsonlib
+
+from lingpy.algorithm.benchmark import benchmark, bcubed_fscore, \
+    synthetic_matrix, wordlist_matrices
+
+
+def test_synthetic_matrix():
+    matrix, labels = synthetic_matrix(30, clusters=3, seed=1)
+    assert matrix.shape == (30, 30)
+    assert (matrix == matrix.T).all()
+    assert (matrix.diagonal() == 0).all()
+    assert set(labels) <= {1, 2, 3}
+    assert synthetic_matrix(30, clusters=3, seed=1)[1] == labels
+
+
+def test_bcubed_fscore():
+    assert bcubed_fscore([1, 1, 2], [3, 3, 4]) == 1.0
+    assert bcubed_fscore([1, 1, 2], [1, 2, 3]) < 1.0
+    assert bcubed_fscore([], []) == 1.0
+
+
+def test_wordlist_matrices(test_data):
+    matrices = wordlist_matrices(str(test_data / 'KSL.qlc'))
+    assert len(matrices) == 200
+    concept, matrix, labels = matrices[0]
+    assert len(matrix) == len(labels)
+
+
+def test_benchmark(tmp_path, mocker):
+    report = benchmark(
+        methods=['flat_upgma', 'fuzzy', 'mcl_sparse', 'link_clustering',
+                 'dbscan'],
+        sizes=(10, 20), repeats=1, filename=str(tmp_path / 'report.json'))
+    assert jsonlib.load(tmp_path / 'report.json') == report
+    results = {(r['dataset'], r['method']): r for r in report['results']}
+    assert len(results) == 10
+    upgma = results['synthetic-10', 'flat_upgma']
+    assert upgma['seconds'] <= upgma['mean_seconds']
+    assert upgma['peak_memory'] > 0
+    for method in ['flat_upgma', 'fuzzy', 'mcl_sparse', 'link_clustering']:
+        assert results['synthetic-20', method]['agreement'] == 1.0
+    assert 0 < results['synthetic-20', 'mcl_sparse']['accuracy'] <= 1
+
+    # a missing package is reported, while errors of the methods are raised
+    mocker.patch(
+        'lingpy.algorithm.benchmark.importlib.util.find_spec',
+        mocker.Mock(return_value=None))
+    report = benchmark(methods=['dbscan', 'single'], sizes=(10,), repeats=1)
+    assert 'not installed' in report['results'][0]['error']
+    assert 'agreement' not in report['results'][1]
+    mocker.patch.dict(
+        'lingpy.algorithm.benchmark.METHODS',
+        {'single': mocker.Mock(side_effect=ValueError)})
+    with pytest.raises(ValueError):
+        benchmark(methods=['single'], sizes=(10,), repeats=1)
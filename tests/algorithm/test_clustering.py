@@ -4,8 +4,10 @@ import pytest
 
 
 from lingpy.algorithm.clustering import best_threshold, check_taxon_names, \
-    find_threshold, flat_cluster, link_clustering, matrix2groups, matrix2tree, \
-    neighbor, partition_density, upgma
+    connected_components, find_threshold, find_thresholds, flat_cluster, \
+    link_clustering, matrix2groups, matrix2tree, mcl, neighbor, \
+    partition_densities, partition_density, upgma, _get_wad
+from lingpy.algorithm import squareform
 
 
 @pytest.fixture
@@ -48,6 +50,11 @@ def test_fuzzy(matrix, taxa):
         for revert in [True, False]:
             fuzzy(0.5, matrix, taxa, method=method, revert=revert)
 
+    clr = fuzzy(0.5, matrix, taxa)
+    assert sorted(sorted(c) for c in clr.values()) == [
+        ['Dutch', 'English'], ['Dutch', 'German'], ['Icelandic', 'Swedish']]
+    assert fuzzy(0.5, matrix, taxa, processes=2) == clr
+
 def test_matrix2tree(tmp_path, matrix, taxa):
     newick = tmp_path / 't'
     matrix2tree(matrix, taxa, filename=str(newick))
@@ -64,6 +71,32 @@ def test_matrix2groups(matrix, taxa):
         matrix2groups(0.5, matrix, taxa, cluster_method=method)
 
 
+def test_mcl(matrix, taxa):
+    clr = mcl(0.5, matrix, taxa)
+    assert sorted(clr.values()) == [
+        ['German', 'English', 'Dutch'], ['Swedish', 'Icelandic']]
+    clr = mcl(0.5, matrix, taxa, logs=lambda x: 1 - x, revert=True)
+    assert clr[0] == clr[3] == clr[4]
+
+    with pytest.raises(ValueError):
+        mcl(0.5, matrix, taxa, matrix_type='weights')
+
+    try:
+        from scipy import sparse
+    except ImportError:  # pragma: no cover
+        return
+
+    for mtx in [matrix, sparse.csr_matrix(matrix)]:
+        clr = mcl(0.5, mtx, taxa, sparse_matrix=True)
+        assert sorted(clr.values()) == [
+            ['German', 'English', 'Dutch'], ['Swedish', 'Icelandic']]
+    similarities = [[1 - cell for cell in row] for row in matrix]
+    clr = mcl(
+        0.5, similarities, taxa, matrix_type='similarities', revert=True,
+        sparse_matrix=True, select=2, recover=1)
+    assert clr[0] == clr[3] == clr[4] != clr[1] == clr[2]
+
+
 def test_link_clustering(matrix, taxa):
     similarity_matrix = [[1 - cell for cell in row] for row in matrix]
 
@@ -83,6 +116,21 @@ def test_link_clustering(matrix, taxa):
 
 def test_partition_density(matrix):
     partition_density(matrix, 0.5)
+    assert partition_density(matrix, 0.1) == (0.0, 5)
+    # densities computed with the original implementation
+    densities, components = zip(*partition_densities(
+        matrix, [0.9, 0.1, 0.5, 0.35, 0.7, 0.75]))
+    assert densities == pytest.approx([0.6, 0.0, 0.0, 0.0, 0.2, 0.3])
+    assert components == (1, 5, 2, 3, 1, 1)
+
+    matrix = squareform([
+        0.1, 0.2, 0.3, 0.7, 0.8, 0.9, 0.15, 0.25, 0.6, 0.75, 0.85, 0.35,
+        0.65, 0.7, 0.9, 0.2, 0.3, 0.4, 0.1, 0.45, 0.5])
+    densities, components = zip(*partition_densities(
+        matrix, [0.2, 0.3, 0.4, 0.5, 0.7, 0.9]))
+    assert densities == pytest.approx(
+        [0.0, 1 / 15, 4 / 15, 5 / 21, 8 / 21, 13 / 21])
+    assert components == (4, 2, 2, 1, 1, 1)
 
 
 def test_best_threshold(matrix):
@@ -95,6 +143,15 @@ def test_find_threshold(matrix):
     assert find_threshold([[0, 1], [1, 0]]) is None
 
 
+def test_find_thresholds(matrix):
+    matrices = [matrix, [[0, 1], [1, 0]], [], [row[:3] for row in matrix[:3]]]
+    thresholds = [find_threshold(m) for m in matrices]
+    assert find_thresholds(matrices) == thresholds
+    assert find_thresholds(matrices, chunksize=1) == thresholds
+    assert _get_wad(matrix, 0.5) == pytest.approx(0.36)
+    assert _get_wad(matrix, 0.1) is None
+
+
 def test_check_taxon_names():
     with pytest.raises(ValueError):
         check_taxon_names(['k,k'])
@@ -105,3 +162,8 @@ def test_flat_cluster(matrix, taxa):
         flat_cluster(method, 0.5, matrix, taxa, revert=True)
         flat_cluster(method, 0.5, matrix, taxa, revert=False)
         flat_cluster(method, 0.5, matrix, False, revert=False)
+
+
+def test_connected_components():
+    assert connected_components(5, [0, 3, 1], [1, 4, 0]) == [1, 1, 2, 3, 3]
+    assert connected_components(3, [], []) == [1, 2, 3]
@@ -41,6 +41,20 @@ def test_lib_align(msa):
     assert msa.alm_matrix[0] == list('w-aldemar-')
 
 
+def test_lib_align_sparse(seqs):
+    dense, sparse = Multiple(seqs), Multiple(seqs)
+    dense.lib_align()
+    sparse.lib_align(sparse=True)
+    assert sparse.alm_matrix == dense.alm_matrix
+    assert len(sparse.library) < len(dense.library)
+    for pair, score in dense.library.items():
+        assert sparse.library[pair] == pytest.approx(score)
+
+    partners = Multiple(seqs)
+    partners.lib_align(sparse=True, partners=1)
+    assert len(partners.library) <= len(sparse.library)
+
+
 def test_get_pid(msa):
     msa.prog_align()
     pid = int(msa.get_pid() * 100)
@@ -92,6 +106,22 @@ def test_iterate_clusters(msa):
     assert first == secnd
 
 
+def test_iterate_budget(msa):
+    msa.prog_align()
+    sop = msa.sum_of_pairs(gap_weight=1.0)
+
+    trajectory = msa.iterate_budget(max_evaluations=2)
+    assert trajectory[0][2] == pytest.approx(sop)
+    assert len(trajectory) <= 3
+    assert all(a[2] <= b[2] for a, b in zip(trajectory, trajectory[1:]))
+    assert msa.sum_of_pairs(gap_weight=1.0) == pytest.approx(trajectory[-1][2])
+
+    msa = Multiple(['waldemar', 'woldemort', 'vladimir', 'wolodymyr'])
+    msa.prog_align()
+    trajectory = msa.iterate_budget(time_budget=0)
+    assert len(trajectory) == 1
+
+
 def test_sum_of_pairs(msa):
     msa.prog_align()
     assert 8 > msa.sum_of_pairs() > 7
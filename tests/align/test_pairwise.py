@@ -4,6 +4,7 @@ from lingpy.align import (
     Pairwise, pw_align, nw_align, sw_align, we_align, structalign, turchin,
     edit_dist
 )
+from lingpy.align.pairwise import batch_align
 from lingpy.data.model import Model
 
 
@@ -37,6 +38,25 @@ def test_align(pair):
         assert '-' in ''.join(pair.alignments[0][1])
 
 
+def test_align_processes():
+    pairs = [('waldemar', 'vladimir'), ('harry', 'hari'), ('waldemar', 'vladimir')]
+    serial, parallel = Pairwise(pairs), Pairwise(pairs)
+    serial.align(mode='overlap')
+    parallel.align(mode='overlap', processes=2)
+    assert serial.alignments == parallel.alignments
+
+
+def test_batch_align():
+    pairs = [('waldemar', 'vladimir'), ('harry', 'hari'), ('waldemar', 'vladimir'),
+             (list('mat'), list('mixt'))]
+    for mode in ['global', 'local', 'overlap', 'dialign']:
+        pair = Pairwise(pairs)
+        pair.align(mode=mode, distance=True)
+        assert list(batch_align(
+            iter(pairs), mode=mode, distance=True, chunksize=2)) == pair.alignments
+    assert list(batch_align(pairs, processes=2)) == list(batch_align(pairs))
+
+
 def test_pw_align():
     for mode in ['global', 'local', 'overlap', 'dialign']:
         alms1 = pw_align('waldemar', 'vladimir', mode=mode, distance=True)
@@ -29,6 +29,26 @@ def test_output(tmp_path, test_data):
     psa.output(fileformat="psq", filename=fname)
 
 
+def test_align_psq(test_data, tmp_path):
+    psa = PSA(str(test_data / 'harry_potter.psq'))
+    psa.align(mode='overlap')
+    psa.output(fileformat='psa', filename=str(tmp_path / 'psa'))
+
+    outfile = lp.align.sca.align_psq(
+        str(test_data / 'harry_potter.psq'), filename=str(tmp_path / 'stream'),
+        mode='overlap', chunksize=2)
+    assert (tmp_path / 'stream.psa').read_text(encoding='utf8') == \
+        (tmp_path / 'psa.psa').read_text(encoding='utf8')
+    assert lp.align.sca.align_psq(
+        str(test_data / 'harry_potter.psq'), filename=str(tmp_path / 'stream'),
+        mode='overlap') != outfile
+
+    dataset, pairs = lp.align.sca.iter_psq(str(test_data / 'harry_potter.psa'))
+    assert dataset == psa.dataset
+    assert [pair for _, _, pair in pairs] == PSA(
+        str(test_data / 'harry_potter.psa')).pairs
+
+
 def test_output2(test_data, tmp_path):
     msa = MSA(str(test_data / 'harry.msa'))
     msa.ipa2cls()
@@ -60,7 +80,7 @@ def test_ipa2tokens(alm):
         assert tokens_b == new_tokens_b
 
 
-def test_align(alm):
+def test_align(alm, mocker):
     alm.add_entries('cugid', alm._ref, lambda x: str(x))
     alm.add_alignments(ref="cugid")
 
@@ -68,6 +88,37 @@ def test_align(alm):
     alm.align(ref="cugid", alignment="alignment2")
     assert alm.msa["cugid"]["1"]["ID"] == alm.msa["cogid"][1]["ID"]
 
+    # align with a budgeted iterative refinement
+    alm.align(ref="cugid", alignment="alignment3", iteration=True,
+              iteration_evaluations=3)
+    assert alm.msa["cugid"]["1"]["alignment"]
+
+    # the budget alone limits the refinement
+    from lingpy.align.multiple import Multiple
+    iterate_budget, trajectories = Multiple.iterate_budget, []
+
+    def spy(self, *args, **kw):
+        trajectories.append(iterate_budget(self, *args, **kw))
+        return trajectories[-1]
+
+    mocker.patch.object(Multiple, 'iterate_budget', spy)
+    legacy = mocker.patch.object(Multiple, 'iterate_orphans')
+    alm.align(ref="cugid", alignment="alignment3", iteration_evaluations=2)
+    assert trajectories
+    assert all(trajectory[-1][0] <= 2 for trajectory in trajectories)
+    assert any(trajectory[-1][0] == 2 for trajectory in trajectories)
+    trajectories.clear()
+    alm.align(ref="cugid", alignment="alignment3", iteration=True,
+              iteration_evaluations=0)
+    assert all(len(trajectory) == 1 for trajectory in trajectories)
+    assert not legacy.called
+    mocker.stopall()
+
+    # align with a sparse library
+    alm.align(ref="cugid", alignment="alignment4", method="library",
+              sparse=True, partners=3)
+    assert alm.msa["cugid"]["1"]["alignment"]
+
     # iterate and align using the multiple function
     for key, value in alm.msa['cogid'].items():
         # first compare simple alignments
@@ -101,9 +152,16 @@ def test_get_confidence(test_data, alm, tmp_path):
     alm.add_entries('numbers', tmp_dict, lambda x: x)
     # Run get_confidence to populate the output variable.
     # TODO: Check and document side-effects of this.
-    _ = alm.get_confidence(lex.rscorer, ref='cogid')
+    corrs = alm.get_confidence(lex.rscorer, ref='cogid')
     alm.output('html', filename=str(tmp_path / 'alm'), confidence=True)
 
+    confidences = {k: v['confidence'] for k, v in alm.msa['cogid'].items()}
+    assert alm.get_confidence(lex.rscorer, ref='cogid', processes=2) == corrs
+    assert confidences == {
+        k: v['confidence'] for k, v in alm.msa['cogid'].items()}
+    assert all(0 <= cell <= 125 for matrix in confidences.values()
+               for line in matrix for cell in line)
+
 
 def test_output3(alm, tmp_path):
     alm.output('tsv', filename=str(tmp_path / 'test'))
@@ -128,6 +186,17 @@ def test_get_consensus2():
     assert cons5[0] == 'h'
 
 
+def test_get_consensus_batch(alm):
+    msas = [msa['alignment'] for msa in alm.msa['cogid'].values()]
+    msas += [lp.align.multiple.mult_align(['harry', 'harald', 'gari'])]
+    for gaps, gap_scale in product([False, True], [0.5, 1.0]):
+        assert lp.align.sca.get_consensus_batch(
+            msas, gaps=gaps, gap_scale=gap_scale) == [
+            lp.align.sca.get_consensus(msa, gaps=gaps, gap_scale=gap_scale)
+            for msa in msas]
+    assert lp.align.sca.get_consensus_batch([[['a', '-'], ['-', '-']]]) == [['a']]
+
+
 def test_partial_alignments_with_lexstat(test_data):
     lex = lp.LexStat(str(test_data / 'test-partial-alignments.tsv'), segments='tokens')
     alms = lp.Alignments(str(test_data / 'test-partial-alignments.tsv'), fuzzy=True,
@@ -1,11 +1,13 @@
 """
 Test wordlist module.
 """
+import gzip
+
 import pytest
 
 from lingpy import Wordlist, Alignments
 from lingpy.basic.ops import wl2dst, wl2qlc, tsv2triple, triple2tsv, \
-    calculate_data, wl2multistate, coverage, clean_taxnames, wl2dict
+    calculate_data, wl2multistate, coverage, clean_taxnames, wl2dict, get_score
 
 
 @pytest.fixture
@@ -24,6 +26,25 @@ def test_iter_rows(wordlist):
         iter_rows(wordlist, 'concept', 'doculect'))[0]) == 3
 
 
+def test_query(wordlist):
+    from lingpy.basic.ops import Query
+    assert len(Query('doculect', '==', 'German')(wordlist)) == len(
+        wordlist.get_list(col='German', flat=True))
+    query = Query.from_rows({'ID': 'not in [1, 2, 3]', 'concept': "== 'hand'"})
+    assert query.op == 'and' and query.queries[0].value == [1, 2, 3]
+    assert all(wordlist[key, 'concept'] == 'hand' for key in query(wordlist))
+    tokens = Query.from_statement('tokens', "== ['h', 'a', 'n', 'd']")
+    assert tokens.op == '==' and tokens(wordlist)
+    assert Query('tokens', 'in', [['h', 'a', 'n', 'd']])(wordlist) == \
+        tokens(wordlist)
+    assert Query.from_statement('concept', ".upper() == 'HAND'").op == \
+        'expression'
+    assert set(Query('ipa', 'startswith', 'h')(wordlist)) == set(
+        (Query('ipa', '>=', 'h') & Query('ipa', '<', 'i'))(wordlist))
+    with pytest.raises(ValueError):
+        Query('concept', '~', 'hand')
+
+
 def test_wl2dict(wordlist):
     _ = wl2dict(wordlist, dict(s1=['concept', '{0}'], s2=['cogid', '{0}']), [('ipa', '{0}')])
 
@@ -34,8 +55,11 @@ def test_wl2dst(wordlist):
     res = wl2dst(wordlist, mode='jaccard', refB='glossid')
     assert isinstance(res, list)
 
-    _ = wl2dst(wordlist, mode='swadesh')
-    _ = wl2dst(wordlist, mode='shared')
+    for mode in ['swadesh', 'shared', 'jaccard']:
+        res = wl2dst(wordlist, mode=mode)
+        for i, j in [(0, 1), (1, 3), (2, 5)]:
+            assert res[i][j] == get_score(
+                wordlist, 'cogid', mode, wordlist.taxa[i], wordlist.taxa[j])
     _ = wl2dst(wordlist, mode='swadesh', ignore_missing=True)
 
     # trigger zero-division-warning in wl2dst
@@ -79,6 +103,17 @@ def test_wl2qlc(tmp_path, test_data, wordlist):
            stamp='stampo', ignore=[], formatter="doculect")
 
 
+def test_wl2qlc_compressed(tmp_path, wordlist):
+    wordlist.output('tsv', filename=str(tmp_path / 'plain'), prettify=True,
+                    subset=True, cols=['concept', 'ipa'])
+    wordlist.output('tsv', filename=str(tmp_path / 'packed'), prettify=True,
+                    subset=True, cols=['concept', 'ipa'], compressed=True)
+    text = (tmp_path / 'plain.tsv').read_text(encoding='utf8')
+    with gzip.open(str(tmp_path / 'packed.tsv.gz'), 'rt', encoding='utf8') as f:
+        assert f.read() == text
+    assert '\n# DATA\nID\tCONCEPT\tIPA\n' in text
+
+
 def test_tsv2triple(tmp_path, wordlist):
     out = tmp_path / 'test'
     triples = tsv2triple(wordlist, str(out))
@@ -4,6 +4,7 @@ Test wordlist module.
 import pytest
 
 from lingpy import Wordlist
+from lingpy.basic.ops import Query
 
 
 @pytest.fixture
@@ -123,6 +124,36 @@ def test_get_etymdict(wordlist):
         assert etd2[key] == etd4[key]
 
 
+def test_cached_indexes(wordlist):
+    etd = wordlist.get_etymdict(ref='cogid')
+    ger = wordlist.get_dict(col='German')
+    key = ger['hand'][0]
+    etd[wordlist[key, 'cogid']][wordlist.cols.index('German')] = 0
+    ger['hand'].append(0)
+    assert wordlist.get_etymdict(ref='cogid') != etd
+    assert wordlist.get_dict(col='German')['hand'] == [key]
+
+    # changing the data invalidates the indexes
+    wordlist[key, 'cogid'] = 10000
+    assert wordlist.get_etymdict(ref='cogid')[10000][
+        wordlist.cols.index('German')] == [key]
+    wordlist.add_entries('cogid', 'cogid', lambda x: x + 1, override=True)
+    assert 10000 not in wordlist.get_etymdict(ref='cogid')
+    wordlist.renumber('cogid', override=True)
+    assert len(wordlist.get_etymdict(ref='cogidid')) == len(
+        wordlist.get_etymdict(ref='cogid'))
+
+    # only one index is kept per reference column and modify_ref function
+    for i in range(5):
+        wordlist.get_paps(ref='cogid', modify_ref=lambda x: abs(x))
+    assert len([key for key in wordlist._cache if 'cogid' in key]) == 2
+    paps = wordlist.get_paps(ref='cogid', modify_ref=abs)
+    assert wordlist.get_presence_matrix(
+        'cogid', modify_ref=abs) is wordlist.get_presence_matrix(
+        'cogid', modify_ref=abs)
+    assert wordlist.get_paps(ref='cogid', modify_ref=abs) == paps
+
+
 def test_get_paps(wordlist):
     paps = wordlist.get_paps(ref="cogid", modify_ref=abs)
     cogs = wordlist.get_etymdict(ref="cogid", modify_ref=abs)
@@ -131,6 +162,19 @@ def test_get_paps(wordlist):
         assert abs(key) in paps
 
 
+def test_get_presence_matrix(wordlist):
+    cogids, matrix = wordlist.get_presence_matrix(ref='cogid')
+    etd = wordlist.get_etymdict(ref='cogid')
+    assert cogids == list(etd)
+    assert matrix.tolist() == [[1 if v else 0 for v in etd[c]] for c in cogids]
+    with pytest.raises(ValueError):
+        matrix[0, 0] = 2
+
+    coverage = wordlist.get_coverage_matrix()
+    assert coverage.shape == (wordlist.height, wordlist.width)
+    assert coverage.sum(0)[wordlist.cols.index('Turkish')] == 200
+
+
 def test_output(tmp_path, wordlist):
     fn = str(tmp_path / 'test')
     for fmt in 'tsv taxa tre dst starling paps.nex paps.csv' \
@@ -148,10 +192,69 @@ def test_output(tmp_path, wordlist):
                                  rows=dict(ID=" > 10"), **kw)
 
 
+def test_output_rows(tmp_path, wordlist):
+    fn = tmp_path / 'test'
+    query = Query('concept', 'in', ['hand', 'foot']) & ~Query(
+        'doculect', '==', 'German')
+    wordlist.output('tsv', filename=str(fn), subset=True, rows=query,
+                    ignore='all', prettify=False)
+    sub = Wordlist(str(fn) + '.tsv')
+    assert len(sub) == 12 and set(sub.rows) == {'hand', 'foot'}
+    wordlist.output('tsv', filename=str(fn), subset=True, ignore='all',
+                    prettify=False, rows=dict(
+                        concept="in ['hand', 'foot']", doculect="!= 'German'"))
+    assert len(Wordlist(str(fn) + '.tsv')) == 12
+    wordlist.output('tsv', filename=str(fn), subset=True, ignore='all',
+                    prettify=False, rows=dict(concept=".startswith('han')"))
+    assert set(Wordlist(str(fn) + '.tsv').rows) == {'hand'}
+    with pytest.raises(ValueError):
+        wordlist.output('tsv', filename=str(fn), subset=True, rows=['hand'])
+
+
+def test_filter(wordlist):
+    sub = wordlist.filter(Query('concept', '==', 'hand') | Query(
+        'ID', '<', 3))
+    assert sorted(sub.rows) == ['all', 'hand']
+    assert sub.cols == wordlist.cols
+    assert sub[1] is wordlist[1]
+    assert len(wordlist.filter({'doculect': "== 'German'"})) == len(
+        wordlist.get_list(col='German', flat=True))
+    assert len(wordlist.filter(Query('concept', '==', 'nothing'))) == 0
+
+
+def test_view(wordlist, test_data):
+    from lingpy.compare.lexstat import LexStat
+    sub = wordlist.view(rows=['hand', 'foot'], cols=['German', 'English'])
+    assert sorted(sub.rows) == ['foot', 'hand']
+    assert sub.cols == ['English', 'German']
+    key = sub.get_dict(col='German')['hand'][0]
+    assert sub[key] is wordlist[key]
+    assert len(wordlist.view(ids=[1, 2, 10000])) == 2
+    assert len(wordlist.view(rows=['hand'], ids=[1, 2])) == 0
+
+    # modifications are not visible in the other wordlist
+    sub[key, 'cogid'] = 1000
+    assert wordlist[key, 'cogid'] != 1000
+    other = sub.get_dict(col='English')['hand'][0]
+    wordlist.add_entries('cog', 'cogid', lambda x: x)
+    assert len(sub[other]) == len(sub.header)
+    assert len(wordlist[other]) == len(wordlist.header)
+
+    lex = LexStat(str(test_data / 'KSL.qlc'))
+    sub = lex.view(cols=['German', 'English'], cls=LexStat)
+    assert isinstance(sub, LexStat) and sub.width == 2
+    assert all(sub[k] is lex[k] for k in sub)
+    assert Wordlist(sub)[key] is not sub[key]
+
+
 def test_export(tmp_path, wordlist):
     fn = str(tmp_path / 'test')
     for fmt in 'txt tex html'.split():
         wordlist.export(fmt, filename=fn)
+    wordlist.export(
+        'txt', filename=fn, rows={'concept': "== 'hand'"})
+    assert '# Concept: hand' in (tmp_path / 'test.txt').read_text('utf8')
+    assert '# Concept: foot' not in (tmp_path / 'test.txt').read_text('utf8')
 
 
 def test_get_wordlist(test_data):
@@ -161,3 +264,44 @@ def test_get_wordlist(test_data):
     assert wl1.height == wl2.height
     for k in wl1:
         assert wl1[k, 'concept'] == wl2[k, 'concept']
+
+
+def test_get_wordlist_typed(tmp_path):
+    from lingpy.basic.wordlist import get_wordlist
+    (tmp_path / 'wl.csv').write_text(
+        'ID;Doculect;Concept;Tokens;Cogid\n'
+        '3;l1;hand;"h a\u0301 n d";1\n'
+        '5;l2;hand;"h a n d";1\n'
+        '7;l2;foot;"f u t";2\n', encoding='utf8')
+    wl = get_wordlist(str(tmp_path / 'wl.csv'), delimiter=';', chunksize=2)
+    assert sorted(wl) == [3, 5, 7]
+    assert 'id' not in wl.header
+    assert wl[3, 'tokens'] == ['h', '\u00e1', 'n', 'd']
+    assert wl[7, 'cogid'] == 2
+    assert wl.get_etymdict('cogid')[1] == [[3], [5]]
+
+
+def test_get_wordlist_ids(tmp_path):
+    from lingpy.basic.wordlist import get_wordlist
+    (tmp_path / 'wl.csv').write_text(
+        'ID,Doculect,Concept,Cogid\n'
+        'a1,l1,hand,1\n'
+        'a2,l2,hand,1\n', encoding='utf8')
+    wl = get_wordlist(str(tmp_path / 'wl.csv'))
+    assert sorted(wl) == [1, 2]
+    assert wl[2, 'id'] == 'a2'
+    assert wl[2, 'cogid'] == 1
+
+    (tmp_path / 'wl.csv').write_text(
+        'ID,Doculect,Concept,Cogid\n'
+        '1,l1,hand,1\n'
+        '1,l2,hand,1\n', encoding='utf8')
+    with pytest.raises(ValueError, match='Duplicate IDs'):
+        get_wordlist(str(tmp_path / 'wl.csv'))
+
+    (tmp_path / 'wl.csv').write_text(
+        'Doculect,Concept,Tokens,Cogid\n'
+        'l1,hand,h a n d,1\n'
+        'l2,hand\n', encoding='utf8')
+    with pytest.raises(ValueError, match='contains 2 fields'):
+        get_wordlist(str(tmp_path / 'wl.csv'))
@@ -1,11 +1,13 @@
 import os
 import pathlib
 
+import numpy as np
 import pytest
 from clldutils import jsonlib
 
 from lingpy import LexStat, rc
-from lingpy.compare.lexstat import char_from_charstring, get_score_dict
+from lingpy.compare.lexstat import (
+    char_from_charstring, get_score_dict, extend_score_dict)
 
 
 def test_char_from_charstring():
@@ -22,6 +24,14 @@ def test_get_score_dict():
     assert sd['A', 'B'] == -22.5
 
 
+def test_extend_score_dict():
+    model = rc("sca")
+    sd = extend_score_dict(
+        get_score_dict(["1.A.C", "1.E.V"], model), ["2.P.C", "2.X.-"], model)
+    full = get_score_dict(["1.A.C", "1.E.V", "2.P.C", "2.X.-"], model)
+    assert sd.matrix == full.matrix
+
+
 @pytest.fixture
 def lextstat_factory(tmp_path):
     def make(*args, **kw):
@@ -94,12 +104,24 @@ def test_init2(lex, test_data):
             assert getattr(lex, name).matrix == obj
         else:
             for key, values in lex.pairs.items():
-                values = set(values)
+                values = set(map(tuple, values.tolist()))
                 ovalues = set(tuple(v) for v in obj['---'.join(key)])
                 if key == 'pairs':
                     assert values == ovalues  # FIXME: This is not hit in tests! Why?
 
 
+def test_pairs(lex):
+    pairs = lex.pairs['English', 'German']
+    assert pairs.shape[1] == 2
+    assert all(lex[a, 'concept'] == lex[b, 'concept'] for a, b in pairs)
+    words = [(''.join(lex[a, 'tokens']), ''.join(lex[b, 'tokens']))
+             for a, b in pairs]
+    assert len(words) == len(set(words))
+    hand = lex.get_dict(col='German')['hand']
+    assert [[a, a] for a in hand] == lex.pairs['German', 'German'][
+        np.isin(lex.pairs['German', 'German'][:, 0], hand)].tolist()
+
+
 def test_init3(test_data, lextstat_factory):  # with kw check=True
     bad_file = test_data / 'bad_file.tsv'
     with pytest.raises(ValueError):
@@ -140,6 +162,93 @@ def test_cluster(lex, mocker, get_scorer_kw):
     assert all(x in lex.header for x in 'scaid lexstatid editid turchinid'.split())
 
 
+def test_cluster_nulld(lex, mocker, get_scorer_kw):
+    lex.get_scorer(**get_scorer_kw)
+    mocker.patch('lingpy.basic.parser.confirm', mocker.Mock(return_value=True))
+    thresholds = []
+    for processes in [1, 1, 2]:
+        lex.cluster(method="lexstat", guess_threshold=True, gt_mode='nulld',
+                    gt_seed=1, processes=processes)
+        thresholds.append(lex._meta['guessed_threshold'])
+    assert thresholds[0] == thresholds[1] == thresholds[2]
+    assert 0 < thresholds[0] < 1
+    lex.cluster(method="edit-dist", guess_threshold=True, gt_mode='nulld')
+    with pytest.raises(ValueError):
+        lex.cluster(method="turchin", guess_threshold=True, gt_mode='nulld')
+
+
+def test_add_doculects(lex, lextstat_factory, get_scorer_kw):
+    columns = ['doculect', 'concept', 'ipa', 'tokens']
+
+    def subset(doculects):
+        return {0: columns, **{
+            idx: [lex[idx, column] for column in columns] for idx in lex
+            if lex[idx, 'doculect'] in doculects}}
+
+    old = lextstat_factory(subset(lex.cols[:-1]))
+    old.get_scorer(**get_scorer_kw)
+    scores = {(a, b): old.cscorer[a, b] for a in old.chars for b in old.chars}
+    old.cluster(method='lexstat', threshold=0.6, ref='cogid')
+    cogids = {idx: old[idx, 'cogid'] for idx in old}
+
+    concepts = old.add_doculects(subset(lex.cols[-1:]), **get_scorer_kw)
+    assert old.cols == lex.cols and len(old) == len(lex)
+    assert sorted(old.chars) == sorted(lex.chars)
+    assert sum(map(len, old.pairs.values())) == sum(
+        map(len, lex.pairs.values()))
+    assert all(old.cscorer[key] == score for key, score in scores.items())
+
+    old.cluster(method='lexstat', threshold=0.6, ref='cogid',
+                concepts=concepts)
+    assert all(old[idx, 'cogid'] for idx in old)
+    assert sum(cogids[idx] == old[idx, 'cogid'] for idx in cogids) > \
+        0.9 * len(cogids)
+    with pytest.raises(ValueError):
+        old.add_doculects(subset(lex.cols[-1:]))
+    with pytest.raises(ValueError):
+        old.cluster(method='sca', ref='scaid', concepts=concepts)
+
+
+def test_get_candidates(lex):
+    idxA, idxB = lex.get_candidates(k=3)
+    assert len(idxA) == len(idxB) > 0
+    assert all(lex[a, 'doculect'] != lex[b, 'doculect']
+               for a, b in zip(idxA, idxB))
+    pairs = set(zip(idxA.tolist(), idxB.tolist()))
+    assert pairs == set(zip(*[
+        x.tolist() for x in lex.get_candidates(k=3, chunksize=100)]))
+    assert len(lex.get_candidates(k=3, same_language=True)[0]) > len(pairs)
+    assert len(lex.get_candidates(k=3, min_shared=2)[0]) < len(pairs)
+
+
+def test_cluster_dataset(lex, lextstat_factory, mocker):
+    lex.cluster_dataset(method='turchin', threshold=0.5, k=3)
+    assert 'crossid' in lex.header
+    hand = lex.get_dict(row='hand', entry='crossid')
+    assert hand['German'] == hand['English']
+    with pytest.raises(ValueError):
+        lex.cluster_dataset(cluster_method='upgma')
+
+    mocker.patch('lingpy.basic.parser.confirm', mocker.Mock(return_value=True))
+    lex = lextstat_factory({
+        0: ['doculect', 'concept', 'ipa', 'tokens'],
+        1: ['German', 'hand', 'hant', ['h', 'a', 'n', 't']],
+        2: ['English', 'hand', 'hænd', ['h', 'æ', 'n', 'd']],
+        3: ['English', 'dog', 'haund', ['h', 'a', 'u', 'n', 'd']],
+        4: ['German', 'dog', 'hunt', ['h', 'u', 'n', 't']],
+        5: ['German', 'foot', 'fus', ['f', 'u', 's']],
+        6: ['English', 'foot', 'fut', ['f', 'u', 't']]})
+    # German "hand" and English "dog" share the 2-mers of HANT and HAYNT
+    # and are linked across concepts
+    lex.cluster_dataset(method='turchin', threshold=0.5, k=2)
+    assert lex[1, 'crossid'] == lex[3, 'crossid'] == lex[4, 'crossid']
+    assert lex[5, 'crossid'] != lex[6, 'crossid']
+    # with 4-mers, only the two words for "dog" remain a candidate pair
+    lex.cluster_dataset(method='turchin', threshold=0.5, k=4, override=True)
+    assert lex[3, 'crossid'] == lex[4, 'crossid']
+    assert lex[1, 'crossid'] != lex[3, 'crossid']
+
+
 def test_align_pairs(lex):
     assert not lex.align_pairs('English', 'German', method='sca', pprint=False)
     assert lex.align_pairs(1, 2, method='sca', pprint=False)[-1] > 0.5
@@ -155,7 +264,7 @@ def test__get_matrices(lex):
 
 def test_get_subset(test_data, lex):
     lex.get_subset([])
-    assert [v for v in lex.subsets.values() if v] == []
+    assert [v for v in lex.subsets.values() if len(v)] == []
     pairs = jsonlib.load(test_data / 'KSL.pairs.json')
     assert sorted('---'.join(k) for k in lex.subsets.keys()) ==\
         sorted(pairs.keys())
@@ -20,6 +20,19 @@ def test_mutual_coverage(wl):
     assert len(sn.mutual_coverage(wl)['French']['Albanian']) == 3
 
 
+def test_mutual_coverage_matrix(wl):
+    matrix = sn.mutual_coverage_matrix(wl)
+    coverage = sn.mutual_coverage(wl)
+    for i, taxA in enumerate(wl.cols):
+        assert matrix[i, i] == len(sn._get_concepts(wl, 'concept')[taxA])
+        for j, taxB in enumerate(wl.cols):
+            if i != j:
+                assert matrix[i, j] == len(coverage[taxA][taxB])
+    matrix = sn.mutual_coverage_matrix(wl, concepts='ipa')
+    assert matrix[wl.cols.index('Albanian'), wl.cols.index('French')] == len(
+        sn.mutual_coverage(wl, concepts='ipa')['Albanian']['French'])
+
+
 def test_mutual_coverage_check(wl):
     assert not sn.mutual_coverage_check(wl, 3)
 
@@ -30,7 +43,18 @@ def test_mutual_coverage_subset(wl):
     assert b[0][0] == 3
     assert b[0][1][0] == 'Albanian'
 
+    c, d = sn.mutual_coverage_subset(wl, 3, greedy=True)
+    assert c == a
+    assert d[0] in b
+    assert sn.mutual_coverage_subset(wl, 10, greedy=True) == (0, [])
+
+
+def test_average_coverage(wl):
+    assert 0 < sn.average_coverage(wl) < 1
+    assert sn.average_coverage(wl, concepts='ipa') < sn.average_coverage(wl)
+
 
 def test_synonymy(wl):
     syns = sn.synonymy(wl)
     assert max(syns.values()) == 1
+    assert syns == sn.synonymy(wl, concepts='gloss', languages='language')
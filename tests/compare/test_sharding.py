@@ -0,0 +1,69 @@
+import pytest
+
+from lingpy import Wordlist, LexStat, Alignments
+from lingpy.compare.sharding import split_wordlist, process_shards
+
+
+def _partition(cogids):
+    groups = {}
+    for key, cogid in cogids.items():
+        groups.setdefault(cogid, set()).add(key)
+    return sorted(sorted(group) for group in groups.values())
+
+
+def test_split_wordlist(test_data, tmp_path):
+    wl = Wordlist(str(test_data / 'KSL.qlc'))
+    shards = split_wordlist(wl, str(tmp_path / 'shards'), size=50)
+    assert len(shards) == 4
+    shard = Wordlist.load_snapshot(shards[-1])
+    assert shard.rows == wl.rows[150:]
+    assert 'langid' not in wl.header
+    assert all(
+        shard[key, 'langid'] == str(wl.cols.index(shard[key, 'doculect']) + 1)
+        for key in shard)
+
+
+def test_process_shards(test_data, tmp_path, mocker):
+    mocker.patch('lingpy.basic.parser.confirm', mocker.Mock(return_value=True))
+    lex = LexStat(str(test_data / 'KSL.qlc'))
+    shards = split_wordlist(lex, str(tmp_path / 'shards'), size=50)
+    with pytest.raises(ValueError):
+        process_shards(shards)
+
+    results = process_shards(
+        shards, method='sca', threshold=0.45, consensus=True)
+    lex.cluster(method='sca', threshold=0.45, ref='scaid')
+    assert _partition(results['scaid']) == _partition(
+        {key: lex[key, 'scaid'] for key in lex})
+    assert sorted(set(results['scaid'].values())) == list(
+        range(1, len(set(results['scaid'].values())) + 1))
+
+    alm = Alignments(lex, ref='scaid')
+    alm.align()
+    assert all(results['alignment'][key] == list(alm[key, 'alignment'])
+               for key in alm)
+    assert set(results['consensus']) == set(lex)
+
+
+def test_process_shards_lexstat(test_data, tmp_path, mocker):
+    mocker.patch('lingpy.basic.parser.confirm', mocker.Mock(return_value=True))
+    wl = Wordlist(str(test_data / 'KSL.qlc'))
+    # the first shard contains no words of German
+    D = {0: wl.columns}
+    for key in wl:
+        if wl[key, 'doculect'] != 'German' or \
+                wl[key, 'concept'] not in wl.rows[:50]:
+            D[key] = wl[key]
+    lex = LexStat(D)
+    lex.get_scorer(runs=10, rands=10, limit=100)
+    lex.cluster(method='lexstat', threshold=0.6, ref='lexstatid')
+    expected = _partition({key: lex[key, 'lexstatid'] for key in lex})
+
+    shards = split_wordlist(lex, str(tmp_path / 'shards'), size=50)
+    shard = Wordlist.load_snapshot(shards[0])
+    assert 'German' not in shard.cols
+    for processes in [1, 2]:
+        results = process_shards(
+            shards, method='lexstat', threshold=0.6, scorer=lex.cscorer,
+            processes=processes)
+        assert _partition(results['lexstatid']) == expected
@@ -55,3 +55,21 @@ def test_load_cldf_and_write(test_data, tmp_path):
         col="Language_ID".lower(),
         row="Parameter_ID".lower())
     wl.output('tsv', filename=str(tmp_path / 'lingpycldf'))
+
+
+def test_load_cldf_subsets(test_data, tmp_path):
+    wl = Wordlist.from_cldf(
+        str(test_data / 'cldf/test-metadata.json'),
+        col="Language_ID".lower(),
+        row="Parameter_ID".lower(),
+        languages=['anuta', 'wallisian'],
+        snapshot=str(tmp_path / 'wl.npz'))
+    assert wl.cols == ['anuta', 'wallisian']
+    assert Wordlist.load_snapshot(str(tmp_path / 'wl.npz')).cols == wl.cols
+
+    wl = Wordlist.from_cldf(
+        str(test_data / 'cldf/test-metadata.json'),
+        col="Language_ID".lower(),
+        row="Parameter_ID".lower(),
+        concepts=[])
+    assert wl.height == 0
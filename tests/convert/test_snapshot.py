@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from lingpy import Wordlist, LexStat, Alignments
+
+
+def test_wordlist_snapshot(tmp_path, test_data, mocker):
+    wl = Wordlist(str(test_data / 'KSL.qlc'))
+    wl.add_entries('fuzzyid', 'cogid', lambda x: [x, x + 1])
+    wl.calculate('tree')
+    wl.unknown = lambda x: x
+    log = mocker.patch('lingpy.convert.snapshot.log')
+    wl.save_snapshot(str(tmp_path / 'wl'))
+    assert log.warning.called
+
+    new = Wordlist.load_snapshot(str(tmp_path / 'wl.npz'))
+    assert type(new) is Wordlist
+    assert not hasattr(new, 'unknown')
+    assert new.header == wl.header and new.cols == wl.cols
+    for key in wl:
+        assert new[key] == wl[key]
+        assert [type(x) for x in new[key]] == [type(x) for x in wl[key]]
+    assert str(new.tokens[0][0]) == str(wl.tokens[0][0])
+    assert new.get_etymdict('fuzzyid') == wl.get_etymdict('fuzzyid')
+    assert (new._array == wl._array).all()
+    assert new.tree.getNewick() == wl.tree.getNewick()
+
+    with pytest.raises(ValueError):
+        LexStat.load_snapshot(str(tmp_path / 'wl.npz'))
+    np.savez(str(tmp_path / 'other'), header=np.zeros(2, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        Wordlist.load_snapshot(str(tmp_path / 'other.npz'))
+
+
+def test_lexstat_snapshot(tmp_path, test_data, mocker):
+    mocker.patch('lingpy.basic.parser.confirm', mocker.Mock(return_value=True))
+    lex = LexStat(str(test_data / 'KSL.qlc'))
+    lex.get_scorer(runs=10, rands=10, limit=100)
+    lex.cluster(method='lexstat', threshold=0.6, ref='lexstatid')
+    lex.save_snapshot(str(tmp_path / 'lex.npz'), compressed=True)
+
+    new = Wordlist.load_snapshot(str(tmp_path / 'lex.npz'))
+    assert type(new) is LexStat
+    assert new.cscorer is new._meta['scorer']['cscorer']
+    assert new.cscorer.matrix == lex.cscorer.matrix
+    assert new.freqs == lex.freqs
+    assert all((new.pairs[p] == lex.pairs[p]).all() for p in lex.pairs)
+    new.cluster(method='lexstat', threshold=0.6, ref='lexstatid')
+    assert all(new[k, 'lexstatid'] == lex[k, 'lexstatid'] for k in lex)
+
+
+def test_alignments_snapshot(tmp_path, test_data):
+    alm = Alignments(str(test_data / 'KSL.qlc'), ref='cogid')
+    alm.align()
+    alm.save_snapshot(str(tmp_path / 'alm.npz'))
+    new = Alignments.load_snapshot(str(tmp_path / 'alm.npz'))
+    assert new.msa == alm.msa
+    assert new.get_consensus(ref='cogid', gaps=True) == alm.get_consensus(
+        ref='cogid', gaps=True)
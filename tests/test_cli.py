@@ -80,6 +80,10 @@ def test_pairwise(capsys, tmp_path, test_data):
     #
     assert tmp.parent.joinpath(tmp.name + '.psa').exists()
 
+    output = run(capsys, 'pairwise -i {0} --method sca --processes 2'.format(
+        test_data / 'harry_potter.psq'))
+    assert output.split('\n')[:3] == ['\t'.join('wal-demar'), '\t'.join('v-ladimir'), '62.70']
+
     # fourth test, test output and input with method=basic
     tmp = tmp_path / 'test3'
     run(capsys, 'pairwise -i {0} --method basic -o {1}'.format(
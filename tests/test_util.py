@@ -1,3 +1,5 @@
+import operator
+
 from lingpy import util
 
 
@@ -59,3 +61,12 @@ def test_dotjoin():
 def test_as_string():
     out = util.as_string('text', pprint=False)
     assert out == 'text'
+
+
+def test_parallel_map():
+    for processes in [1, 2]:
+        assert list(util.parallel_map(
+            operator.add, range(10), processes, (10,))) == list(range(10, 20))
+    with util.worker_pool(operator.mul, 2, (2,)) as map_items:
+        assert list(map_items([1, 2])) == [2, 4]
+        assert list(map_items(iter([3]))) == [6]
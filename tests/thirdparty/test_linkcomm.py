@@ -16,3 +16,26 @@ def test_hlc():
     hlc.single_linkage()
     tmp = hlc.single_linkage(threshold=0.5)[0]
     assert tmp['a', 'b'] == tmp['b', 'c']
+
+
+def test_array_hlc():
+    # two triangles sharing the node 2
+    rows, cols = [0, 0, 1, 2, 2, 3], [1, 2, 2, 3, 4, 4]
+    hlc = link_clustering.ArrayHLC(5, rows, cols)
+    edgesA, edgesB, omss = hlc.similarities()
+    assert len(edgesA) == len(edgesB) == len(omss) == 10
+
+    cids = hlc.single_linkage(threshold=0.5)[0]
+    assert cids[0] == cids[1] == cids[2]
+    assert cids[3] == cids[4] == cids[5]
+    assert cids[0] != cids[3]
+
+    best_P, best_S, best_D, list_D = link_clustering.ArrayHLC(
+        5, rows, cols).single_linkage()
+    assert best_D == 1.0
+    assert len(set(best_P.tolist())) == 2
+
+    cids, D = link_clustering.ArrayHLC(
+        5, rows, cols, weights=[1, 1, 1, 0.5, 0.5, 0.5]).single_linkage(
+            threshold=False)
+    assert len(set(cids.tolist())) == 1